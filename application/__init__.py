@@ -1,2 +1,2 @@
 from .app_factory import create_app
-from .utils.haversine import haversine
\ No newline at end of file
+from .utils.haversine import haversine, haversine_vectorized, haversine_matrix
\ No newline at end of file
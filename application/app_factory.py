@@ -5,9 +5,14 @@ import logging
 from logging.handlers import TimedRotatingFileHandler
 from math import ceil
 from .models import FoodTruck, db, bcrypt
+from .indexes import spatial_index, cluster_index, heatmap_index, items_index, names_index
+from .indexes import autocomplete_index, fuzzy_index, location_cache, version_index, metadata_index
+from .indexes import fragment_cache, truck_cache
 from .blueprints import error_handlers
 from .views.root import RootAPI
 from .views.foodtrucks.api import FoodTrucksAPI, FoodTrucksItemsAPI, FoodTrucksLocationAPI, FoodTrucksNameAPI
+from .views.foodtrucks.api import FoodTrucksLocationBatchAPI, FoodTrucksViewportAPI, FoodTrucksClustersAPI
+from .views.foodtrucks.api import FoodTrucksRouteAPI, FoodTrucksHeatmapAPI, FoodTrucksAutocompleteAPI
 from .views.foodtrucks.frontend import FoodTrucksLocationMap
 from .views.auth.api import UserAPI, UserLoginAPI, UserRegisterAPI
 import graphene
@@ -142,6 +147,18 @@ def create_app():
         db.init_app(app)
         bcrypt.init_app(app)
         migrate.init_app(app, db)
+        spatial_index.init_app(app)
+        cluster_index.init_app(app)
+        heatmap_index.init_app(app)
+        items_index.init_app(app)
+        names_index.init_app(app)
+        autocomplete_index.init_app(app)
+        fuzzy_index.init_app(app)
+        location_cache.init_app(app)
+        version_index.init_app(app)
+        metadata_index.init_app(app)
+        fragment_cache.init_app(app)
+        truck_cache.init_app(app)
         app.logger.addHandler(handler)
 
         # register RESTful views
@@ -150,6 +167,12 @@ def create_app():
         register_get_api(app, FoodTrucksNameAPI, 'foodtrucks_name_api', '/foodtrucks/name/', pk='needle', pk_type='string')
         register_get_api(app, FoodTrucksItemsAPI, 'foodtrucks_items_api', '/foodtrucks/items/', pk='needle', pk_type='string')
         register_get_api(app, FoodTrucksLocationAPI, 'foodtrucks_location_api', '/foodtrucks/location')
+        register_post_api(app, FoodTrucksLocationBatchAPI, 'foodtrucks_location_batch_api', '/foodtrucks/location/batch')
+        register_get_api(app, FoodTrucksViewportAPI, 'foodtrucks_viewport_api', '/foodtrucks/viewport')
+        register_get_api(app, FoodTrucksClustersAPI, 'foodtrucks_clusters_api', '/foodtrucks/clusters')
+        register_get_api(app, FoodTrucksRouteAPI, 'foodtrucks_route_api', '/foodtrucks/route')
+        register_get_api(app, FoodTrucksHeatmapAPI, 'foodtrucks_heatmap_api', '/foodtrucks/heatmap')
+        register_get_api(app, FoodTrucksAutocompleteAPI, 'foodtrucks_autocomplete_api', '/foodtrucks/autocomplete')
         register_view(app, FoodTrucksLocationMap, 'foodtrucks_location_map', '/foodtrucks/location/map')
         register_get_api(app, UserAPI, 'user_api', '/auth/user')
         register_post_api(app, UserRegisterAPI, 'user_register_api', '/auth/register')
@@ -0,0 +1,26 @@
+from .base import InMemoryIndex
+from .spatial import SpatialIndex
+from .clusters import ClusterIndex
+from .heatmap import HeatmapIndex
+from .items import ItemsIndex
+from .names import NamesIndex
+from .autocomplete import AutocompleteIndex
+from .fuzzy import FuzzySearchIndex
+from .location_cache import LocationCache
+from .versions import VersionIndex
+from .metadata import MetadataIndex
+from .fragments import FragmentCache
+from .trucks import TruckCache
+
+spatial_index = SpatialIndex()
+cluster_index = ClusterIndex()
+heatmap_index = HeatmapIndex()
+items_index = ItemsIndex()
+names_index = NamesIndex()
+autocomplete_index = AutocompleteIndex()
+fuzzy_index = FuzzySearchIndex()
+location_cache = LocationCache()
+version_index = VersionIndex()
+metadata_index = MetadataIndex()
+fragment_cache = FragmentCache()
+truck_cache = TruckCache()
\ No newline at end of file
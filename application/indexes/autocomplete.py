@@ -0,0 +1,65 @@
+from application.utils.prefix_index import PrefixIndex
+from application.utils.menu import parse_menu_items
+from .base import InMemoryIndex
+
+
+class AutocompleteIndex(InMemoryIndex):
+    """
+    A class used to encapsulate per-process prefix indexes of the FoodTruck names and
+    menu items for search suggestions. Names are counted by the number of trucks with
+    the name, and menu items by the number of trucks serving them.
+
+    Methods
+    -------
+    complete(prefix, limit)
+        Returns the most common names and menu items matching a prefix
+    """
+    extension_name = 'autocomplete_index'
+
+    def __init__(self):
+        self._names = None
+        self._items = None
+        self._records = None
+        super(AutocompleteIndex, self).__init__()
+
+
+    def complete(self, prefix, limit):
+        """
+        Returns the names and menu items with a word that starts with a prefix, ignoring
+        case, ordered by decreasing number of trucks
+
+        Parameters:
+            prefix (str): prefix to complete
+            limit (int): maximum number of names and of menu items to return
+
+        Returns:
+            tuple: lists of (name, count) and (item, count) tuples
+        """
+        with self._lock:
+            self.ensure_built()
+            return (self._names.complete(prefix, limit), self._items.complete(prefix, limit))
+
+
+    def _clear(self):
+        self._names = PrefixIndex()
+        self._items = PrefixIndex()
+        self._records = {}
+
+
+    def _insert(self, record):
+        items = set(parse_menu_items(record.food_items))
+        self._records[record.uuid] = (record.name, items)
+        if record.name:
+            self._names.add(record.name)
+        for item in items:
+            self._items.add(item)
+
+
+    def _remove(self, uuid):
+        if uuid not in self._records:
+            return
+        name, items = self._records.pop(uuid)
+        if name:
+            self._names.discard(name)
+        for item in items:
+            self._items.discard(item)
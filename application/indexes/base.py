@@ -0,0 +1,131 @@
+import threading
+import time
+from application.models import register_write_listener, fetch_truck_records
+
+
+class InMemoryIndex(object):
+    """
+    Base class for per-process indexes built from the FoodTruck table.
+
+    An index is built lazily from the database on first use, and is afterwards kept
+    current by committed writes to the FoodTruck model. Since writes committed by
+    other processes are not observed, the index is rebuilt once it is older than the
+    configured refresh interval. Subclasses implement _clear(), _insert(record) and
+    _remove(uuid), which are always invoked while holding the index lock, and may
+    override _build() to build the index without reading every truck.
+
+    Attributes
+    ----------
+    extension_name (str)
+        Key the index is registered under in app.extensions
+
+    Methods
+    -------
+    init_app(app)
+        Registers the index as an extension of a Flask app
+
+    ensure_built()
+        Builds the index from the database if it is not built or is out of date
+
+    upsert(record)
+        Inserts or replaces a truck in the index
+
+    remove(uuid)
+        Removes a truck from the index
+
+    invalidate()
+        Discards the index, so it is rebuilt on next use
+    """
+    extension_name = None
+
+    def __init__(self):
+        self.refresh_interval = None
+        self._lock = threading.RLock()
+        self._built_at = None
+        register_write_listener(self)
+
+
+    def init_app(self, app):
+        """
+        Registers the index as an extension of a Flask app and reads its configuration
+
+        Parameters:
+            app (object): Flask app
+
+        Returns:
+            -
+        """
+        self.refresh_interval = app.config['INDEX_REFRESH_INTERVAL_SEC']
+        app.extensions[self.extension_name] = self
+
+
+    def ensure_built(self):
+        """
+        Builds the index from the database if it has not been built, or if it is older
+        than the refresh interval. Must be called within an application context.
+        """
+        with self._lock:
+            if self._built_at is not None:
+                if self.refresh_interval is None or time.time() - self._built_at < self.refresh_interval:
+                    return
+            self._build()
+            self._built_at = time.time()
+
+
+    def upsert(self, record):
+        """
+        Inserts or replaces a truck in the index. Writes are ignored until the index is built.
+
+        Parameters:
+            record (TruckRecord): snapshot of the written truck
+
+        Returns:
+            -
+        """
+        with self._lock:
+            if self._built_at is not None:
+                self._remove(record.uuid)
+                self._insert(record)
+
+
+    def remove(self, uuid):
+        """
+        Removes a truck from the index. Writes are ignored until the index is built.
+
+        Parameters:
+            uuid (int): id of the deleted truck
+
+        Returns:
+            -
+        """
+        with self._lock:
+            if self._built_at is not None:
+                self._remove(uuid)
+
+
+    def invalidate(self):
+        """
+        Discards the content of the index, so it is rebuilt on next use
+        """
+        with self._lock:
+            if self._built_at is not None:
+                self._built_at = None
+                self._clear()
+
+
+    def _build(self):
+        self._clear()
+        for record in fetch_truck_records():
+            self._insert(record)
+
+
+    def _clear(self):
+        raise NotImplementedError()
+
+
+    def _insert(self, record):
+        raise NotImplementedError()
+
+
+    def _remove(self, uuid):
+        raise NotImplementedError()
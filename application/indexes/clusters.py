@@ -0,0 +1,63 @@
+from application.utils.cluster_hierarchy import ClusterHierarchy
+from .base import InMemoryIndex
+
+
+class ClusterIndex(InMemoryIndex):
+    """
+    A class used to encapsulate a per-process hierarchy of FoodTruck marker clusters
+    for every zoom level of the location map. The hierarchy is updated incrementally
+    when trucks are created, updated or deleted.
+
+    Methods
+    -------
+    query(min_lat, min_lon, max_lat, max_lon, zoom)
+        Returns the clusters at a zoom level inside a latitude/longitude box
+    """
+    extension_name = 'cluster_index'
+
+    def __init__(self):
+        self.max_zoom = None
+        self.cell_px = None
+        self.sample_size = None
+        self._hierarchy = None
+        super(ClusterIndex, self).__init__()
+
+
+    def init_app(self, app):
+        self.max_zoom = app.config['CLUSTER_MAX_ZOOM']
+        self.cell_px = app.config['CLUSTER_CELL_PX']
+        self.sample_size = app.config['CLUSTER_SAMPLE_SIZE']
+        super(ClusterIndex, self).init_app(app)
+
+
+    def query(self, min_lat, min_lon, max_lat, max_lon, zoom):
+        """
+        Returns the truck clusters at a zoom level inside a latitude/longitude box
+
+        Parameters:
+            min_lat (float): southern boundary in decimal format
+            min_lon (float): western boundary in decimal format
+            max_lat (float): northern boundary in decimal format
+            max_lon (float): eastern boundary in decimal format
+            zoom (int): zoom level of the map
+
+        Returns:
+            list: list of dicts with the centroid, truck count and sample truck ids of each cluster
+        """
+        with self._lock:
+            self.ensure_built()
+            clusters = self._hierarchy.query(min_lat, min_lon, max_lat, max_lon, zoom, self.sample_size)
+        return [{'latitude': lat, 'longitude': lon, 'count': count, 'sample': sample}
+                for lat, lon, count, sample in clusters]
+
+
+    def _clear(self):
+        self._hierarchy = ClusterHierarchy(self.max_zoom, self.cell_px)
+
+
+    def _insert(self, record):
+        self._hierarchy.insert(record.uuid, record.latitude, record.longitude)
+
+
+    def _remove(self, uuid):
+        self._hierarchy.remove(uuid)
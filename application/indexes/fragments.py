@@ -0,0 +1,115 @@
+import threading
+from application.models import register_write_listener
+from application.utils.etag import SERIALIZED_FIELDS
+from application.utils.json_fragments import encode_fragment
+from application.utils.lru_cache import LRUCache
+
+
+class FragmentCache(object):
+    """
+    A class used to encapsulate a per-process cache of the JSON encoding of every truck,
+    so that list responses are assembled from encoded fragments, and a truck is only
+    encoded again after it has been written. A fragment is discarded when a write to
+    its truck is committed, and is only used if it was encoded from the same values as
+    the queried truck, so writes committed by other processes are never served stale.
+
+    Attributes
+    ----------
+    extension_name (str)
+        Key the cache is registered under in app.extensions
+
+    Methods
+    -------
+    init_app(app)
+        Registers the cache as an extension of a Flask app
+
+    fragment(truck)
+        Returns the JSON encoding of a truck
+
+    fragments(trucks)
+        Returns the JSON encodings of several trucks
+
+    upsert(record)
+        Discards the fragment of a written truck
+
+    remove(uuid)
+        Discards the fragment of a deleted truck
+
+    invalidate()
+        Discards every fragment
+    """
+    extension_name = 'fragment_cache'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fragments = None
+        register_write_listener(self)
+
+
+    def init_app(self, app):
+        """
+        Registers the cache as an extension of a Flask app and reads its configuration
+
+        Parameters:
+            app (object): Flask app
+
+        Returns:
+            -
+        """
+        self._fragments = LRUCache(app.config['FRAGMENT_CACHE_MAX_SIZE'])
+        app.extensions[self.extension_name] = self
+
+
+    def fragment(self, truck):
+        """
+        Returns the JSON encoding of the serialized truck, encoding it if it is not
+        cached or has changed
+
+        Parameters:
+            truck (object): queried FoodTruck object or TruckRecord snapshot
+
+        Returns:
+            Fragment: encoded truck
+        """
+        return self.fragments([truck])[0]
+
+
+    def fragments(self, trucks):
+        """
+        Returns the JSON encodings of the serialized trucks, encoding the trucks that are
+        not cached or have changed
+
+        Parameters:
+            trucks (iterable): queried FoodTruck objects or TruckRecord snapshots
+
+        Returns:
+            list: list of Fragment objects
+        """
+        ret = []
+        with self._lock:
+            for truck in trucks:
+                values = tuple(getattr(truck, field) for field in SERIALIZED_FIELDS)
+                cached = self._fragments.get(truck.uuid)
+                if cached is None or cached[0] != values:
+                    cached = (values, encode_fragment(dict(zip(SERIALIZED_FIELDS, values))))
+                    self._fragments.put(truck.uuid, cached)
+                ret.append(cached[1])
+        return ret
+
+
+    def upsert(self, record):
+        with self._lock:
+            if self._fragments is not None:
+                self._fragments.pop(record.uuid)
+
+
+    def remove(self, uuid):
+        with self._lock:
+            if self._fragments is not None:
+                self._fragments.pop(uuid)
+
+
+    def invalidate(self):
+        with self._lock:
+            if self._fragments is not None:
+                self._fragments.clear()
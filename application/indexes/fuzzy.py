@@ -0,0 +1,63 @@
+from application.utils.fuzzy_index import FuzzyIndex
+from .base import InMemoryIndex
+
+
+class FuzzySearchIndex(InMemoryIndex):
+    """
+    A class used to encapsulate per-process typo-tolerant indexes of the FoodTruck names
+    and menu items. Misspelled searches are answered from deletion dictionaries of the
+    words of the names and menu items, without computing the edit distance to every word.
+
+    Attributes
+    ----------
+    fields (tuple)
+        Names of the searchable fields
+
+    Methods
+    -------
+    search(field, needle)
+        Returns the trucks with a name or menu items close to a needle
+    """
+    extension_name = 'fuzzy_index'
+    fields = ('name', 'food_items')
+
+    def __init__(self):
+        self.max_edits = None
+        self._indexes = None
+        super(FuzzySearchIndex, self).__init__()
+
+
+    def init_app(self, app):
+        self.max_edits = app.config['FUZZY_MAX_EDITS']
+        super(FuzzySearchIndex, self).init_app(app)
+
+
+    def search(self, field, needle):
+        """
+        Returns the trucks with a word of the name or menu items within a few typos of
+        every word of a needle, ignoring case and diacritics
+
+        Parameters:
+            field (str): searched field, 'name' or 'food_items'
+            needle (str): searched words
+
+        Returns:
+            dict: total number of typos of every matching truck id
+        """
+        with self._lock:
+            self.ensure_built()
+            return self._indexes[field].search(needle)
+
+
+    def _clear(self):
+        self._indexes = dict((field, FuzzyIndex(self.max_edits)) for field in self.fields)
+
+
+    def _insert(self, record):
+        for field in self.fields:
+            self._indexes[field].insert(record.uuid, getattr(record, field))
+
+
+    def _remove(self, uuid):
+        for field in self.fields:
+            self._indexes[field].remove(uuid)
@@ -0,0 +1,72 @@
+from application.utils.spatial_grid import SpatialGrid
+from .base import InMemoryIndex
+
+
+class HeatmapIndex(InMemoryIndex):
+    """
+    A class used to encapsulate a per-process density grid of the FoodTruck coordinates
+    at several resolutions. The number of trucks in every grid cell is kept current
+    when trucks are created, updated or deleted, so a heatmap is served without
+    reading the FoodTruck table.
+
+    Attributes
+    ----------
+    cell_sizes (list)
+        Width and height of the grid cells in decimal degrees at every level,
+        from coarsest to finest
+
+    Methods
+    -------
+    counts(level, accept)
+        Returns the number of trucks in every occupied cell at a level
+    """
+    extension_name = 'heatmap_index'
+
+    def __init__(self):
+        self.cell_sizes = None
+        self._grids = None
+        super(HeatmapIndex, self).__init__()
+
+
+    def init_app(self, app):
+        self.cell_sizes = sorted(app.config['HEATMAP_CELL_SIZES'], reverse=True)
+        super(HeatmapIndex, self).init_app(app)
+
+
+    def counts(self, level, accept=None):
+        """
+        Returns the number of trucks in every occupied grid cell at a level, optionally
+        only counting the trucks with ids in accept
+
+        Parameters:
+            level (int): index of the resolution in cell_sizes
+            accept (set): ids of the trucks to count (optional)
+
+        Returns:
+            list: (latitude, longitude, count) tuples of the south-west corner of every
+                occupied cell, sorted by cell
+
+        Raises:
+            ValueError: if the level does not exist
+        """
+        if not 0 <= level < len(self.cell_sizes):
+            raise ValueError('level must be between 0 and {}'.format(len(self.cell_sizes) - 1))
+        cell_size = self.cell_sizes[level]
+        with self._lock:
+            self.ensure_built()
+            counts = self._grids[level].cell_counts(accept)
+        return [(row * cell_size, col * cell_size, count) for row, col, count in counts]
+
+
+    def _clear(self):
+        self._grids = [SpatialGrid(cell_size) for cell_size in self.cell_sizes]
+
+
+    def _insert(self, record):
+        for grid in self._grids:
+            grid.insert(record.uuid, record.latitude, record.longitude)
+
+
+    def _remove(self, uuid):
+        for grid in self._grids:
+            grid.remove(uuid)
@@ -0,0 +1,72 @@
+from application.utils.inverted_index import InvertedIndex, LIKE_WILDCARDS
+from .base import InMemoryIndex
+
+
+class ItemsIndex(InMemoryIndex):
+    """
+    A class used to encapsulate a per-process inverted index of the FoodTruck menu items.
+    Substring searches of the food_items field are answered from the posting lists of
+    the menu item tokens instead of scanning every menu.
+
+    Methods
+    -------
+    search(needle)
+        Returns the ids of the trucks with menu items that contain a substring
+
+    estimate(needle)
+        Returns an upper bound of the number of trucks with menu items that contain a substring
+    """
+    extension_name = 'items_index'
+
+    def __init__(self):
+        self._index = None
+        super(ItemsIndex, self).__init__()
+
+
+    def search(self, needle):
+        """
+        Returns the trucks with menu items that contain a substring, ignoring case, like
+        the SQL condition food_items ILIKE '%needle%'. Needles containing LIKE wildcards
+        are not supported, since their meaning differs between the two.
+
+        Parameters:
+            needle (str): substring that food_items must contain
+
+        Returns:
+            set: ids of the matching trucks, or None if the needle is not supported
+        """
+        if any(c in needle for c in LIKE_WILDCARDS):
+            return None
+        with self._lock:
+            self.ensure_built()
+            return self._index.search(needle)
+
+
+    def estimate(self, needle):
+        """
+        Returns an upper bound of the number of trucks with menu items that contain a
+        substring, from the posting list lengths of the index
+
+        Parameters:
+            needle (str): substring to search for
+
+        Returns:
+            int: upper bound of the number of matching trucks
+        """
+        with self._lock:
+            self.ensure_built()
+            if any(c in needle for c in LIKE_WILDCARDS):
+                return len(self._index)
+            return self._index.estimate(needle)
+
+
+    def _clear(self):
+        self._index = InvertedIndex()
+
+
+    def _insert(self, record):
+        self._index.insert(record.uuid, record.food_items)
+
+
+    def _remove(self, uuid):
+        self._index.remove(uuid)
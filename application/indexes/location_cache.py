@@ -0,0 +1,166 @@
+from collections import namedtuple
+from application.utils.haversine import haversine
+from application.utils.lru_cache import LRUCache
+from .base import InMemoryIndex
+
+
+# cached response of a location search from the center of a grid cell, and the distance
+# from the center within which a written truck may change the response
+CachedResponse = namedtuple('CachedResponse', ['response', 'latitude', 'longitude', 'reach'])
+
+
+class LocationCache(InMemoryIndex):
+    """
+    A class used to encapsulate a per-process cache of location search responses. Search
+    origins are quantized to the center of a latitude/longitude grid cell, so that every
+    client within a cell shares the cached response of the cell center. Responses are
+    kept in a bounded cache with LRU and time to live eviction.
+
+    The cache keeps the coordinates of every truck, so that a committed write only evicts
+    the responses with a search circle containing the previous or new coordinates of the
+    written truck. The responses of other cells remain cached.
+
+    Only the writes committed through this process are observed. A write committed by
+    another process, such as another worker or populate_db.py, is not reflected until the
+    cached responses expire, so responses may be stale for up to LOCATION_CACHE_TTL_SEC
+    seconds, or until the cache is rebuilt after INDEX_REFRESH_INTERVAL_SEC.
+
+    Attributes
+    ----------
+    grid_size (float)
+        Width and height of the grid cells in decimal degrees
+
+    generation (int)
+        Number of writes observed, to detect writes made while a response is computed
+
+    Methods
+    -------
+    quantize(lat, lon)
+        Returns the center of the grid cell containing a coordinate
+
+    key(lat, lon, args)
+        Returns the cache key of a search from a quantized origin
+
+    get(key)
+        Returns a cached response
+
+    put(key, response, lat, lon, reach, generation)
+        Caches a response, unless a write was observed since generation
+    """
+    extension_name = 'location_cache'
+
+    def __init__(self):
+        self.grid_size = None
+        self.max_size = None
+        self.ttl = None
+        self.generation = 0
+        self._positions = None
+        self._responses = None
+        super(LocationCache, self).__init__()
+
+
+    def init_app(self, app):
+        self.grid_size = app.config['LOCATION_CACHE_GRID_SIZE']
+        self.max_size = app.config['LOCATION_CACHE_MAX_SIZE']
+        self.ttl = app.config['LOCATION_CACHE_TTL_SEC']
+        super(LocationCache, self).init_app(app)
+
+
+    def quantize(self, lat, lon):
+        """
+        Returns the center of the grid cell containing a coordinate
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+
+        Returns:
+            tuple: (latitude, longitude) of the cell center
+        """
+        return (round(round(lat / self.grid_size) * self.grid_size, 7),
+                round(round(lon / self.grid_size) * self.grid_size, 7))
+
+
+    def key(self, lat, lon, args):
+        """
+        Returns the cache key of a search from a quantized origin with the remaining
+        request arguments, such as radius, name and item
+
+        Parameters:
+            lat (float): quantized latitude coordinate in decimal format
+            lon (float): quantized longitude coordinate in decimal format
+            args (MultiDict): request arguments
+
+        Returns:
+            tuple: hashable cache key
+        """
+        params = sorted((name, value) for name, value in args.items(multi=True)
+                        if name not in ('latitude', 'longitude'))
+        return (lat, lon, tuple(params))
+
+
+    def get(self, key):
+        """
+        Returns a cached response, unless it has been evicted or has expired
+
+        Parameters:
+            key (tuple): cache key
+
+        Returns:
+            dict: cached response, or None
+        """
+        with self._lock:
+            self.ensure_built()
+            entry = self._responses.get(key)
+            return entry.response if entry is not None else None
+
+
+    def put(self, key, response, lat, lon, reach, generation):
+        """
+        Caches a response. The response is discarded if a write was observed since
+        generation was read, since it may have been computed before the write.
+
+        Parameters:
+            key (tuple): cache key
+            response (dict): response of the search, which must not be modified afterwards
+            lat (float): quantized latitude coordinate in decimal format
+            lon (float): quantized longitude coordinate in decimal format
+            reach (float): distance in meters within which a written truck may change
+                the response
+            generation (int): generation read before the response was computed
+
+        Returns:
+            -
+        """
+        with self._lock:
+            self.ensure_built()
+            if generation == self.generation:
+                self._responses.put(key, CachedResponse(response, lat, lon, reach))
+
+
+    def _evict_near(self, lat, lon):
+        """
+        Evicts the responses with a search circle containing a coordinate
+        """
+        if lat is None or lon is None:
+            return
+        self._responses.evict(lambda entry: haversine(entry.latitude, entry.longitude, lat, lon) <= entry.reach)
+
+
+    def _clear(self):
+        self.generation += 1
+        self._positions = {}
+        self._responses = LRUCache(self.max_size, self.ttl)
+
+
+    def _insert(self, record):
+        self.generation += 1
+        self._evict_near(record.latitude, record.longitude)
+        self._positions[record.uuid] = (record.latitude, record.longitude)
+
+
+    def _remove(self, uuid):
+        self.generation += 1
+        position = self._positions.pop(uuid, None)
+        if position is not None:
+            self._evict_near(*position)
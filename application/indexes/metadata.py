@@ -0,0 +1,78 @@
+from collections import namedtuple
+from application.models import FoodTruck
+from .base import InMemoryIndex
+
+
+# number of trucks, bounds of their coordinates and largest truck id
+CollectionMetadata = namedtuple('CollectionMetadata', ['entries', 'min_latitude', 'min_longitude',
+                                                       'max_latitude', 'max_longitude', 'max_uuid'])
+
+
+def _extend(func, bound, value):
+    """
+    Returns a bound extended to include a value, or the value if there is no bound
+    """
+    return value if bound is None else func(bound, value)
+
+
+class MetadataIndex(InMemoryIndex):
+    """
+    A class used to encapsulate per-process metadata of the FoodTruck collection, so that
+    the root endpoint is served from memory. The metadata is built by a single aggregate
+    query. Created trucks are added to it, since they are assigned ids beyond the largest
+    known id. Updated and deleted trucks may have defined the bounds of the coordinates,
+    which cannot be recomputed from the metadata, so they mark it out of date instead,
+    and the aggregate query is repeated on next use.
+
+    Methods
+    -------
+    metadata()
+        Returns the metadata of the collection
+    """
+    extension_name = 'metadata_index'
+
+    def __init__(self):
+        self._metadata = None
+        super(MetadataIndex, self).__init__()
+
+
+    def metadata(self):
+        """
+        Returns the number of trucks, the bounds of their coordinates and the largest
+        truck id, querying the database if the metadata is out of date
+
+        Returns:
+            CollectionMetadata: metadata of the collection
+        """
+        with self._lock:
+            self.ensure_built()
+            return self._metadata
+
+
+    def _build(self):
+        self._metadata = CollectionMetadata(*FoodTruck.get_collection_metadata())
+
+
+    def _clear(self):
+        self._metadata = None
+
+
+    def _insert(self, record):
+        # updated trucks have already marked the metadata out of date in _remove
+        if self._built_at is None:
+            return
+        metadata = self._metadata._replace(entries=self._metadata.entries + 1, max_uuid=record.uuid)
+        if record.latitude is not None and record.longitude is not None:
+            metadata = metadata._replace(
+                min_latitude=_extend(min, metadata.min_latitude, record.latitude),
+                min_longitude=_extend(min, metadata.min_longitude, record.longitude),
+                max_latitude=_extend(max, metadata.max_latitude, record.latitude),
+                max_longitude=_extend(max, metadata.max_longitude, record.longitude))
+        self._metadata = metadata
+
+
+    def _remove(self, uuid):
+        # trucks beyond the largest id are new and are added by _insert
+        if self._metadata.max_uuid is None or uuid > self._metadata.max_uuid:
+            return
+        self._built_at = None
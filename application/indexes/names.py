@@ -0,0 +1,72 @@
+from application.utils.inverted_index import TrigramIndex, LIKE_WILDCARDS
+from .base import InMemoryIndex
+
+
+class NamesIndex(InMemoryIndex):
+    """
+    A class used to encapsulate a per-process trigram index of the FoodTruck names, for
+    backends without trigram indexes. Substring searches of the name field are answered
+    from the posting lists of the name trigrams instead of scanning every name.
+
+    Methods
+    -------
+    search(needle)
+        Returns the ids of the trucks with names that contain a substring
+
+    estimate(needle)
+        Returns an upper bound of the number of trucks with names that contain a substring
+    """
+    extension_name = 'names_index'
+
+    def __init__(self):
+        self._index = None
+        super(NamesIndex, self).__init__()
+
+
+    def search(self, needle):
+        """
+        Returns the trucks with names that contain a substring, ignoring case, like the
+        SQL condition name ILIKE '%needle%'. Needles containing LIKE wildcards
+        are not supported, since their meaning differs between the two.
+
+        Parameters:
+            needle (str): substring that name must contain
+
+        Returns:
+            set: ids of the matching trucks, or None if the needle is not supported
+        """
+        if any(c in needle for c in LIKE_WILDCARDS):
+            return None
+        with self._lock:
+            self.ensure_built()
+            return self._index.search(needle)
+
+
+    def estimate(self, needle):
+        """
+        Returns an upper bound of the number of trucks with names that contain a
+        substring, from the posting list lengths of the index
+
+        Parameters:
+            needle (str): substring to search for
+
+        Returns:
+            int: upper bound of the number of matching trucks
+        """
+        with self._lock:
+            self.ensure_built()
+            if any(c in needle for c in LIKE_WILDCARDS):
+                return len(self._index)
+            return self._index.estimate(needle)
+
+
+    def _clear(self):
+        self._index = TrigramIndex()
+
+
+    def _insert(self, record):
+        self._index.insert(record.uuid, record.name)
+
+
+    def _remove(self, uuid):
+        self._index.remove(uuid)
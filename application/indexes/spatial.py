@@ -0,0 +1,166 @@
+from application.utils.spatial_grid import SpatialGrid
+from .base import InMemoryIndex
+
+
+class SpatialIndex(InMemoryIndex):
+    """
+    A class used to encapsulate a per-process spatial grid index of the FoodTruck
+    coordinates. Radius queries only compute the great-circle distance for trucks
+    in the grid cells overlapping the search circle.
+
+    Methods
+    -------
+    query_radius(lat, lon, radius)
+        Returns the ids of the trucks within radius distance of a coordinate
+
+    nearest(lat, lon, k, max_dist, accept, after)
+        Returns the ids of the k trucks nearest to a coordinate
+
+    query_box(min_lat, min_lon, max_lat, max_lon)
+        Returns the ids of the trucks inside a latitude/longitude box
+
+    query_route(route, width)
+        Returns the ids of the trucks within width distance of a route
+
+    count()
+        Returns the number of trucks
+
+    count_box(min_lat, min_lon, max_lat, max_lon)
+        Returns an upper bound of the number of trucks inside a latitude/longitude box
+    """
+    extension_name = 'spatial_index'
+
+    def __init__(self):
+        self.cell_size = None
+        self._grid = None
+        super(SpatialIndex, self).__init__()
+
+
+    def init_app(self, app):
+        self.cell_size = app.config['SPATIAL_INDEX_CELL_SIZE']
+        super(SpatialIndex, self).init_app(app)
+
+
+    def query_radius(self, lat, lon, radius):
+        """
+        Returns the trucks within radius distance of the position specified by
+        lon(gitude) and lat(itude).
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            radius (float): search radius in meters
+
+        Returns:
+            list: (distance, uuid) tuples sorted by ascending distance
+        """
+        with self._lock:
+            self.ensure_built()
+            return self._grid.query_radius(lat, lon, radius)
+
+
+    def nearest(self, lat, lon, k, max_dist=None, accept=None, after=None):
+        """
+        Returns the k trucks nearest to the position specified by lon(gitude) and
+        lat(itude). The search ends as soon as the k-th nearest truck is known, and
+        starts at the distance of after, so previous pages are not visited again.
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            k (int): number of trucks to return
+            max_dist (float): maximum distance in meters of returned trucks (optional)
+            accept (set): ids of the trucks that may be returned (optional)
+            after (tuple): (distance, uuid) key to return trucks after (optional)
+
+        Returns:
+            list: (distance, uuid) tuples sorted by ascending distance
+        """
+        matches = []
+        with self._lock:
+            self.ensure_built()
+            for dist, uuid in self._grid.nearest(lat, lon, min_dist=after[0] if after else 0):
+                if max_dist is not None and dist > max_dist:
+                    break
+                if after is not None and (dist, uuid) <= after:
+                    continue
+                if accept is None or uuid in accept:
+                    matches.append((dist, uuid))
+                    if len(matches) == k:
+                        break
+        return matches
+
+
+    def query_box(self, min_lat, min_lon, max_lat, max_lon):
+        """
+        Returns the trucks inside a latitude/longitude box. If min_lon is greater
+        than max_lon, the box is assumed to cross the antimeridian.
+
+        Parameters:
+            min_lat (float): southern boundary in decimal format
+            min_lon (float): western boundary in decimal format
+            max_lat (float): northern boundary in decimal format
+            max_lon (float): eastern boundary in decimal format
+
+        Returns:
+            list: ids of the trucks inside the box
+        """
+        with self._lock:
+            self.ensure_built()
+            return [uuid for uuid, __, __ in self._grid.query_box(min_lat, min_lon, max_lat, max_lon)]
+
+
+    def query_route(self, route, width):
+        """
+        Returns the trucks within width distance of any segment of a route
+
+        Parameters:
+            route (list): (lat, lon) tuples of the route vertices in decimal format
+            width (float): corridor width in meters on each side of the route
+
+        Returns:
+            list: (position, distance, uuid) tuples sorted by ascending position along the route
+        """
+        with self._lock:
+            self.ensure_built()
+            return self._grid.query_route(route, width)
+
+
+    def count(self):
+        """
+        Returns the number of trucks in the index
+        """
+        with self._lock:
+            self.ensure_built()
+            return len(self._grid)
+
+
+    def count_box(self, min_lat, min_lon, max_lat, max_lon):
+        """
+        Returns the number of trucks in the grid cells overlapping a latitude/longitude
+        box, as an estimate of the number of trucks inside the box
+
+        Parameters:
+            min_lat (float): southern boundary in decimal format
+            min_lon (float): western boundary in decimal format
+            max_lat (float): northern boundary in decimal format
+            max_lon (float): eastern boundary in decimal format
+
+        Returns:
+            int: upper bound of the number of trucks inside the box
+        """
+        with self._lock:
+            self.ensure_built()
+            return self._grid.count_box(min_lat, min_lon, max_lat, max_lon)
+
+
+    def _clear(self):
+        self._grid = SpatialGrid(self.cell_size)
+
+
+    def _insert(self, record):
+        self._grid.insert(record.uuid, record.latitude, record.longitude)
+
+
+    def _remove(self, uuid):
+        self._grid.remove(uuid)
@@ -0,0 +1,127 @@
+import threading
+from application.models import register_write_listener, fetch_truck_record
+from application.utils.lru_cache import LRUCache
+
+
+class TruckCache(object):
+    """
+    A class used to encapsulate a per-process read-through cache of trucks by id. Trucks
+    that are not cached are queried as TruckRecord snapshots, without loading them into
+    the ORM session, and are kept in a bounded cache with LRU and time to live eviction.
+    A truck is discarded when a write to it is committed, while writes committed by other
+    processes are picked up once the cached truck expires.
+
+    Attributes
+    ----------
+    extension_name (str)
+        Key the cache is registered under in app.extensions
+
+    hits (int)
+        Number of lookups answered from the cache
+
+    misses (int)
+        Number of lookups answered from the database
+
+    Methods
+    -------
+    init_app(app)
+        Registers the cache as an extension of a Flask app
+
+    get(uuid)
+        Returns a truck by id, querying the database if it is not cached
+
+    stats()
+        Returns the hit and miss counters and the number of cached trucks
+
+    upsert(record)
+        Discards a written truck
+
+    remove(uuid)
+        Discards a deleted truck
+
+    invalidate()
+        Discards every truck
+    """
+    extension_name = 'truck_cache'
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._trucks = None
+        register_write_listener(self)
+
+
+    def init_app(self, app):
+        """
+        Registers the cache as an extension of a Flask app and reads its configuration
+
+        Parameters:
+            app (object): Flask app
+
+        Returns:
+            -
+        """
+        self._trucks = LRUCache(app.config['TRUCK_CACHE_MAX_SIZE'], app.config['TRUCK_CACHE_TTL_SEC'])
+        app.extensions[self.extension_name] = self
+
+
+    def get(self, uuid):
+        """
+        Returns a truck by id from the cache, or queries and caches it if it is not cached.
+        A queried truck is not cached if a write was committed while it was queried.
+        Must be called within an application context.
+
+        Parameters:
+            uuid (int): id of the truck
+
+        Returns:
+            TruckRecord: snapshot of the truck, or None if it does not exist
+        """
+        with self._lock:
+            record = self._trucks.get(uuid)
+            if record is not None:
+                self.hits += 1
+                return record
+            self.misses += 1
+            generation = self._generation
+
+        record = fetch_truck_record(uuid)
+        if record is not None:
+            with self._lock:
+                if generation == self._generation:
+                    self._trucks.put(uuid, record)
+        return record
+
+
+    def stats(self):
+        """
+        Returns the hit and miss counters and the number of cached trucks
+
+        Returns:
+            dict: 'hits', 'misses' and 'size' of the cache
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._trucks)}
+
+
+    def upsert(self, record):
+        with self._lock:
+            self._generation += 1
+            if self._trucks is not None:
+                self._trucks.pop(record.uuid)
+
+
+    def remove(self, uuid):
+        with self._lock:
+            self._generation += 1
+            if self._trucks is not None:
+                self._trucks.pop(uuid)
+
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            if self._trucks is not None:
+                self._trucks.clear()
@@ -0,0 +1,73 @@
+from application.utils.etag import truck_digest, truck_etag, collection_etag
+from .base import InMemoryIndex
+
+
+class VersionIndex(InMemoryIndex):
+    """
+    A class used to encapsulate a per-process index of the versions of the FoodTruck
+    resources, to answer conditional requests without querying or serializing trucks.
+    The version of a truck is a digest of its content, and the version of the collection
+    combines the digests of every truck with exclusive or, so that a write only updates
+    the digest of the written truck. Since versions are derived from the content, every
+    process agrees on the version of the same content, and responses can be tagged from
+    the served content itself.
+
+    Methods
+    -------
+    truck_version(uuid)
+        Returns the entity tag of a truck
+
+    collection_version()
+        Returns the entity tag of the collection
+    """
+    extension_name = 'version_index'
+
+    def __init__(self):
+        self._digests = None
+        self._collection_digest = None
+        super(VersionIndex, self).__init__()
+
+
+    def truck_version(self, uuid):
+        """
+        Returns the entity tag of a truck
+
+        Parameters:
+            uuid (int): id of the truck
+
+        Returns:
+            str: entity tag of the truck, or None if it does not exist
+        """
+        with self._lock:
+            self.ensure_built()
+            digest = self._digests.get(uuid)
+            return truck_etag(digest) if digest is not None else None
+
+
+    def collection_version(self):
+        """
+        Returns the entity tag of the collection
+
+        Returns:
+            str: entity tag of the collection
+        """
+        with self._lock:
+            self.ensure_built()
+            return collection_etag(len(self._digests), self._collection_digest)
+
+
+    def _clear(self):
+        self._digests = {}
+        self._collection_digest = 0
+
+
+    def _insert(self, record):
+        digest = truck_digest(record)
+        self._digests[record.uuid] = digest
+        self._collection_digest ^= digest
+
+
+    def _remove(self, uuid):
+        digest = self._digests.pop(uuid, None)
+        if digest is not None:
+            self._collection_digest ^= digest
@@ -5,4 +5,7 @@ db = SQLAlchemy()
 bcrypt = Bcrypt()
 
 from .user import User
-from .food_truck import FoodTruck
\ No newline at end of file
+from .menu_item import MenuItem, food_truck_items, item_suffixes
+from .food_truck import FoodTruck
+from .events import TruckRecord, register_write_listener, invalidate_write_listeners, fetch_truck_records
+from .events import fetch_truck_record
\ No newline at end of file
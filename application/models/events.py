@@ -0,0 +1,190 @@
+from collections import namedtuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.dialects import postgresql
+from application.utils.menu import menu_item_suffixes
+from . import db
+from .food_truck import FoodTruck
+from .menu_item import MenuItem, food_truck_items, item_suffixes
+
+
+# plain snapshot of a FoodTruck row that remains valid after its session is closed
+TruckRecord = namedtuple('TruckRecord', ['uuid', 'name', 'longitude', 'latitude',
+                                         'days_hours', 'food_items', 'user_id'])
+
+# session.info key for writes awaiting commit
+_PENDING_WRITES = 'pending_food_truck_writes'
+
+# session.info key for the ids of menu items that may no longer be served after a flush
+_STALE_MENU_ITEMS = 'stale_menu_items'
+
+_listeners = []
+
+
+def register_write_listener(listener):
+    """
+    Registers a listener that is notified of committed writes to the FoodTruck model.
+    Listeners must implement upsert(record), remove(uuid) and invalidate(), and are
+    notified in the order they were registered.
+
+    Parameters:
+        listener (object): object to notify of committed writes
+
+    Returns:
+        -
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def invalidate_write_listeners():
+    """
+    Notifies every registered listener that its state can no longer be trusted,
+    e.g. after the table has been modified outside of the ORM.
+    """
+    for listener in _listeners:
+        listener.invalidate()
+
+
+def to_record(truck):
+    """
+    Returns a TruckRecord snapshot of a FoodTruck instance
+
+    Parameters:
+        truck (FoodTruck): instance to snapshot
+
+    Returns:
+        TruckRecord: snapshot of the instance columns
+    """
+    return TruckRecord(truck.uuid, truck.name, truck.longitude, truck.latitude,
+                       truck.days_hours, truck.food_items, truck.user_id)
+
+
+def fetch_truck_records():
+    """
+    Queries the columns of every FoodTruck in the database without loading ORM instances
+
+    Returns:
+        list: list of TruckRecord objects
+    """
+    rows = db.session.query(*[getattr(FoodTruck, column) for column in TruckRecord._fields]).all()
+    return [TruckRecord(*row) for row in rows]
+
+
+def fetch_truck_record(uuid):
+    """
+    Queries the columns of a FoodTruck by id without loading an ORM instance
+
+    Parameters:
+        uuid (int): id of the truck
+
+    Returns:
+        TruckRecord: snapshot of the truck, or None if it does not exist
+    """
+    row = (db.session.query(*[getattr(FoodTruck, column) for column in TruckRecord._fields])
+           .filter(FoodTruck.uuid == uuid).first())
+    return TruckRecord(*row) if row is not None else None
+
+
+def _queue_write(session, write):
+    session.info.setdefault(_PENDING_WRITES, []).append(write)
+
+
+@event.listens_for(FoodTruck, 'after_insert')
+@event.listens_for(FoodTruck, 'after_update')
+def _on_upsert(mapper, connection, target):
+    _queue_write(object_session(target), ('upsert', to_record(target)))
+
+
+@event.listens_for(FoodTruck, 'after_delete')
+def _on_delete(mapper, connection, target):
+    _queue_write(object_session(target), ('remove', target.uuid))
+
+
+@event.listens_for(Session, 'after_bulk_update')
+@event.listens_for(Session, 'after_bulk_delete')
+def _on_bulk_write(context):
+    # the affected rows of a bulk query are unknown, so listeners must start over
+    if context.mapper.class_ is FoodTruck:
+        _queue_write(context.session, ('invalidate',))
+
+
+def _insert_ignoring_conflicts(connection, table, rows):
+    """
+    Inserts rows into a table, skipping the rows that conflict with an existing row,
+    e.g. a menu item inserted at the same time by another session
+    """
+    if connection.dialect.name == 'postgresql':
+        stmt = postgresql.insert(table).on_conflict_do_nothing()
+    elif connection.dialect.name == 'mysql':
+        stmt = table.insert().prefix_with('IGNORE')
+    else:
+        stmt = table.insert().prefix_with('OR IGNORE')
+    connection.execute(stmt, rows)
+
+
+@event.listens_for(Session, 'before_flush')
+def _sync_menu_items(session, flush_context, instances):
+    # associate new trucks and trucks with modified food_items with their menu items
+    trucks = [obj for obj in session.new if isinstance(obj, FoodTruck)]
+    changed = [obj for obj in session.dirty if isinstance(obj, FoodTruck) and
+               inspect(obj).attrs.food_items.history.has_changes()]
+    deleted = [obj for obj in session.deleted if isinstance(obj, FoodTruck)]
+    if not (trucks or changed or deleted):
+        return
+
+    # menu item names in order of appearance
+    names = []
+    for truck in trucks + changed:
+        names += [name for name in MenuItem.parse(truck.food_items) if name not in names]
+    with session.no_autoflush:
+        # the previous menu items of changed and deleted trucks may no longer be served
+        stale = session.info.setdefault(_STALE_MENU_ITEMS, set())
+        stale.update(item.id for truck in changed + deleted for item in truck.items)
+
+        # insert the missing menu items and their suffixes, tolerating menu items inserted
+        # by concurrent sessions, instead of adding them to the session
+        items = MenuItem.__table__
+        connection = session.connection()
+        existing = set(name for name, in connection.execute(
+            db.select([items.c.name]).where(items.c.name.in_(names)))) if names else set()
+        missing = [name for name in names if name not in existing]
+        if missing:
+            _insert_ignoring_conflicts(connection, items, [{'name': name} for name in missing])
+            ids = dict(connection.execute(db.select([items.c.name, items.c.id]).where(items.c.name.in_(missing))).fetchall())
+            _insert_ignoring_conflicts(connection, item_suffixes, [{'suffix': suffix, 'item_id': ids[name]}
+                                                                   for name in missing
+                                                                   for suffix in menu_item_suffixes(name)])
+
+        items = dict((item.name, item) for item in
+                     session.query(MenuItem).filter(MenuItem.name.in_(names))) if names else {}
+    for truck in trucks + changed:
+        truck.items = [items[name] for name in MenuItem.parse(truck.food_items)]
+
+
+@event.listens_for(Session, 'after_flush')
+def _prune_menu_items(session, flush_context):
+    # delete the previous menu items of changed and deleted trucks that no truck serves anymore
+    stale = session.info.pop(_STALE_MENU_ITEMS, None)
+    if not stale:
+        return
+    items = MenuItem.__table__
+    connection = session.connection()
+    served = db.exists().where(food_truck_items.c.item_id == items.c.id)
+    unused = [id for id, in connection.execute(db.select([items.c.id]).where(items.c.id.in_(stale)).where(~served))]
+    if unused:
+        connection.execute(item_suffixes.delete().where(item_suffixes.c.item_id.in_(unused)))
+        connection.execute(items.delete().where(items.c.id.in_(unused)))
+
+
+@event.listens_for(Session, 'after_commit')
+def _on_commit(session):
+    for write in session.info.pop(_PENDING_WRITES, []):
+        for listener in _listeners:
+            getattr(listener, write[0])(*write[1:])
+
+
+@event.listens_for(Session, 'after_rollback')
+def _on_rollback(session):
+    session.info.pop(_PENDING_WRITES, None)
+    session.info.pop(_STALE_MENU_ITEMS, None)
@@ -1,9 +1,40 @@
-from application.utils.haversine import haversine
+import math
+import bisect
+from application.utils.haversine import (haversine, bounding_box, unit_vector,
+                                        min_dot_product, EARTH_RADIUS)
+from application.utils.geohash import encode, geohash_ranges, merge_ranges, GEOHASH_PRECISION
+from application.utils.polyline import route_segments, corridor_boxes
+from application.utils.spatial_grid import SpatialGrid
+from application.utils.query_planner import plan_radius_query
+from application.utils.inverted_index import LIKE_WILDCARDS
+from application.utils.menu import within_menu_item
 from sqlalchemy.ext.hybrid import hybrid_method
+from sqlalchemy.orm import validates
 from sqlalchemy import func
 from sqlalchemy.orm import aliased
 from flask_sqlalchemy import SQLAlchemy
-from . import db, User
+from flask import current_app
+from . import db, User, MenuItem, food_truck_items
+
+
+# maximum number of search boxes, geohash ranges or ids in a single query of a lookup with
+# many search areas, to keep the expression trees and bound parameters of the queries
+# within the limits of SQLite
+BATCH_QUERY_SIZE = 100
+
+# maximum number of search circles in a single query of the distances of a batch radius
+# lookup, as every search circle binds about twenty parameters
+BATCH_DISTANCE_SIZE = 25
+
+
+def _in_ids(column, ids):
+    """
+    Returns a SQL expression selecting the rows with a column in a set of integer ids.
+    The ids are rendered as literals instead of bound parameters, since index lookups
+    may select thousands of trucks, and the number of bound parameters of a statement
+    is limited, e.g. to 999 by SQLite before version 3.32.
+    """
+    return column.in_([db.literal_column(str(int(id))) for id in sorted(ids)])
 
 class FoodTruck(db.Model):
     """
@@ -29,19 +60,102 @@ class FoodTruck(db.Model):
     food_items (string)
         String representation of menu items
 
+    items (list)
+        Normalized menu items of the truck, kept current with food_items on flush
+
+    geohash (string)
+        Geohash of the truck coordinates, kept current whenever they are set
+
+    unit_x, unit_y, unit_z (float)
+        Components of the 3D unit vector of the truck coordinates on the sphere,
+        kept current whenever they are set
+
     Methods
     -------
     serialize
         Returns a dictionary representation of a class instance
 
+    update_spatial_columns(key, value)
+        Recomputes the geohash and unit vector whenever the latitude or longitude is set
+
+    dot_product(lat, lon)
+        Returns a SQL expression for the cosine of the angle between an element in the
+        FoodTruck model and a coordinate
+
     great_circle_distance(lat, lon)
         Calculates the great-circle distance between an instance of FoodTruck
         and a specified coordinate.
     
-    get_food_trucks_within_radius(lon, lat, radius, name, item)
+    contains_name(name, uuid, column, fuzzy)
+        Returns a SQL expression selecting the elements with names that contain a substring
+
+    contains_item(item, uuid, food_items, fuzzy)
+        Returns a SQL expression selecting the elements with menu items that contain
+        a substring
+
+    similar_uuids(field, needle)
+        Returns the ids of the trucks with a name or menu items within a few typos of
+        a needle
+
+    get_food_trucks_by_similarity(name, item)
+        Returns the trucks with names and/or menu items that contain or are within a
+        few typos of the specified strings, ranked by similarity
+
+    within_geohash_ranges(ranges)
+        Returns a SQL expression selecting the elements with a geohash inside any of
+        the specified ranges
+
+    within_box(min_lat, min_lon, max_lat, max_lon)
+        Returns a SQL expression selecting the elements inside a latitude/longitude box
+
+    get_food_trucks_within_radius(lon, lat, radius, name, item, fuzzy)
         Queries database and returns the trucks in the database within radius distance
         of position specified by lon(gitude) and lat(itude). Optionally filters results
         by the trucks with names and/or menu items that contains the specified strings
+
+    get_food_trucks_and_distances_within_radius(lat, lon, radius, name, item, limit, after, fuzzy)
+        Returns the trucks within radius distance of a position and their distance,
+        optionally paginated by a (distance, uuid) keyset
+
+    radius_query_plan(lat, lon, radius, name, item, fuzzy)
+        Returns the plan chosen for a radius query combined with name and/or menu
+        item filters, if the query planner is used
+
+    query_within_radius(lat, lon, radius, name, item, after, driver, fuzzy)
+        Returns a query for the trucks within radius distance of a position and their
+        distance, sorted by distance
+
+    get_indexed_food_trucks_within_radius(spatial_index, lat, lon, radius, name, item, limit, after, fuzzy)
+        Returns the same result as get_food_trucks_and_distances_within_radius using an
+        in-memory spatial index to find the trucks within radius distance
+
+    get_item_counts_within_radius(lat, lon, radius, name, item, fuzzy)
+        Returns the number of trucks serving every menu item among the trucks within
+        radius distance of a position
+
+    get_food_trucks_within_box(min_lat, min_lon, max_lat, max_lon, name, item)
+        Returns the trucks inside a latitude/longitude box, optionally filtered by
+        name and/or menu items
+
+    get_food_trucks_within_radius_batch(origins)
+        Returns the trucks within radius distance of each of several positions,
+        evaluated in a single pass over the trucks near any of the positions
+
+    get_food_trucks_along_route(route, width, name, item)
+        Returns the trucks within width distance of a route, sorted by position along
+        the route, optionally filtered by name and/or menu items
+
+    get_collection_metadata()
+        Returns the number of trucks, the bounds of their coordinates and the largest
+        truck id from a single aggregate query
+
+    matching_uuids(name, item, fuzzy)
+        Returns the ids of the trucks with names and/or menu items that contain
+        the specified strings
+
+    get_nearest_food_trucks(lat, lon, k, max_dist, name, item, fuzzy)
+        Returns the k trucks nearest to a position and their distance, optionally
+        filtered by name and/or menu items
     """
 
     __tablename__ = 'sf_food_trucks'
@@ -52,6 +166,11 @@ class FoodTruck(db.Model):
     days_hours = db.Column(db.String())
     food_items = db.Column(db.String())
     user_id = db.Column(db.Integer, db.ForeignKey(User.id), nullable=True, default=None)
+    geohash = db.Column(db.String(GEOHASH_PRECISION), index=True)
+    unit_x = db.Column(db.Float())
+    unit_y = db.Column(db.Float())
+    unit_z = db.Column(db.Float())
+    items = db.relationship(MenuItem, secondary=food_truck_items, lazy='select')
 
 
     def __init__(self, name, longitude, latitude, days_hours, food_items, user_id):
@@ -67,6 +186,30 @@ class FoodTruck(db.Model):
         return '<name {}>'.format(self.name)
 
 
+    @validates('latitude', 'longitude')
+    def update_spatial_columns(self, key, value):
+        """
+        Recomputes the geohash and the unit vector of the instance whenever its latitude
+        or longitude is set, so that every insert and update persists values matching
+        the coordinates.
+
+        Parameters:
+            key (str): name of the coordinate attribute being set
+            value (float): new value of the coordinate
+
+        Returns:
+            float: the value to set
+        """
+        lat = value if key == 'latitude' else self.latitude
+        lon = value if key == 'longitude' else self.longitude
+        if lat is None or lon is None:
+            self.geohash = self.unit_x = self.unit_y = self.unit_z = None
+        else:
+            self.geohash = encode(lat, lon)
+            self.unit_x, self.unit_y, self.unit_z = unit_vector(lat, lon)
+        return value
+
+
     def serialize(self):
         """
         Returns a dictionary representation of a class instance
@@ -121,7 +264,214 @@ class FoodTruck(db.Model):
 
 
     @classmethod
-    def get_food_trucks_within_radius(cls, lat, lon, radius, name=None, item=None):
+    def dot_product(cls, lat, lon):
+        """
+        Class method that returns a SQL expression for the dot product of the stored unit
+        vector of an element in the FoodTruck model and the unit vector of the location
+        specified by lat(itude) and lon(gitude), i.e. the cosine of the angle between them.
+        Unlike great_circle_distance, it only uses three multiplications per element.
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+
+        Returns:
+            object: SQLAlchemy numeric expression
+        """
+        x, y, z = unit_vector(lat, lon)
+        return cls.unit_x * x + cls.unit_y * y + cls.unit_z * z
+
+
+    @classmethod
+    def contains_name(cls, name, uuid=None, column=None, fuzzy=False):
+        """
+        Class method that returns a SQL expression selecting the elements in the FoodTruck
+        model with names that contain a substring, ignoring case. On PostgreSQL the
+        condition is answered by the trigram index of the name column. With the in-memory
+        names index enabled, for backends without trigram indexes, the matching trucks
+        are looked up in the index and selected by id instead.
+
+        Parameters:
+            name (str): substring that name must contain
+            uuid (object): uuid column to select by, e.g. of a subquery (optional)
+            column (object): name column to match, e.g. of a subquery (optional)
+            fuzzy (bool): also select names with words within a few typos of name
+
+        Returns:
+            object: SQLAlchemy boolean expression
+        """
+        uuid = cls.uuid if uuid is None else uuid
+        column = cls.name if column is None else column
+
+        # add the trucks with similar names from the in-memory typo-tolerant index
+        if fuzzy:
+            similar = cls.similar_uuids('name', name)
+            return db.or_(cls.contains_name(name, uuid, column), _in_ids(uuid, similar))
+
+        names_index = current_app.extensions.get('names_index')
+        if names_index is not None and current_app.config['NAME_INDEX_ENABLED']:
+            uuids = names_index.search(name)
+            if uuids is not None:
+                return _in_ids(uuid, uuids)
+        return column.ilike('%{}%'.format(name))
+
+
+    @classmethod
+    def contains_item(cls, item, uuid=None, food_items=None, fuzzy=False):
+        """
+        Class method that returns a SQL expression selecting the elements in the FoodTruck
+        model with menu items that contain a substring, ignoring case. With the in-memory
+        items index enabled, the matching trucks are looked up in the index and selected
+        by id, since a pattern with a leading wildcard cannot use a database index.
+        Otherwise the substring is searched in the table of distinct menu items, and the
+        trucks serving the matching items are selected by an indexed join.
+
+        Parameters:
+            item (str): substring that food_items must contain
+            uuid (object): uuid column to select by, e.g. of a subquery (optional)
+            food_items (object): food_items column to match, e.g. of a subquery (optional)
+            fuzzy (bool): also select menu items with words within a few typos of item
+
+        Returns:
+            object: SQLAlchemy boolean expression
+        """
+        uuid = cls.uuid if uuid is None else uuid
+        food_items = cls.food_items if food_items is None else food_items
+
+        # add the trucks with similar menu items from the in-memory typo-tolerant index
+        if fuzzy:
+            similar = cls.similar_uuids('food_items', item)
+            return db.or_(cls.contains_item(item, uuid, food_items), _in_ids(uuid, similar))
+
+        items_index = current_app.extensions.get('items_index')
+        if items_index is not None and current_app.config['ITEM_INDEX_ENABLED']:
+            uuids = items_index.search(item)
+            if uuids is not None:
+                return _in_ids(uuid, uuids)
+
+        # search the distinct menu items and join the trucks serving them, unless the
+        # substring may span several menu items
+        if within_menu_item(item):
+            return uuid.in_(MenuItem.truck_ids_containing(item))
+        return food_items.ilike('%{}%'.format(item))
+
+
+    @classmethod
+    def similar_uuids(cls, field, needle):
+        """
+        Class method that returns the trucks with a name or menu items that have a word
+        within a few typos of every word of a needle, from the in-memory typo-tolerant
+        index, and the total number of typos
+
+        Parameters:
+            field (str): searched field, 'name' or 'food_items'
+            needle (str): searched words
+
+        Returns:
+            dict: total number of typos of every matching truck id
+        """
+        return current_app.extensions['fuzzy_index'].search(field, needle)
+
+
+    @classmethod
+    def get_food_trucks_by_similarity(cls, name=None, item=None):
+        """
+        Class method that returns the trucks in the database with names and/or menu
+        items that contain the specified strings or have words within a few typos of
+        their words, ranked by similarity. Trucks containing a string are ranked before
+        the trucks with typos, which are ranked by the total number of typos.
+
+        Parameters:
+            name (str): searched name
+            item (str): searched menu items
+
+        Returns:
+            list: list of FoodTruck objects
+        """
+        food_trucks = cls.query
+        typos = []
+        if name:
+            food_trucks = food_trucks.filter(cls.contains_name(name, fuzzy=True))
+            typos.append((name.lower(), 'name', cls.similar_uuids('name', name)))
+        if item:
+            food_trucks = food_trucks.filter(cls.contains_item(item, fuzzy=True))
+            typos.append((item.lower(), 'food_items', cls.similar_uuids('food_items', item)))
+
+        def rank(truck):
+            # trucks containing the string have no typos
+            return (sum(0 if needle in (getattr(truck, field) or '').lower() else similar.get(truck.uuid, 0)
+                        for needle, field, similar in typos), truck.uuid)
+
+        return sorted(food_trucks.all(), key=rank)
+
+
+    @classmethod
+    def within_geohash_ranges(cls, ranges):
+        """
+        Class method that returns a SQL expression selecting the elements in the FoodTruck
+        model with a geohash inside any of the specified ranges, which can be answered by
+        range scans on the geohash index
+
+        Parameters:
+            ranges (list): (first, last) geohash tuples of inclusive ranges
+
+        Returns:
+            object: SQLAlchemy boolean expression
+        """
+        return db.or_(*[cls.geohash.between(first, last) for first, last in ranges])
+
+
+    @classmethod
+    def within_box(cls, min_lat, min_lon, max_lat, max_lon):
+        """
+        Class method that returns a SQL expression selecting the elements in the FoodTruck
+        model inside a latitude/longitude box. The box is covered by a small set of geohash
+        ranges, which are answered by range scans on the geohash index, and the exact
+        boundaries are then checked on the coordinate columns. If min_lon is greater than
+        max_lon, the box is assumed to cross the antimeridian.
+
+        Parameters:
+            min_lat (float): southern boundary in decimal format
+            min_lon (float): western boundary in decimal format
+            max_lat (float): northern boundary in decimal format
+            max_lon (float): eastern boundary in decimal format
+
+        Returns:
+            object: SQLAlchemy boolean expression
+        """
+        in_geohash_ranges = cls.within_geohash_ranges(geohash_ranges(min_lat, min_lon, max_lat, max_lon))
+        in_lat_range = cls.latitude.between(min_lat, max_lat)
+        if min_lon <= max_lon:
+            return db.and_(in_geohash_ranges, in_lat_range, cls.longitude.between(min_lon, max_lon))
+        return db.and_(in_geohash_ranges, in_lat_range, db.or_(cls.longitude >= min_lon, cls.longitude <= max_lon))
+
+
+    @classmethod
+    def within_search_circle(cls, lat, lon, radius):
+        """
+        Class method that returns a SQL expression preselecting the elements in the FoodTruck
+        model that may be within a distance of radius from the position specified by
+        lat(itude) and lon(gitude): the elements inside the bounding box of the search
+        circle, which can be answered by the latitude and longitude indexes, whose
+        precomputed unit vectors are also inside the search circle. The exact distance
+        still has to be checked with great_circle_distance.
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            radius (float): search radius in meters
+
+        Returns:
+            object: SQLAlchemy boolean expression
+        """
+        # filter the search circle by the dot product of the precomputed unit vectors,
+        # so that the haversine formula is only evaluated for the elements inside it
+        return db.and_(cls.within_box(*bounding_box(lat, lon, radius)),
+                       cls.dot_product(lat, lon) >= min_dot_product(radius))
+
+
+    @classmethod
+    def get_food_trucks_within_radius(cls, lat, lon, radius, name=None, item=None, fuzzy=False):
         """
         Class method that queries the database and returns the trucks in the 
         database within a distance of radius from the position specified by 
@@ -133,33 +483,548 @@ class FoodTruck(db.Model):
             radius (int): search radius in meters
             name (str): substring that names must contain
             item (str): substring that food_items must contain
+            fuzzy (bool): also match names and menu items within a few typos of name and item
 
         Returns:
             list: list of FoodTruck objects
         """
+        food_trucks = cls.get_food_trucks_and_distances_within_radius(lat, lon, radius, name, item, fuzzy=fuzzy)
+        return [truck for truck, __ in food_trucks]
+
+
+    @classmethod
+    def get_food_trucks_and_distances_within_radius(cls, lat, lon, radius, name=None, item=None,
+                                                     limit=None, after=None, fuzzy=False):
+        """
+        Class method that returns the trucks in the database within a distance of radius
+        from the position specified by lon(gitude) and lat(itude), and their distance to
+        the position, sorted by (distance, uuid).
+
+        Results can be paginated by keyset: the limit parameter restricts the number of
+        returned trucks, and the after parameter skips every truck sorted before or at the
+        (distance, uuid) key of the last truck of the previous page. Every page is then
+        found directly from the key, without rescanning the previous pages.
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            radius (int): search radius in meters
+            name (str): substring that names must contain
+            item (str): substring that food_items must contain
+            limit (int): maximum number of trucks to return (optional)
+            after (tuple): (distance, uuid) key to return trucks after (optional)
+            fuzzy (bool): also match names and menu items within a few typos of name and item
+
+        Returns:
+            list: list of (FoodTruck, distance) tuples
+        """
         # ensure correct data types
         lat = float(lat)
         lon = float(lon)
         radius = float(radius)
 
-        # subquery great-circle distance between coordinate and elements in database
+        # answer from the in-memory spatial index if it is enabled
+        spatial_index = current_app.extensions.get('spatial_index')
+        if spatial_index is not None and current_app.config['SPATIAL_INDEX_ENABLED']:
+            return cls.get_indexed_food_trucks_within_radius(spatial_index, lat, lon, radius, name, item,
+                                                             limit, after, fuzzy)
+
+        # pick the filter that selects the fewest candidates if the query planner is used
+        plan = cls.radius_query_plan(lat, lon, radius, name, item, fuzzy)
+        driver = plan.driver if plan else 'radius'
+
+        food_trucks = cls.query_within_radius(lat, lon, radius, name, item, after, driver, fuzzy)
+        if limit is not None:
+            food_trucks = food_trucks.limit(limit)
+        return food_trucks.all()
+
+
+    @classmethod
+    def radius_query_plan(cls, lat, lon, radius, name=None, item=None, fuzzy=False):
+        """
+        Class method that chooses the filter driving a radius query combined with name
+        and/or item filters, from the number of trucks in the grid cells around the
+        search circle and the token frequencies of the enabled in-memory name and item indexes.
+        Driving by a rare name or item only computes the distance for the few trucks
+        matching it. The query planner is only used by database queries when it is
+        enabled, and if an exact name or item filter is specified.
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            radius (float): search radius in meters
+            name (str): substring that names must contain
+            item (str): substring that food_items must contain
+            fuzzy (bool): whether names and menu items within a few typos also match
+
+        Returns:
+            QueryPlan: chosen plan, or None if the query planner is not used
+        """
+        if not (name or item) or fuzzy or not current_app.config['QUERY_PLANNER_ENABLED']:
+            return None
+        if current_app.config['SPATIAL_INDEX_ENABLED']:
+            return None
+
+        # estimate the number of trucks selected by every filter. Filters without an
+        # enabled in-memory index are assumed to select every truck, so that they are
+        # priced as a substring pattern matched against every truck.
+        spatial_index = current_app.extensions['spatial_index']
+        total = spatial_index.count()
+        rows = {'radius': spatial_index.count_box(*bounding_box(float(lat), float(lon), float(radius)))}
+        indexed = {}
+        if name:
+            enabled = current_app.config['NAME_INDEX_ENABLED']
+            rows['name'] = current_app.extensions['names_index'].estimate(name) if enabled else total
+            indexed['name'] = (db.engine.dialect.name == 'postgresql' or
+                               enabled and not any(c in name for c in LIKE_WILDCARDS))
+        if item:
+            enabled = current_app.config['ITEM_INDEX_ENABLED']
+            rows['item'] = current_app.extensions['items_index'].estimate(item) if enabled else total
+            indexed['item'] = enabled and not any(c in item for c in LIKE_WILDCARDS)
+
+        plan = plan_radius_query(total, rows, indexed)
+        current_app.logger.debug('radius query plan: %s', plan)
+        return plan
+
+
+    @classmethod
+    def query_within_radius(cls, lat, lon, radius, name=None, item=None, after=None, driver='radius',
+                            fuzzy=False):
+        """
+        Class method that builds a query for the trucks in the database within a
+        distance of radius from the position specified by lon(gitude) and lat(itude),
+        and their distance to the position. The distance is computed for the trucks
+        selected by the driving filter: the trucks near the position by default, or
+        the trucks matching the name or item filter.
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            radius (float): search radius in meters
+            name (str): substring that names must contain
+            item (str): substring that food_items must contain
+            after (tuple): (distance, uuid) key to return trucks after (optional)
+            driver (str): filter selecting the trucks to compute the distance for, one
+                of 'radius', 'name' or 'item'
+            fuzzy (bool): also match names and menu items within a few typos of name and item
+
+        Returns:
+            object: SQLAlchemy query of (FoodTruck, distance) tuples sorted by distance
+        """
+        if driver == 'name':
+            candidates = [cls.contains_name(name, fuzzy=fuzzy)]
+        elif driver == 'item':
+            candidates = [cls.contains_item(item, fuzzy=fuzzy)]
+        else:
+            candidates = [cls.within_search_circle(lat, lon, radius)]
+
+        # subquery great-circle distance between coordinate and candidate elements
         stmt = db.session.query(cls,
                                 cls.great_circle_distance(lat, lon)
-                                .label('dist')).subquery()
+                                .label('dist')).filter(*candidates).subquery()
         food_truck_alias = aliased(cls, stmt)
 
         # filter by search radius
-        food_trucks = db.session.query(food_truck_alias).filter(stmt.c.dist <= radius)
+        food_trucks = db.session.query(food_truck_alias, stmt.c.dist).filter(stmt.c.dist <= radius)
 
         # filter by name if specified
-        if name:
-            food_trucks = food_trucks.filter(stmt.c.name.ilike('%{}%'.format(name)))
+        if name and driver != 'name':
+            food_trucks = food_trucks.filter(cls.contains_name(name, stmt.c.uuid, stmt.c.name, fuzzy))
         
         # filter by item if specified
-        if item:
-            food_trucks = food_trucks.filter(stmt.c.food_items.ilike('%{}%'.format(item)))
+        if item and driver != 'item':
+            food_trucks = food_trucks.filter(cls.contains_item(item, stmt.c.uuid, stmt.c.food_items, fuzzy))
+
+        # skip trucks up to and including the keyset if specified
+        if after:
+            dist, uuid = after
+            food_trucks = food_trucks.filter(db.or_(stmt.c.dist > dist,
+                                                    db.and_(stmt.c.dist == dist, stmt.c.uuid > uuid)))
         
         # sort by distance ascending
-        food_trucks = food_trucks.order_by(stmt.c.dist)
+        return food_trucks.order_by(stmt.c.dist, stmt.c.uuid)
+
+
+    @classmethod
+    def get_indexed_food_trucks_within_radius(cls, spatial_index, lat, lon, radius, name=None, item=None,
+                                              limit=None, after=None, fuzzy=False):
+        """
+        Class method that returns the same result as get_food_trucks_and_distances_within_radius,
+        but finds the trucks within radius distance using an in-memory spatial index,
+        so that the great-circle distance is only computed for nearby trucks. Only the
+        trucks found by the index are queried from the database. If limit is specified,
+        the index is searched in order of ascending distance, and the search stops once
+        the page is complete, so the exact distance is only computed for the trucks up
+        to the end of the page.
+
+        Parameters:
+            spatial_index (SpatialIndex): spatial index of the FoodTruck coordinates
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            radius (float): search radius in meters
+            name (str): substring that names must contain
+            item (str): substring that food_items must contain
+            limit (int): maximum number of trucks to return (optional)
+            after (tuple): (distance, uuid) key to return trucks after (optional)
+            fuzzy (bool): also match names and menu items within a few typos of name and item
+
+        Returns:
+            list: list of (FoodTruck, distance) tuples
+        """
+        if after:
+            after = (float(after[0]), int(after[1]))
+
+        # search the page in order of ascending distance if limited
+        if limit is not None:
+            accept = cls.matching_uuids(name, item, fuzzy) if name or item else None
+            matches = spatial_index.nearest(lat, lon, limit, radius, accept, after or None)
+        else:
+            # find trucks within radius and their distances using the index
+            matches = spatial_index.query_radius(lat, lon, radius)
+
+            # skip trucks up to and including the keyset if specified
+            if after:
+                matches = matches[bisect.bisect_right(matches, after):]
+
+            # filter by name and item if specified
+            if matches and (name or item):
+                matching = db.session.query(cls.uuid).filter(cls.uuid.in_([uuid for __, uuid in matches]))
+                if name:
+                    matching = matching.filter(cls.contains_name(name, fuzzy=fuzzy))
+                if item:
+                    matching = matching.filter(cls.contains_item(item, fuzzy=fuzzy))
+                matching = set(uuid for uuid, in matching)
+                matches = [match for match in matches if match[1] in matching]
+
+        if not matches:
+            return []
+
+        # query the trucks found by the index and sort by distance ascending
+        distances = dict((uuid, dist) for dist, uuid in matches)
+        food_trucks = cls.query.filter(cls.uuid.in_(list(distances))).all()
+        return sorted(((truck, distances[truck.uuid]) for truck in food_trucks),
+                      key=lambda e: (e[1], e[0].uuid))
+
+
+    @classmethod
+    def get_item_counts_within_radius(cls, lat, lon, radius, name=None, item=None, fuzzy=False):
+        """
+        Class method that returns the number of trucks serving every menu item among the
+        trucks within a distance of radius from the position specified by lon(gitude)
+        and lat(itude), optionally filtered by names and/or menu items. Only the ids of
+        the matching trucks are selected, and the menu items are counted from the
+        normalized menu items of the trucks, so no truck is loaded.
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            radius (int): search radius in meters
+            name (str): substring that names must contain
+            item (str): substring that food_items must contain
+            fuzzy (bool): also match names and menu items within a few typos of name and item
+
+        Returns:
+            list: list of (menu item, count) tuples sorted by descending count
+        """
+        # ensure correct data types
+        lat = float(lat)
+        lon = float(lon)
+        radius = float(radius)
+
+        # find the trucks within radius using the in-memory spatial index if it is enabled
+        spatial_index = current_app.extensions.get('spatial_index')
+        if spatial_index is not None and current_app.config['SPATIAL_INDEX_ENABLED']:
+            truck_ids = [uuid for __, uuid in spatial_index.query_radius(lat, lon, radius)]
+            if truck_ids and (name or item):
+                matching = db.session.query(cls.uuid).filter(cls.uuid.in_(truck_ids))
+                if name:
+                    matching = matching.filter(cls.contains_name(name, fuzzy=fuzzy))
+                if item:
+                    matching = matching.filter(cls.contains_item(item, fuzzy=fuzzy))
+                truck_ids = [uuid for uuid, in matching]
+            if not truck_ids:
+                return []
+        else:
+            # select the ids of the trucks within radius in a subquery
+            plan = cls.radius_query_plan(lat, lon, radius, name, item, fuzzy)
+            driver = plan.driver if plan else 'radius'
+            stmt = cls.query_within_radius(lat, lon, radius, name, item, driver=driver,
+                                           fuzzy=fuzzy).order_by(None).subquery()
+            truck_ids = db.select([stmt.c.uuid])
+
+        return MenuItem.count_trucks(truck_ids)
+
+
+    @classmethod
+    def get_food_trucks_within_box(cls, min_lat, min_lon, max_lat, max_lon, name=None, item=None):
+        """
+        Class method that returns the trucks in the database inside a latitude/longitude
+        box, such as the viewport of a map. The box is answered by range lookups, either
+        on the latitude and longitude indexes or on the in-memory spatial index if it is
+        enabled, so no distances are computed. If min_lon is greater than max_lon, the
+        box is assumed to cross the antimeridian.
+
+        Parameters:
+            min_lat (float): southern boundary in decimal format
+            min_lon (float): western boundary in decimal format
+            max_lat (float): northern boundary in decimal format
+            max_lon (float): eastern boundary in decimal format
+            name (str): substring that names must contain
+            item (str): substring that food_items must contain
+
+        Returns:
+            list: list of FoodTruck objects sorted by uuid
+        """
+        # ensure correct data types
+        min_lat, min_lon, max_lat, max_lon = map(float, (min_lat, min_lon, max_lat, max_lon))
+
+        # find the trucks in the box using the in-memory spatial index if it is enabled
+        spatial_index = current_app.extensions.get('spatial_index')
+        if spatial_index is not None and current_app.config['SPATIAL_INDEX_ENABLED']:
+            uuids = spatial_index.query_box(min_lat, min_lon, max_lat, max_lon)
+            if not uuids:
+                return []
+            food_trucks = cls.query.filter(cls.uuid.in_(uuids))
+        else:
+            food_trucks = cls.query.filter(cls.within_box(min_lat, min_lon, max_lat, max_lon))
+
+        # filter by name if specified
+        if name:
+            food_trucks = food_trucks.filter(cls.contains_name(name))
+
+        # filter by item if specified
+        if item:
+            food_trucks = food_trucks.filter(cls.contains_item(item))
+
+        return food_trucks.order_by(cls.uuid).all()
+
+
+    @classmethod
+    def get_food_trucks_within_radius_batch(cls, origins):
+        """
+        Class method that returns the result of get_food_trucks_within_radius for each
+        of several origins. If the in-memory spatial index is enabled, it finds the trucks
+        within each search circle. Otherwise the trucks within every search circle and
+        their distances are queried in a few queries of BATCH_DISTANCE_SIZE search circles,
+        so that the boundary of each circle and the distances are the same as those of
+        get_food_trucks_within_radius. Every distinct name and item filter is evaluated
+        once for all origins.
+
+        Parameters:
+            origins (list): list of dicts with the keys lat(itude), lon(gitude) and radius,
+                and optionally name, item and fuzzy
+
+        Returns:
+            list: list of FoodTruck object lists, in the order of origins
+        """
+        if not origins:
+            return []
+
+        # ensure correct data types
+        lats = [float(origin['lat']) for origin in origins]
+        lons = [float(origin['lon']) for origin in origins]
+        radii = [float(origin['radius']) for origin in origins]
+
+        # find the (distance, uuid) of the trucks within each search circle
+        spatial_index = current_app.extensions.get('spatial_index')
+        if spatial_index is not None and current_app.config['SPATIAL_INDEX_ENABLED']:
+            matches = [spatial_index.query_radius(lat, lon, radius) for lat, lon, radius in zip(lats, lons, radii)]
+            uuids = list(set(uuid for within in matches for __, uuid in within))
+            food_trucks = {}
+            for i in range(0, len(uuids), BATCH_QUERY_SIZE):
+                for truck in cls.query.filter(cls.uuid.in_(uuids[i:i + BATCH_QUERY_SIZE])):
+                    food_trucks[truck.uuid] = truck
+        else:
+            # query the trucks within each search circle and their distance to its origin,
+            # with the same predicate and distance expression as get_food_trucks_within_radius,
+            # in a few queries of BATCH_DISTANCE_SIZE search circles
+            matches = [[] for __ in origins]
+            food_trucks = {}
+            for i in range(0, len(origins), BATCH_DISTANCE_SIZE):
+                queries = []
+                for j in range(i, min(i + BATCH_DISTANCE_SIZE, len(origins))):
+                    dist = cls.great_circle_distance(lats[j], lons[j])
+                    queries.append(db.session.query(cls, db.literal(j), dist)
+                                   .filter(cls.within_search_circle(lats[j], lons[j], radii[j]), dist <= radii[j]))
+                for truck, j, dist in queries[0].union_all(*queries[1:]):
+                    matches[j].append((dist, truck.uuid))
+                    food_trucks[truck.uuid] = truck
+
+        # ids of the trucks matching each distinct name and item filter
+        uuids = list(food_trucks)
+        matching = {}
+        contains = {'name': cls.contains_name, 'item': cls.contains_item}
+        for key in ('name', 'item'):
+            for needle, fuzzy in set((origin.get(key), bool(origin.get('fuzzy'))) for origin in origins if origin.get(key)):
+                matching[key, needle, fuzzy] = set()
+                for i in range(0, len(uuids), BATCH_QUERY_SIZE):
+                    rows = db.session.query(cls.uuid).filter(cls.uuid.in_(uuids[i:i + BATCH_QUERY_SIZE]),
+                                                             contains[key](needle, fuzzy=fuzzy))
+                    matching[key, needle, fuzzy].update(uuid for uuid, in rows)
+
+        results = []
+        for origin, within in zip(origins, matches):
+            for key in ('name', 'item'):
+                if origin.get(key):
+                    within = [e for e in within if e[1] in matching[key, origin[key], bool(origin.get('fuzzy'))]]
+
+            # sort by distance ascending
+            within = sorted(within)
+            results.append([food_trucks[uuid] for __, uuid in within])
+        return results
+
+
+    @classmethod
+    def get_food_trucks_along_route(cls, route, width, name=None, item=None):
+        """
+        Class method that returns the trucks in the database within width distance of
+        any segment of a route, such as the route of a courier, sorted by their position
+        along the route. Only the trucks inside the corridor boxes of the route segments
+        are considered, either using the in-memory spatial index if it is enabled, or the
+        geohash index otherwise, so the cost depends on the area of the corridor.
+
+        Parameters:
+            route (list): (lat, lon) tuples of the route vertices in decimal format
+            width (float): corridor width in meters on each side of the route
+            name (str): substring that names must contain
+            item (str): substring that food_items must contain
+
+        Returns:
+            list: list of (FoodTruck, position, distance) tuples, where position is the
+                distance along the route to the first point near the truck, and distance
+                is the distance from the truck to the route
+        """
+        # ensure correct data types
+        route = [(float(lat), float(lon)) for lat, lon in route]
+        width = float(width)
+        if not route:
+            return []
+
+        # find trucks near the route using the in-memory spatial index if it is enabled
+        spatial_index = current_app.extensions.get('spatial_index')
+        if spatial_index is not None and current_app.config['SPATIAL_INDEX_ENABLED']:
+            matches = spatial_index.query_route(route, width)
+            if not matches:
+                return []
+            uuids = list(set(uuid for __, __, uuid in matches))
+            candidates = [cls.uuid.in_(uuids[i:i + BATCH_QUERY_SIZE]) for i in range(0, len(uuids), BATCH_QUERY_SIZE)]
+        else:
+            # query the trucks inside the corridor boxes by their geohash ranges, in chunks
+            # of BATCH_QUERY_SIZE ranges, since long routes are covered by many ranges
+            ranges = merge_ranges(r for (lat1, lon1), (lat2, lon2) in route_segments(route)
+                                  for box in corridor_boxes(lat1, lon1, lat2, lon2, width)
+                                  for r in geohash_ranges(*box, max_cells=4))
+            candidates = [cls.within_geohash_ranges(ranges[i:i + BATCH_QUERY_SIZE])
+                          for i in range(0, len(ranges), BATCH_QUERY_SIZE)]
+
+        food_trucks = {}
+        for candidate in candidates:
+            query = cls.query.filter(candidate)
+
+            # filter by name if specified
+            if name:
+                query = query.filter(cls.contains_name(name))
+
+            # filter by item if specified
+            if item:
+                query = query.filter(cls.contains_item(item))
+            food_trucks.update((truck.uuid, truck) for truck in query)
+
+        # without the spatial index, compute the distances to the route with a grid of the queried trucks
+        if spatial_index is None or not current_app.config['SPATIAL_INDEX_ENABLED']:
+            grid = SpatialGrid(current_app.config['SPATIAL_INDEX_CELL_SIZE'])
+            for truck in food_trucks.values():
+                grid.insert(truck.uuid, truck.latitude, truck.longitude)
+            matches = grid.query_route(route, width)
+
+        return [(food_trucks[uuid], position, dist) for position, dist, uuid in matches if uuid in food_trucks]
+
+
+    @classmethod
+    def get_collection_metadata(cls):
+        """
+        Class method that returns the number of trucks in the database, the bounds of
+        their coordinates and the largest truck id, computed by a single aggregate query
+
+        Returns:
+            tuple: (count, min_lat, min_lon, max_lat, max_lon, max_uuid)
+        """
+        return db.session.query(func.count(cls.uuid), func.min(cls.latitude), func.min(cls.longitude),
+                                func.max(cls.latitude), func.max(cls.longitude), func.max(cls.uuid)).one()
+
+
+    @classmethod
+    def matching_uuids(cls, name=None, item=None, fuzzy=False):
+        """
+        Class method that returns the ids of the trucks in the database with names and/or
+        menu items that contain the specified strings
+
+        Parameters:
+            name (str): substring that names must contain
+            item (str): substring that food_items must contain
+            fuzzy (bool): also match names and menu items within a few typos of name and item
+
+        Returns:
+            set: ids of the matching trucks
+        """
+        matching = db.session.query(cls.uuid)
+        if name:
+            matching = matching.filter(cls.contains_name(name, fuzzy=fuzzy))
+        if item:
+            matching = matching.filter(cls.contains_item(item, fuzzy=fuzzy))
+        return set(uuid for uuid, in matching)
+
+
+    @classmethod
+    def get_nearest_food_trucks(cls, lat, lon, k, max_dist=None, name=None, item=None, fuzzy=False):
+        """
+        Class method that returns the k trucks in the database nearest to the position
+        specified by lon(gitude) and lat(itude), optionally filtered by the trucks with
+        names and/or menu items that contains the specified strings.
+
+        The search stops as soon as the k-th nearest truck is known. With the in-memory
+        spatial index enabled, the index is searched in expanding rings of grid cells.
+        Otherwise the database is queried for the k nearest trucks within an expanding
+        search radius, until k trucks are found within the radius.
+        
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            k (int): number of trucks to return
+            max_dist (float): maximum distance in meters of returned trucks (optional)
+            name (str): substring that names must contain
+            item (str): substring that food_items must contain
+            fuzzy (bool): also match names and menu items within a few typos of name and item
+
+        Returns:
+            list: list of (FoodTruck, distance) tuples sorted by distance
+        """
+        # ensure correct data types
+        lat = float(lat)
+        lon = float(lon)
+        k = int(k)
+        if max_dist is not None:
+            max_dist = float(max_dist)
+
+        # search the in-memory spatial index if it is enabled
+        spatial_index = current_app.extensions.get('spatial_index')
+        if spatial_index is not None and current_app.config['SPATIAL_INDEX_ENABLED']:
+            # ids of the trucks matching the name and item filters
+            accept = cls.matching_uuids(name, item, fuzzy) if name or item else None
+
+            distances = dict((uuid, dist) for dist, uuid in spatial_index.nearest(lat, lon, k, max_dist, accept))
+            if not distances:
+                return []
+            food_trucks = cls.query.filter(cls.uuid.in_(list(distances))).all()
+            return sorted(((truck, distances[truck.uuid]) for truck in food_trucks), 
+                            key=lambda e: (e[1], e[0].uuid))
 
-        return food_trucks.all()
\ No newline at end of file
+        # expand the search radius until it contains k trucks or covers the globe
+        radius = float(current_app.config['DEFAULT_SEARCH_RADIUS'])
+        max_radius = math.pi * EARTH_RADIUS if max_dist is None else max_dist
+        while True:
+            radius = min(radius, max_radius)
+            food_trucks = cls.query_within_radius(lat, lon, radius, name, item, fuzzy=fuzzy).limit(k).all()
+            if len(food_trucks) == k or radius >= max_radius:
+                return food_trucks
+            radius *= 4
\ No newline at end of file
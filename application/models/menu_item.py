@@ -0,0 +1,115 @@
+from application.utils.menu import parse_menu_items, prefix_upper_bound
+from . import db
+
+
+# association table between the FoodTruck and MenuItem models
+food_truck_items = db.Table('food_truck_items',
+    db.Column('truck_id', db.Integer, db.ForeignKey('sf_food_trucks.uuid', ondelete='CASCADE'), primary_key=True),
+    db.Column('item_id', db.Integer, db.ForeignKey('items.id', ondelete='CASCADE'), primary_key=True, index=True))
+
+# every suffix of every menu item, so that the menu items containing a substring are
+# found by a range lookup of the suffixes starting with it. Suffixes are compared
+# bytewise, also on PostgreSQL, so that the range contains exactly these suffixes.
+item_suffixes = db.Table('item_suffixes',
+    db.Column('suffix', db.String().with_variant(db.String(collation='C'), 'postgresql'), primary_key=True),
+    db.Column('item_id', db.Integer, db.ForeignKey('items.id', ondelete='CASCADE'), primary_key=True))
+
+
+class MenuItem(db.Model):
+    """
+    A class used to encapsulate the menu item database model. Every distinct menu item of
+    the food_items field of the FoodTruck model is stored once, and is associated with
+    the trucks serving it through the food_truck_items table.
+
+    Attributes
+    ----------
+    id (int)
+        Unique identifer for menu item (primary key for DB)
+
+    name (string)
+        Unique normalized name of the menu item
+
+    Methods
+    -------
+    parse(food_items)
+        Returns the normalized menu items of a food_items field
+
+    truck_ids_containing(needle)
+        Returns a SQL select of the ids of the trucks serving a menu item that contains
+        a substring
+
+    count_trucks(truck_ids)
+        Returns the number of trucks serving every menu item among a set of trucks
+    """
+    __tablename__ = 'items'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    name = db.Column(db.String(), unique=True, nullable=False)
+
+
+    def __init__(self, name):
+        self.name = name
+
+
+    def __repr__(self):
+        return '<item {}>'.format(self.name)
+
+
+    @staticmethod
+    def parse(food_items):
+        """
+        Returns the distinct normalized menu items of a colon-separated food_items field
+
+        Parameters:
+            food_items (str): colon-separated menu items
+
+        Returns:
+            list: menu item names in order of appearance
+        """
+        return parse_menu_items(food_items)
+
+
+    @classmethod
+    def truck_ids_containing(cls, needle):
+        """
+        Class method that returns a SQL select of the ids of the trucks serving a menu
+        item that contains a substring, ignoring case. The menu items are found by an
+        indexed range lookup of their suffixes starting with the substring, which is
+        matched literally, and the trucks by an indexed join on the matching item ids.
+
+        Parameters:
+            needle (str): substring that a menu item must contain, without leading or
+                repeated whitespace
+
+        Returns:
+            object: SQLAlchemy select of truck ids
+        """
+        needle = needle.lower()
+        matching = db.select([item_suffixes.c.item_id]).where(item_suffixes.c.suffix >= needle)
+        upper_bound = prefix_upper_bound(needle)
+        if upper_bound is not None:
+            matching = matching.where(item_suffixes.c.suffix < upper_bound)
+        return db.select([food_truck_items.c.truck_id]).where(food_truck_items.c.item_id.in_(matching))
+
+
+    @classmethod
+    def count_trucks(cls, truck_ids):
+        """
+        Class method that returns the number of trucks serving every menu item among a
+        set of trucks, counted by a single aggregate over the food_truck_items table
+        instead of parsing the food_items field of every truck. Menu items are sorted by
+        descending number of trucks, then by name.
+
+        Parameters:
+            truck_ids (object): ids of the trucks to count, a list or a SQL select
+
+        Returns:
+            list: list of (name, count) tuples
+        """
+        count = db.func.count(food_truck_items.c.truck_id)
+        return (db.session.query(cls.name, count)
+                .join(food_truck_items, food_truck_items.c.item_id == cls.id)
+                .filter(food_truck_items.c.truck_id.in_(truck_ids))
+                .group_by(cls.name)
+                .order_by(count.desc(), cls.name)
+                .all())
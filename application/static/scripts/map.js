@@ -89,6 +89,97 @@ function placeNearbyTrucks(map, truckMarkers, location, radius, nameNeedle, item
     return truckMarkers;
 }
 
+/**
+ * requests the food trucks inside the visible area of the @map and places markers
+ * in the @map for every returned truck.
+ * @param  {google.maps.Map} map a Google Maps API Map object
+ * @param  {array} truckMarkers an array of markers currently placed in @map
+ * @param  {string} nameNeedle the name substring to filter results by
+ * @param  {string} itemsNeedle the items substring to filter results by
+ * @return {array} the array of newly placed markers in @map
+ */
+function placeTrucksInView(map, truckMarkers, nameNeedle, itemsNeedle) {
+    // remove current markers
+    for (var i = 0; i < truckMarkers.length; i++) {
+        truckMarkers[i].setMap(null);
+    };
+    truckMarkers = [];
+
+    // get the south-west and north-east corners of the visible area
+    var bounds = map.getBounds();
+    var sw = bounds.getSouthWest();
+    var ne = bounds.getNorthEast();
+
+    // prepare REST API request to get food trucks inside the visible area
+    var pathArray = window.location.href.split( '/' );
+    var protocol = pathArray[0];
+    var host = pathArray[2];
+    var rootUrl = protocol + '//' + host;
+    var url = `${rootUrl}/foodtrucks/viewport?sw_latitude=${sw.lat()}&sw_longitude=${sw.lng()}` +
+        `&ne_latitude=${ne.lat()}&ne_longitude=${ne.lng()}`;
+    if (nameNeedle != null) {
+        url += `&name=${nameNeedle}`;
+    }
+    if (itemsNeedle != null) {
+        url += `&item=${itemsNeedle}`;
+    }
+
+    // request food trucks and place a marker for each
+    $.getJSON(url, function(result){
+        $.each(result.foodtrucks, function(i, truck){
+            truckMarkers.push(placeFoodTruckMarker(map, truck))
+        });
+    });
+    return truckMarkers;
+}
+
+/**
+ * requests the clusters of food trucks inside the visible area of the @map for its
+ * current zoom level, and places a marker labelled with the truck count of each cluster.
+ * Clicking a cluster marker zooms in on the cluster.
+ * @param  {google.maps.Map} map a Google Maps API Map object
+ * @param  {array} truckMarkers an array of markers currently placed in @map
+ * @return {array} the array of newly placed markers in @map
+ */
+function placeClustersInView(map, truckMarkers) {
+    // remove current markers
+    for (var i = 0; i < truckMarkers.length; i++) {
+        truckMarkers[i].setMap(null);
+    };
+    truckMarkers = [];
+
+    // get the south-west and north-east corners of the visible area
+    var bounds = map.getBounds();
+    var sw = bounds.getSouthWest();
+    var ne = bounds.getNorthEast();
+
+    // prepare REST API request to get food truck clusters inside the visible area
+    var pathArray = window.location.href.split( '/' );
+    var protocol = pathArray[0];
+    var host = pathArray[2];
+    var rootUrl = protocol + '//' + host;
+    var url = `${rootUrl}/foodtrucks/clusters?sw_latitude=${sw.lat()}&sw_longitude=${sw.lng()}` +
+        `&ne_latitude=${ne.lat()}&ne_longitude=${ne.lng()}&zoom=${map.getZoom()}`;
+
+    // request clusters and place a marker for each
+    $.getJSON(url, function(result){
+        $.each(result.clusters, function(i, cluster){
+            var clusterMarker = new google.maps.Marker({
+                position: new google.maps.LatLng(cluster.latitude, cluster.longitude),
+                map: map,
+                label: String(cluster.count),
+                title: `${cluster.count} food trucks`
+            });
+            clusterMarker.addListener('click', function() {
+                map.setZoom(map.getZoom() + 2);
+                map.panTo(clusterMarker.getPosition());
+            });
+            truckMarkers.push(clusterMarker);
+        });
+    });
+    return truckMarkers;
+}
+
 /**
  * places or updates a marker for the current location in @map
  * @param  {google.maps.Map} map a Google Maps API Map object
@@ -124,6 +215,7 @@ function initMap() {
     var location = new google.maps.LatLng(37.7557, -122.4421);
     var truckMarkers = [];
     var radius = 500;
+    var clusterZoom = 16;
     var marker;
     var nameNeedle;
     var itemsNeedle;
@@ -181,4 +273,16 @@ function initMap() {
         marker = placeMarker(map, marker, location);
         truckMarkers = placeNearbyTrucks(map, truckMarkers, location, radius, nameNeedle, itemsNeedle);
     });
+
+    // until a location is clicked, show the trucks in view whenever the map is panned or zoomed,
+    // clustered by the server when the map is zoomed out
+    google.maps.event.addListener(map, 'idle', function() {
+        if (marker == null) {
+            if (map.getZoom() < clusterZoom && !nameNeedle && !itemsNeedle) {
+                truckMarkers = placeClustersInView(map, truckMarkers);
+            } else {
+                truckMarkers = placeTrucksInView(map, truckMarkers, nameNeedle, itemsNeedle);
+            }
+        }
+    });
 }
\ No newline at end of file
@@ -0,0 +1,189 @@
+import math
+import heapq
+
+
+# latitude limit of the Web Mercator projection
+MAX_MERCATOR_LATITUDE = 85.05112878
+
+
+def mercator_pixel(lat, lon, zoom):
+    """
+    Projects a coordinate to Web Mercator pixel coordinates at a zoom level, where
+    the world is 256 * 2^zoom pixels wide, as used by web map tiles.
+
+    Parameters:
+        lat (float): latitude coordinate in decimal format
+        lon (float): longitude coordinate in decimal format
+        zoom (int): zoom level
+
+    Returns:
+        tuple: (x, y) pixel coordinates, with y increasing southwards
+    """
+    size = 256 * 2 ** zoom
+    lat = max(min(lat, MAX_MERCATOR_LATITUDE), -MAX_MERCATOR_LATITUDE)
+    sin_lat = math.sin(math.radians(lat))
+    x = (lon + 180) / 360 * size
+    y = (0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * size
+    return (x, y)
+
+
+class _Cluster(object):
+    """
+    Running aggregate of the points in one cell of the cluster hierarchy
+    """
+    __slots__ = ('sum_lat', 'sum_lon', 'keys')
+
+    def __init__(self):
+        self.sum_lat = 0.0
+        self.sum_lon = 0.0
+        self.keys = set()
+
+
+class ClusterHierarchy(object):
+    """
+    A class used to encapsulate a hierarchy of point clusters for every zoom level
+    of a web map. At every zoom level, points are clustered by the square cell of
+    cell_px Web Mercator pixels containing them. Since the cell size is a power of two,
+    every cell is split into four cells at the next zoom level, so the clusters form a
+    hierarchy. Each cluster keeps running sums, so points are inserted and removed
+    incrementally at a cost proportional to the number of zoom levels.
+
+    Attributes
+    ----------
+    max_zoom (int)
+        Highest zoom level of the hierarchy
+
+    cell_px (int)
+        Width and height of a cluster cell in pixels (power of two)
+
+    Methods
+    -------
+    insert(key, lat, lon)
+        Inserts (or moves) the point identified by key
+
+    remove(key)
+        Removes the point identified by key, if it exists
+
+    query(min_lat, min_lon, max_lat, max_lon, zoom, sample_size)
+        Returns the clusters at a zoom level overlapping a latitude/longitude box
+    """
+
+    def __init__(self, max_zoom, cell_px):
+        self.max_zoom = int(max_zoom)
+        self.cell_px = int(cell_px)
+        self._levels = [{} for __ in range(self.max_zoom + 1)]
+        self._points = {}
+
+
+    def __len__(self):
+        return len(self._points)
+
+
+    def cell_of(self, lat, lon, zoom):
+        """
+        Returns the (column, row) key of the cell containing a coordinate at a zoom level
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            zoom (int): zoom level
+
+        Returns:
+            tuple: (column, row) of the cell
+        """
+        x, y = mercator_pixel(lat, lon, zoom)
+        cells = 256 * 2 ** zoom // self.cell_px
+        return (min(int(x // self.cell_px), cells - 1), min(int(y // self.cell_px), cells - 1))
+
+
+    def insert(self, key, lat, lon):
+        """
+        Inserts a point in the cluster of every zoom level. An existing point with the same
+        key is moved.
+
+        Parameters:
+            key (hashable): unique identifier of the point
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+
+        Returns:
+            -
+        """
+        self.remove(key)
+        self._points[key] = (lat, lon)
+        for zoom, level in enumerate(self._levels):
+            cluster = level.setdefault(self.cell_of(lat, lon, zoom), _Cluster())
+            cluster.sum_lat += lat
+            cluster.sum_lon += lon
+            cluster.keys.add(key)
+
+
+    def remove(self, key):
+        """
+        Removes a point from the cluster of every zoom level if it exists
+
+        Parameters:
+            key (hashable): unique identifier of the point
+
+        Returns:
+            -
+        """
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+
+        lat, lon = point
+        for zoom, level in enumerate(self._levels):
+            cell = self.cell_of(lat, lon, zoom)
+            cluster = level[cell]
+            cluster.keys.discard(key)
+            if not cluster.keys:
+                del level[cell]
+            else:
+                cluster.sum_lat -= lat
+                cluster.sum_lon -= lon
+
+
+    def query(self, min_lat, min_lon, max_lat, max_lon, zoom, sample_size):
+        """
+        Returns the clusters at a zoom level whose cells overlap a latitude/longitude box.
+        If min_lon is greater than max_lon, the box is assumed to cross the antimeridian.
+
+        Parameters:
+            min_lat (float): southern boundary in decimal format
+            min_lon (float): western boundary in decimal format
+            max_lat (float): northern boundary in decimal format
+            max_lon (float): eastern boundary in decimal format
+            zoom (int): zoom level, capped at max_zoom
+            sample_size (int): number of point keys to include for each cluster
+
+        Returns:
+            list: (centroid_lat, centroid_lon, count, sample keys) tuples
+        """
+        zoom = max(0, min(int(zoom), self.max_zoom))
+        level = self._levels[zoom]
+
+        # rows increase southwards, so the north-west corner has the smallest cell keys
+        min_col, min_row = self.cell_of(max_lat, min_lon, zoom)
+        max_col, max_row = self.cell_of(min_lat, max_lon, zoom)
+        if min_lon <= max_lon:
+            col_ranges = [(min_col, max_col)]
+        else:
+            col_ranges = [(min_col, 256 * 2 ** zoom // self.cell_px - 1), (0, max_col)]
+
+        # visit the occupied cells directly when the box covers more cells than are occupied
+        box_cells = (max_row - min_row + 1) * sum(hi - lo + 1 for lo, hi in col_ranges)
+        if box_cells > len(level):
+            cells = [cell for cell in level if min_row <= cell[1] <= max_row and
+                     any(lo <= cell[0] <= hi for lo, hi in col_ranges)]
+        else:
+            cells = [(col, row) for lo, hi in col_ranges for col in range(lo, hi + 1)
+                     for row in range(min_row, max_row + 1) if (col, row) in level]
+
+        clusters = []
+        for cell in sorted(cells):
+            cluster = level[cell]
+            count = len(cluster.keys)
+            clusters.append((cluster.sum_lat / count, cluster.sum_lon / count, count,
+                             heapq.nsmallest(sample_size, cluster.keys)))
+        return clusters
@@ -0,0 +1,39 @@
+import base64
+import json
+
+
+def encode_cursor(*key):
+    """
+    Encodes a pagination keyset as an opaque, URL-safe cursor string
+
+    Parameters:
+        key (tuple): JSON serializable values of the keyset
+
+    Returns:
+        str: cursor representing the keyset
+    """
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor, *types):
+    """
+    Decodes a cursor created by encode_cursor and converts its values to the
+    specified types
+
+    Parameters:
+        cursor (str): cursor representing a keyset
+        types (type): types of the values in the keyset
+
+    Returns:
+        tuple: values of the keyset
+
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        if not isinstance(key, list) or len(key) != len(types):
+            raise ValueError('unexpected keyset length')
+        return tuple(t(value) for t, value in zip(types, key))
+    except (TypeError, ValueError) as e:
+        raise ValueError('malformed cursor: {}'.format(e))
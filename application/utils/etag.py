@@ -0,0 +1,49 @@
+import hashlib
+
+
+# attributes of a truck included in its JSON representation
+SERIALIZED_FIELDS = ('uuid', 'name', 'longitude', 'latitude', 'days_hours', 'food_items')
+
+
+def truck_digest(truck):
+    """
+    Returns a 64 bit digest of the serialized attributes of a truck, which is the same
+    in every process for the same content
+
+    Parameters:
+        truck (object): FoodTruck instance or TruckRecord snapshot
+
+    Returns:
+        int: digest of the truck
+    """
+    content = repr(tuple(getattr(truck, field) for field in SERIALIZED_FIELDS))
+    return int(hashlib.sha1(content.encode('utf-8')).hexdigest()[:16], 16)
+
+
+def truck_etag(digest):
+    """
+    Returns the entity tag of a truck
+
+    Parameters:
+        digest (int): digest of the truck
+
+    Returns:
+        str: entity tag, without quotes
+    """
+    return '{:016x}'.format(digest)
+
+
+def collection_etag(count, digest):
+    """
+    Returns the entity tag of a collection of trucks. The digest of a collection is the
+    exclusive or of the digests of its trucks, so that it does not depend on their order
+    and can be updated for a single truck.
+
+    Parameters:
+        count (int): number of trucks in the collection
+        digest (int): exclusive or of the digests of the trucks
+
+    Returns:
+        str: entity tag, without quotes
+    """
+    return '{:x}-{:016x}'.format(count, digest)
@@ -0,0 +1,228 @@
+import unicodedata
+from itertools import combinations
+from .inverted_index import tokenize
+
+
+def fold(text):
+    """
+    Returns a text in lowercase without diacritics, so that "Señor" becomes "senor"
+
+    Parameters:
+        text (str): text to fold
+
+    Returns:
+        str: folded text
+    """
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def max_edits(word, limit):
+    """
+    Returns the number of typos tolerated in a word: none in words of up to three
+    characters, one in words of up to seven characters and two in longer words,
+    but at most limit
+
+    Parameters:
+        word (str): searched word
+        limit (int): maximum number of typos
+
+    Returns:
+        int: number of tolerated typos
+    """
+    if len(word) <= 3:
+        return 0
+    return min(limit, 1 if len(word) <= 7 else 2)
+
+
+def deletes(word, edits):
+    """
+    Returns the strings obtained by deleting up to edits characters from a word,
+    including the word itself
+
+    Parameters:
+        word (str): word to delete characters from
+        edits (int): maximum number of deleted characters
+
+    Returns:
+        set: strings obtained by the deletions
+    """
+    ret = set([word])
+    for n in range(1, min(edits, len(word)) + 1):
+        for positions in combinations(range(len(word)), n):
+            ret.add(''.join(c for i, c in enumerate(word) if i not in positions))
+    return ret
+
+
+def edit_distance(a, b, limit):
+    """
+    Calculates the optimal string alignment distance between two words, which is the
+    number of character insertions, deletions, substitutions and transpositions of
+    adjacent characters to turn one word into the other. The calculation stops as
+    soon as the distance exceeds limit.
+
+    Parameters:
+        a (str): first word
+        b (str): second word
+        limit (int): maximum distance of interest
+
+    Returns:
+        int: the distance, or limit + 1 if it exceeds limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i-1] == b[j-1] else 1
+            current[j] = min(row[j] + 1, current[j-1] + 1, row[j-1] + cost)
+            if i > 1 and j > 1 and a[i-1] == b[j-2] and a[i-2] == b[j-1]:
+                current[j] = min(current[j], previous[j-2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous, row = row, current
+    return min(row[-1], limit + 1)
+
+
+class FuzzyIndex(object):
+    """
+    A class used to encapsulate a typo-tolerant index of short texts. Every word of the
+    texts is stored in a deletion dictionary (as in SymSpell) under every string obtained
+    by deleting up to max_edits characters from it. Two words within max_edits edits
+    share such a string, so the words close to a searched word are found by looking up
+    the deletions of the searched word, and the edit distance is only computed for them.
+
+    Attributes
+    ----------
+    max_edits (int)
+        Maximum number of typos tolerated in a searched word
+
+    Methods
+    -------
+    insert(key, text)
+        Inserts (or replaces) the text identified by key
+
+    remove(key)
+        Removes the text identified by key, if it exists
+
+    lookup(word)
+        Returns the indexed words close to a word and their edit distance
+
+    search(needle)
+        Returns the keys of the texts with words close to every word of a needle
+    """
+
+    def __init__(self, max_edits=2):
+        self.max_edits = max_edits
+        self._texts = {}
+        self._postings = {}
+        self._deletes = {}
+
+
+    def __len__(self):
+        return len(self._texts)
+
+
+    def insert(self, key, text):
+        """
+        Inserts a text in the index. An existing text with the same key is replaced.
+
+        Parameters:
+            key (hashable): unique identifier of the text
+            text (str): text to index
+
+        Returns:
+            -
+        """
+        self.remove(key)
+        if text is None:
+            return
+        words = set(tokenize(fold(text)))
+        self._texts[key] = words
+        for word in words:
+            if word not in self._postings:
+                self._postings[word] = set()
+                for deletion in deletes(word, self.max_edits):
+                    self._deletes.setdefault(deletion, set()).add(word)
+            self._postings[word].add(key)
+
+
+    def remove(self, key):
+        """
+        Removes a text from the index if it exists
+
+        Parameters:
+            key (hashable): unique identifier of the text
+
+        Returns:
+            -
+        """
+        words = self._texts.pop(key, None)
+        if words is None:
+            return
+
+        # drop words that no longer occur in any text from the deletion dictionary
+        for word in words:
+            keys = self._postings[word]
+            keys.discard(key)
+            if not keys:
+                del self._postings[word]
+                for deletion in deletes(word, self.max_edits):
+                    candidates = self._deletes[deletion]
+                    candidates.discard(word)
+                    if not candidates:
+                        del self._deletes[deletion]
+
+
+    def lookup(self, word):
+        """
+        Returns the indexed words within the tolerated number of typos of a word
+
+        Parameters:
+            word (str): searched word
+
+        Returns:
+            dict: edit distance of every close word
+        """
+        word = fold(word)
+        edits = max_edits(word, self.max_edits)
+        candidates = set()
+        for deletion in deletes(word, edits):
+            candidates |= self._deletes.get(deletion, set())
+
+        ret = {}
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, edits)
+            if distance <= edits:
+                ret[candidate] = distance
+        return ret
+
+
+    def search(self, needle):
+        """
+        Returns the texts with a word close to every word of a needle. Texts are scored
+        by the total edit distance of the closest word to every word of the needle.
+
+        Parameters:
+            needle (str): searched words
+
+        Returns:
+            dict: total edit distance of every matching text
+        """
+        scores = None
+        for word in tokenize(fold(needle)):
+            distances = {}
+            for candidate, distance in self.lookup(word).items():
+                for key in self._postings[candidate]:
+                    if distance < distances.get(key, distance + 1):
+                        distances[key] = distance
+
+            if scores is None:
+                scores = distances
+            else:
+                scores = dict((key, score + distances[key]) for key, score in scores.items() if key in distances)
+            if not scores:
+                return {}
+        return scores or {}
@@ -0,0 +1,146 @@
+import math
+
+
+# alphabet of the geohash base32 encoding
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# number of characters of stored geohashes (cells of about 3.7cm x 1.9cm)
+GEOHASH_PRECISION = 12
+
+
+def _cell_index(value, min_value, max_value, bits):
+    """
+    Returns the index of the interval containing value when [min_value, max_value]
+    is split into 2^bits intervals
+    """
+    cells = 1 << bits
+    index = int(math.floor((value - min_value) / (max_value - min_value) * cells))
+    return max(0, min(index, cells - 1))
+
+
+def _interleave(col, row, lon_bits, lat_bits):
+    """
+    Returns the integer geohash of a cell by interleaving the bits of its longitude
+    (column) and latitude (row) indexes, starting with the longitude
+    """
+    code = 0
+    for i in range(lon_bits + lat_bits):
+        if i % 2 == 0:
+            lon_bits -= 1
+            bit = (col >> lon_bits) & 1
+        else:
+            lat_bits -= 1
+            bit = (row >> lat_bits) & 1
+        code = (code << 1) | bit
+    return code
+
+
+def _to_string(code, precision):
+    """
+    Returns the base32 string of an integer geohash of precision characters
+    """
+    chars = []
+    for __ in range(precision):
+        chars.append(BASE32[code & 31])
+        code >>= 5
+    return ''.join(reversed(chars))
+
+
+def _bits(precision):
+    """
+    Returns the number of (longitude, latitude) bits of a geohash of precision characters
+    """
+    return ((5 * precision + 1) // 2, 5 * precision // 2)
+
+
+def encode(lat, lon, precision=GEOHASH_PRECISION):
+    """
+    Returns the geohash of a coordinate. Geohashes of nearby coordinates usually share
+    a long prefix, and every geohash prefix is a latitude/longitude cell, so the
+    coordinates inside a cell form a contiguous range of sorted geohashes.
+
+    Parameters:
+        lat (float): latitude coordinate in decimal format
+        lon (float): longitude coordinate in decimal format
+        precision (int): number of characters of the geohash
+
+    Returns:
+        str: geohash of the coordinate
+    """
+    lon_bits, lat_bits = _bits(precision)
+    col = _cell_index(lon, -180, 180, lon_bits)
+    row = _cell_index(lat, -90, 90, lat_bits)
+    return _to_string(_interleave(col, row, lon_bits, lat_bits), precision)
+
+
+def geohash_ranges(min_lat, min_lon, max_lat, max_lon, max_cells=16, precision=GEOHASH_PRECISION):
+    """
+    Returns a small set of geohash ranges covering a latitude/longitude box. The box is
+    covered by the cells of the longest geohash prefix for which at most max_cells cells
+    are needed, and cells that are adjacent in geohash order are merged into a single
+    range. Every coordinate inside the box has a geohash in one of the ranges, but the
+    ranges may also contain coordinates outside the box. If min_lon is greater than
+    max_lon, the box is assumed to cross the antimeridian.
+
+    Parameters:
+        min_lat (float): southern boundary in decimal format
+        min_lon (float): western boundary in decimal format
+        max_lat (float): northern boundary in decimal format
+        max_lon (float): eastern boundary in decimal format
+        max_cells (int): maximum number of cells to cover the box with
+        precision (int): number of characters of the geohashes to search
+
+    Returns:
+        list: (first, last) geohash tuples of inclusive ranges, sorted
+    """
+    # split boxes crossing the antimeridian in two
+    if min_lon <= max_lon:
+        boxes = [(min_lat, min_lon, max_lat, max_lon)]
+    else:
+        boxes = [(min_lat, min_lon, max_lat, 180), (min_lat, -180, max_lat, max_lon)]
+
+    # find the longest prefix covering the box with at most max_cells cells
+    for prefix in range(precision, 0, -1):
+        lon_bits, lat_bits = _bits(prefix)
+        spans = []
+        for box_min_lat, box_min_lon, box_max_lat, box_max_lon in boxes:
+            spans.append((_cell_index(box_min_lon, -180, 180, lon_bits), _cell_index(box_max_lon, -180, 180, lon_bits),
+                          _cell_index(box_min_lat, -90, 90, lat_bits), _cell_index(box_max_lat, -90, 90, lat_bits)))
+        cells = sum((max_col - min_col + 1) * (max_row - min_row + 1) for min_col, max_col, min_row, max_row in spans)
+        if cells <= max_cells or prefix == 1:
+            break
+
+    codes = sorted(set(_interleave(col, row, lon_bits, lat_bits)
+                       for min_col, max_col, min_row, max_row in spans
+                       for col in range(min_col, max_col + 1)
+                       for row in range(min_row, max_row + 1)))
+
+    # merge consecutive cells, and extend the last cell of each range to full precision
+    ranges = []
+    first = last = codes[0]
+    for code in codes[1:] + [None]:
+        if code == last + 1:
+            last = code
+            continue
+        ranges.append((_to_string(first, prefix), _to_string(last, prefix) + 'z' * (precision - prefix)))
+        first = last = code
+    return ranges
+
+
+def merge_ranges(ranges):
+    """
+    Merges overlapping geohash ranges, such as the ranges covering several boxes
+
+    Parameters:
+        ranges (iterable): (first, last) geohash tuples of inclusive ranges
+
+    Returns:
+        list: (first, last) geohash tuples of disjoint inclusive ranges, sorted
+    """
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(last, merged[-1][1]))
+        else:
+            merged.append((first, last))
+    return merged
@@ -1,4 +1,14 @@
 import math
+import numpy as np
+
+
+EARTH_RADIUS = 6378*1000 # earth mean radius (m)
+
+# the equirectangular approximation is only trusted for distances of at most this many
+# meters and away from the poles, where its relative error stays far below the tolerance
+EQUIRECTANGULAR_MAX_DISTANCE = 100*1000
+EQUIRECTANGULAR_MAX_LATITUDE = 80
+EQUIRECTANGULAR_TOLERANCE = 0.01
 
 
 def haversine(lat1, long1, lat2, long2, math=math):
@@ -24,5 +34,155 @@ def haversine(lat1, long1, lat2, long2, math=math):
     # haversine formula 
     a = math.pow(math.sin((lat2 - lat1)/2), 2) + math.cos(lat1) * math.cos(lat2) * math.pow(math.sin((long2 - long1)/2), 2)
     c = 2 * math.asin(math.sqrt(a))
-    R = 6378*1000 # earth mean radius (m)
-    return c * R
\ No newline at end of file
+    R = EARTH_RADIUS
+    return c * R
+
+
+def equirectangular(lat1, long1, lat2, long2):
+    """
+    This function approximates the great-circle distance between two coordinates by
+    projecting them on a plane, scaling longitudes by the cosine of their mean latitude.
+    It only needs a single trigonometric function, and for coordinates within
+    EQUIRECTANGULAR_MAX_DISTANCE of each other and below EQUIRECTANGULAR_MAX_LATITUDE,
+    the approximation and the haversine distance are within a factor of
+    1 + EQUIRECTANGULAR_TOLERANCE of each other.
+
+    Parameters:
+        lat1 (float): latitude of first coordinate in decimal format
+        lon1 (float): longitude of first coordinate in decimal format
+        lat2 (float): latitude of second coordinate in decimal format
+        lon2 (float): longitude of second coordinate in decimal format
+
+    Returns:
+        float: approximate distance between the two coordinates
+    """
+    # wrap the longitude difference across the antimeridian
+    delta_long = (long2 - long1 + 180) % 360 - 180
+    x = math.radians(delta_long) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return math.sqrt(x * x + y * y) * EARTH_RADIUS
+
+
+def bounding_box(lat, lon, radius):
+    """
+    Calculates the smallest latitude/longitude box that contains every coordinate
+    within radius distance of the coordinate specified by lat(itude) and lon(gitude).
+    The longitude span is widened by the latitude of the coordinate, since meridians
+    converge towards the poles. If the box crosses the antimeridian, min_lon will be
+    greater than max_lon.
+
+    Parameters:
+        lat (float): latitude coordinate in decimal format
+        lon (float): longitude coordinate in decimal format
+        radius (float): distance in meters
+
+    Returns:
+        tuple: (min_lat, min_lon, max_lat, max_lon) in decimal format
+    """
+    # angular radius of the search circle
+    delta = radius / EARTH_RADIUS
+    min_lat = lat - math.degrees(delta)
+    max_lat = lat + math.degrees(delta)
+
+    # the circle contains a pole, so every longitude is inside the box
+    if min_lat <= -90 or max_lat >= 90:
+        return (max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0)
+
+    # longitude span at the latitude where the circle touches the box
+    ratio = math.sin(delta) / math.cos(math.radians(lat))
+    if ratio >= 1:
+        return (min_lat, -180.0, max_lat, 180.0)
+    delta_lon = math.degrees(math.asin(ratio))
+
+    # wrap longitudes across the antimeridian
+    min_lon = lon - delta_lon
+    max_lon = lon + delta_lon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return (min_lat, min_lon, max_lat, max_lon)
+
+
+def unit_vector(lat, lon):
+    """
+    Calculates the 3D unit vector of a coordinate on the sphere. The dot product of
+    the unit vectors of two coordinates is the cosine of the angle between them, so
+    two coordinates are within distance d of each other exactly when the dot product
+    is at least cos(d/R).
+
+    Parameters:
+        lat (float): latitude coordinate in decimal format
+        lon (float): longitude coordinate in decimal format
+
+    Returns:
+        tuple: (x, y, z) components of the unit vector
+    """
+    lat, lon = math.radians(lat), math.radians(lon)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def min_dot_product(radius):
+    """
+    Calculates the smallest dot product of the unit vectors of two coordinates
+    within radius distance of each other. The threshold is lowered by a tolerance
+    of a few rounding errors, so that the dot product never excludes a coordinate
+    that the haversine formula places exactly on the search circle. It may include
+    coordinates a few millimeters outside of it, so the distance of the selected
+    coordinates must still be checked.
+
+    Parameters:
+        radius (float): distance in meters
+
+    Returns:
+        float: threshold for the dot product of the unit vectors
+    """
+    return math.cos(min(radius / EARTH_RADIUS, math.pi)) - 1e-14
+
+
+def haversine_vectorized(lat1, long1, lat2, long2):
+    """
+    Vectorized version of the haversine function, which calculates the great-circle
+    distances between arrays of coordinates in a single call. The arguments are
+    broadcast against each other following the NumPy broadcasting rules, so a single
+    origin can be compared to an array of destinations, or arrays of origins and
+    destinations can be compared pairwise.
+
+    Parameters:
+        lat1 (array_like): latitudes of first coordinates in decimal format
+        long1 (array_like): longitudes of first coordinates in decimal format
+        lat2 (array_like): latitudes of second coordinates in decimal format
+        long2 (array_like): longitudes of second coordinates in decimal format
+
+    Returns:
+        ndarray: distances between the coordinates in meters
+    """
+    # convert decimal degrees to radians
+    lat1, long1, lat2, long2 = map(np.radians, (np.asarray(lat1, dtype=float), np.asarray(long1, dtype=float),
+                                                np.asarray(lat2, dtype=float), np.asarray(long2, dtype=float)))
+
+    # haversine formula
+    a = np.sin((lat2 - lat1)/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((long2 - long1)/2)**2
+    c = 2 * np.arcsin(np.sqrt(a))
+    return c * EARTH_RADIUS
+
+
+def haversine_matrix(lats1, longs1, lats2, longs2):
+    """
+    Calculates the great-circle distance between every pair of coordinates in two
+    sets of coordinates.
+
+    Parameters:
+        lats1 (array_like): latitudes of the first set of coordinates in decimal format
+        longs1 (array_like): longitudes of the first set of coordinates in decimal format
+        lats2 (array_like): latitudes of the second set of coordinates in decimal format
+        longs2 (array_like): longitudes of the second set of coordinates in decimal format
+
+    Returns:
+        ndarray: matrix of shape (len(lats1), len(lats2)) where element (i, j) is the
+            distance in meters between coordinate i of the first set and coordinate j
+            of the second set
+    """
+    lats1 = np.asarray(lats1, dtype=float)[:, np.newaxis]
+    longs1 = np.asarray(longs1, dtype=float)[:, np.newaxis]
+    return haversine_vectorized(lats1, longs1, lats2, longs2)
@@ -0,0 +1,303 @@
+import re
+
+
+# characters with a special meaning in SQL LIKE patterns
+LIKE_WILDCARDS = ('%', '_', '\\')
+
+
+def tokenize(text):
+    """
+    Splits a text into lowercase word tokens, so that a colon-separated menu like
+    "sandwiches: soft drinks" becomes ['sandwiches', 'soft', 'drinks']
+
+    Parameters:
+        text (str): text to split
+
+    Returns:
+        list: word tokens in order of appearance
+    """
+    return re.findall(r'\w+', text.lower())
+
+
+def trigrams(token):
+    """
+    Returns the set of three character substrings of a token or text
+
+    Parameters:
+        token (str): token or text to split
+
+    Returns:
+        set: trigrams of the token
+    """
+    return set(token[i:i+3] for i in range(len(token) - 2))
+
+
+class InvertedIndex(object):
+    """
+    A class used to encapsulate an inverted index from word tokens to the keys of the
+    texts containing them, for case-insensitive substring searches. A needle can only
+    occur inside the texts containing a token that contains each word of the needle, so
+    a search intersects the posting lists of the tokens matching each word, and only
+    verifies the remaining texts. The tokens containing a word are found through a
+    trigram index of the vocabulary.
+
+    Methods
+    -------
+    insert(key, text)
+        Inserts (or replaces) the text identified by key
+
+    remove(key)
+        Removes the text identified by key, if it exists
+
+    search(needle)
+        Returns the keys of the texts that contain a substring
+
+    estimate(needle)
+        Returns an upper bound of the number of texts that contain a substring
+    """
+
+    def __init__(self):
+        self._texts = {}
+        self._postings = {}
+        self._trigrams = {}
+
+
+    def __len__(self):
+        return len(self._texts)
+
+
+    def insert(self, key, text):
+        """
+        Inserts a text in the index. An existing text with the same key is replaced.
+
+        Parameters:
+            key (hashable): unique identifier of the text
+            text (str): text to index
+
+        Returns:
+            -
+        """
+        self.remove(key)
+        if text is None:
+            return
+        self._texts[key] = text.lower()
+        for token in set(tokenize(text)):
+            if token not in self._postings:
+                self._postings[token] = set()
+                for trigram in trigrams(token):
+                    self._trigrams.setdefault(trigram, set()).add(token)
+            self._postings[token].add(key)
+
+
+    def remove(self, key):
+        """
+        Removes a text from the index if it exists
+
+        Parameters:
+            key (hashable): unique identifier of the text
+
+        Returns:
+            -
+        """
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+
+        # drop tokens that no longer occur in any text from the vocabulary
+        for token in set(tokenize(text)):
+            keys = self._postings[token]
+            keys.discard(key)
+            if not keys:
+                del self._postings[token]
+                for trigram in trigrams(token):
+                    tokens = self._trigrams[trigram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigrams[trigram]
+
+
+    def _tokens_containing(self, word):
+        """
+        Returns the tokens of the vocabulary that contain a word
+        """
+        if len(word) < 3:
+            candidates = self._postings
+        else:
+            candidates = None
+            for trigram in trigrams(word):
+                tokens = self._trigrams.get(trigram)
+                if not tokens:
+                    return []
+                candidates = set(tokens) if candidates is None else candidates & tokens
+        return [token for token in candidates if word in token]
+
+
+    def estimate(self, needle):
+        """
+        Returns an upper bound of the number of texts that contain a substring from
+        the token frequencies, without intersecting the posting lists
+
+        Parameters:
+            needle (str): substring to search for
+
+        Returns:
+            int: upper bound of the number of matching texts
+        """
+        estimate = len(self._texts)
+        for word in tokenize(needle):
+            estimate = min(estimate, sum(len(self._postings[token]) for token in self._tokens_containing(word)))
+        return estimate
+
+
+    def search(self, needle):
+        """
+        Returns the keys of the texts that contain a substring, ignoring case
+
+        Parameters:
+            needle (str): substring to search for
+
+        Returns:
+            set: keys of the matching texts
+        """
+        needle = needle.lower()
+        words = tokenize(needle)
+
+        # needles without words, e.g. punctuation, are searched in every text
+        if not words:
+            return set(key for key, text in self._texts.items() if needle in text)
+
+        # intersect the keys of the texts containing each word
+        candidates = None
+        for word in sorted(words, key=len, reverse=True):
+            keys = set()
+            for token in self._tokens_containing(word):
+                keys |= self._postings[token]
+            candidates = keys if candidates is None else candidates & keys
+            if not candidates:
+                return set()
+
+        # a single word is matched by the tokens alone, anything else is verified
+        if needle == words[0]:
+            return candidates
+        return set(key for key in candidates if needle in self._texts[key])
+
+
+class TrigramIndex(object):
+    """
+    A class used to encapsulate an inverted index from the three character substrings
+    (trigrams) of short texts, such as names, to the keys of the texts containing them,
+    for case-insensitive substring searches. A needle can only occur inside the texts
+    containing every trigram of the needle, so a search intersects the posting lists of
+    the needle trigrams, starting with the shortest, and only verifies the remaining
+    texts. Needles shorter than a trigram are searched in every text.
+
+    Methods
+    -------
+    insert(key, text)
+        Inserts (or replaces) the text identified by key
+
+    remove(key)
+        Removes the text identified by key, if it exists
+
+    search(needle)
+        Returns the keys of the texts that contain a substring
+
+    estimate(needle)
+        Returns an upper bound of the number of texts that contain a substring
+    """
+
+    def __init__(self):
+        self._texts = {}
+        self._postings = {}
+
+
+    def __len__(self):
+        return len(self._texts)
+
+
+    def insert(self, key, text):
+        """
+        Inserts a text in the index. An existing text with the same key is replaced.
+
+        Parameters:
+            key (hashable): unique identifier of the text
+            text (str): text to index
+
+        Returns:
+            -
+        """
+        self.remove(key)
+        if text is None:
+            return
+        text = text.lower()
+        self._texts[key] = text
+        for trigram in trigrams(text):
+            self._postings.setdefault(trigram, set()).add(key)
+
+
+    def remove(self, key):
+        """
+        Removes a text from the index if it exists
+
+        Parameters:
+            key (hashable): unique identifier of the text
+
+        Returns:
+            -
+        """
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        for trigram in trigrams(text):
+            keys = self._postings[trigram]
+            keys.discard(key)
+            if not keys:
+                del self._postings[trigram]
+
+
+    def estimate(self, needle):
+        """
+        Returns an upper bound of the number of texts that contain a substring from
+        the length of the shortest posting list of its trigrams
+
+        Parameters:
+            needle (str): substring to search for
+
+        Returns:
+            int: upper bound of the number of matching texts
+        """
+        return min([len(self._texts)] + [len(self._postings.get(trigram, ())) for trigram in trigrams(needle.lower())])
+
+
+    def search(self, needle):
+        """
+        Returns the keys of the texts that contain a substring, ignoring case
+
+        Parameters:
+            needle (str): substring to search for
+
+        Returns:
+            set: keys of the matching texts
+        """
+        needle = needle.lower()
+        if len(needle) < 3:
+            return set(key for key, text in self._texts.items() if needle in text)
+
+        # intersect the posting lists, shortest first
+        postings = []
+        for trigram in trigrams(needle):
+            keys = self._postings.get(trigram)
+            if not keys:
+                return set()
+            postings.append(keys)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for keys in postings[1:]:
+            candidates &= keys
+            if not candidates:
+                return set()
+
+        # a needle of a single trigram is matched by the postings alone
+        if len(needle) == 3:
+            return candidates
+        return set(key for key in candidates if needle in self._texts[key])
@@ -0,0 +1,76 @@
+import json
+from flask import current_app
+
+
+class Fragment(str):
+    """
+    A class used to mark a string as an encoded JSON value, which is inserted into an
+    encoded document as is
+    """
+    __slots__ = ()
+
+
+def encode_fragment(value):
+    """
+    Returns the compact JSON encoding of a value, with sorted keys like jsonify
+
+    Parameters:
+        value (object): JSON-serializable value
+
+    Returns:
+        Fragment: encoded value
+    """
+    return Fragment(json.dumps(value, sort_keys=True, separators=(',', ':')))
+
+
+def extend_fragment(fragment, **fields):
+    """
+    Returns an encoded JSON object with additional fields, without decoding it
+
+    Parameters:
+        fragment (Fragment): encoded JSON object
+        fields (dict): fields to add to the object
+
+    Returns:
+        Fragment: encoded object with the additional fields
+    """
+    if not fields:
+        return fragment
+    extra = encode_fragment(fields)
+    if fragment == '{}':
+        return extra
+    return Fragment(fragment[:-1] + ',' + extra[1:])
+
+
+def dumps(value):
+    """
+    Returns the compact JSON encoding of a value that may contain encoded fragments.
+    Dictionaries and lists are encoded around the fragments, and fragments are
+    inserted without encoding them again.
+
+    Parameters:
+        value (object): JSON-serializable value, possibly containing Fragment objects
+
+    Returns:
+        str: encoded value
+    """
+    if isinstance(value, Fragment):
+        return value
+    if isinstance(value, dict):
+        return '{' + ','.join(json.dumps(str(key)) + ':' + dumps(value[key]) for key in sorted(value)) + '}'
+    if isinstance(value, (list, tuple)):
+        return '[' + ','.join(dumps(e) for e in value) + ']'
+    return json.dumps(value)
+
+
+def jsonify_fragments(value):
+    """
+    Returns a JSON response of a value that may contain encoded fragments, like jsonify
+
+    Parameters:
+        value (object): JSON-serializable value, possibly containing Fragment objects
+
+    Returns:
+        object: Flask response
+    """
+    return current_app.response_class(dumps(value) + '\n', mimetype=current_app.config['JSONIFY_MIMETYPE'])
@@ -0,0 +1,130 @@
+import time
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    A class used to encapsulate a bounded cache that evicts the least recently used
+    entry once it is full, and expires entries after a time to live. Entries are kept
+    in order of last use, so both lookups and evictions take constant time.
+
+    Attributes
+    ----------
+    max_size (int)
+        Maximum number of entries
+
+    ttl (float)
+        Number of seconds an entry is kept after it is stored, or None to keep it
+        until it is evicted
+
+    Methods
+    -------
+    get(key)
+        Returns the value of an entry and marks it as recently used
+
+    put(key, value)
+        Stores (or replaces) an entry, evicting the least recently used entry if full
+
+    pop(key)
+        Removes an entry if it exists
+
+    evict(predicate)
+        Removes the entries with values matching a predicate
+
+    clear()
+        Removes every entry
+    """
+
+    def __init__(self, max_size, ttl=None):
+        if max_size < 1:
+            raise ValueError('max_size must be a positive integer')
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+
+    def __len__(self):
+        return len(self._entries)
+
+
+    def __contains__(self, key):
+        return self.get(key, touch=False) is not None
+
+
+    def get(self, key, touch=True):
+        """
+        Returns the value of an entry, unless it does not exist or has expired
+
+        Parameters:
+            key (hashable): key of the entry
+            touch (bool): mark the entry as recently used
+
+        Returns:
+            object: value of the entry, or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.time() >= expires_at:
+            del self._entries[key]
+            return None
+        if touch:
+            self._entries.move_to_end(key)
+        return value
+
+
+    def put(self, key, value):
+        """
+        Stores an entry as the most recently used. An existing entry with the same key
+        is replaced, and the least recently used entries are evicted beyond max_size.
+
+        Parameters:
+            key (hashable): key of the entry
+            value (object): value of the entry, which must not be None
+
+        Returns:
+            -
+        """
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+    def pop(self, key):
+        """
+        Removes an entry if it exists
+
+        Parameters:
+            key (hashable): key of the entry
+
+        Returns:
+            object: value of the removed entry, or None
+        """
+        entry = self._entries.pop(key, None)
+        return entry[0] if entry is not None else None
+
+
+    def evict(self, predicate):
+        """
+        Removes the entries with values for which a predicate is true
+
+        Parameters:
+            predicate (function): function of an entry value returning a bool
+
+        Returns:
+            int: number of removed entries
+        """
+        keys = [key for key, (value, __) in self._entries.items() if predicate(value)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+
+    def clear(self):
+        """
+        Removes every entry
+        """
+        self._entries.clear()
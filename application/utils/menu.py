@@ -0,0 +1,78 @@
+import re
+import sys
+
+
+# separator of the menu items in the food_items field
+MENU_ITEM_SEPARATOR = ':'
+
+
+def parse_menu_items(food_items):
+    """
+    Splits a colon-separated food_items field into its distinct menu items, in lowercase
+    and with collapsed whitespace, so that "Cold Truck: Hot  Dogs" becomes
+    ['cold truck', 'hot dogs']
+
+    Parameters:
+        food_items (str): colon-separated menu items
+
+    Returns:
+        list: distinct menu items in order of appearance
+    """
+    items = []
+    for item in (food_items or '').split(MENU_ITEM_SEPARATOR):
+        item = ' '.join(item.lower().split())
+        if item and item not in items:
+            items.append(item)
+    return items
+
+
+def within_menu_item(needle):
+    """
+    Returns whether every occurrence of a substring in a food_items field lies inside a
+    single normalized menu item, so that it can be searched in the menu items instead.
+    This is not the case for substrings containing the separator, leading, trailing or
+    repeated whitespace, or LIKE wildcards.
+
+    Parameters:
+        needle (str): searched substring
+
+    Returns:
+        bool: whether the substring can be searched in the menu items
+    """
+    return (bool(needle) and needle == ' '.join(needle.split()) and
+            not re.search(r'[:%_\\]', needle))
+
+
+def menu_item_suffixes(item):
+    """
+    Returns the distinct suffixes of a normalized menu item that start with a word
+    character or punctuation, so that every substring of the menu item without leading
+    whitespace is a prefix of one of them, e.g. 'hot dogs' has the suffixes
+    ['dogs', 'gs', 'hot dogs', 'ogs', 'ot dogs', 's', 't dogs']
+
+    Parameters:
+        item (str): normalized menu item
+
+    Returns:
+        list: sorted suffixes
+    """
+    return sorted(set(item[i:] for i in range(len(item)) if not item[i].isspace()))
+
+
+def prefix_upper_bound(prefix):
+    """
+    Returns the smallest string that is greater than every string starting with a prefix,
+    so that the strings starting with the prefix are the range [prefix, upper bound),
+    which can be answered by an index on binary collated strings
+
+    Parameters:
+        prefix (str): non-empty prefix
+
+    Returns:
+        str: exclusive upper bound of the range, or None if the range is unbounded
+    """
+    while prefix and ord(prefix[-1]) == sys.maxunicode:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
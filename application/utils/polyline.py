@@ -0,0 +1,189 @@
+import math
+from .haversine import haversine, bounding_box, EARTH_RADIUS
+
+
+def decode_polyline(encoded, precision=5):
+    """
+    Decodes a route in the encoded polyline format used by the Google Maps APIs,
+    where every coordinate is stored as the varint encoded difference to the
+    previous coordinate.
+
+    Parameters:
+        encoded (str): encoded polyline
+        precision (int): number of decimals of the encoded coordinates
+
+    Returns:
+        list: (lat, lon) tuples of the route vertices in decimal format
+
+    Raises:
+        ValueError: if the polyline is malformed
+    """
+    factor = 10 ** precision
+    values = []
+    value = shift = 0
+    for char in encoded:
+        chunk = ord(char) - 63
+        if not 0 <= chunk < 64:
+            raise ValueError('malformed polyline: invalid character {!r}'.format(char))
+        value |= (chunk & 0x1f) << shift
+        shift += 5
+        if chunk < 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+    if shift or len(values) % 2:
+        raise ValueError('malformed polyline: truncated coordinate')
+
+    route = []
+    lat = lon = 0
+    for i in range(0, len(values), 2):
+        lat += values[i]
+        lon += values[i+1]
+        route.append((lat / factor, lon / factor))
+    return route
+
+
+def encode_polyline(route, precision=5):
+    """
+    Encodes a route in the encoded polyline format used by the Google Maps APIs
+
+    Parameters:
+        route (list): (lat, lon) tuples of the route vertices in decimal format
+        precision (int): number of decimals of the encoded coordinates
+
+    Returns:
+        str: encoded polyline
+    """
+    factor = 10 ** precision
+    chars = []
+    prev_lat = prev_lon = 0
+    for lat, lon in route:
+        lat, lon = int(round(lat * factor)), int(round(lon * factor))
+        for delta in (lat - prev_lat, lon - prev_lon):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chars.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            chars.append(chr(value + 63))
+        prev_lat, prev_lon = lat, lon
+    return ''.join(chars)
+
+
+def _bearing(lat1, long1, lat2, long2):
+    """
+    Returns the initial bearing in radians of the great circle from the first to the
+    second coordinate, where the coordinates are in radians
+    """
+    delta_long = long2 - long1
+    return math.atan2(math.sin(delta_long) * math.cos(lat2),
+                      math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(delta_long))
+
+
+def intermediate_point(lat1, long1, lat2, long2, fraction):
+    """
+    Calculates the coordinate at a fraction of the great-circle segment between two
+    coordinates
+
+    Parameters:
+        lat1 (float): latitude of the segment start in decimal format
+        long1 (float): longitude of the segment start in decimal format
+        lat2 (float): latitude of the segment end in decimal format
+        long2 (float): longitude of the segment end in decimal format
+        fraction (float): fraction of the segment length from its start, between 0 and 1
+
+    Returns:
+        tuple: (lat, lon) of the coordinate in decimal format
+    """
+    delta = haversine(lat1, long1, lat2, long2) / EARTH_RADIUS
+    if delta == 0:
+        return (lat1, long1)
+
+    # interpolate the unit vectors of the endpoints along the great circle
+    phi1, lam1, phi2, lam2 = map(math.radians, (lat1, long1, lat2, long2))
+    a = math.sin((1 - fraction) * delta) / math.sin(delta)
+    b = math.sin(fraction * delta) / math.sin(delta)
+    x = a * math.cos(phi1) * math.cos(lam1) + b * math.cos(phi2) * math.cos(lam2)
+    y = a * math.cos(phi1) * math.sin(lam1) + b * math.cos(phi2) * math.sin(lam2)
+    z = a * math.sin(phi1) + b * math.sin(phi2)
+    return (math.degrees(math.atan2(z, math.hypot(x, y))), math.degrees(math.atan2(y, x)))
+
+
+def segment_distance(lat, lon, lat1, long1, lat2, long2):
+    """
+    Calculates the great-circle distance between a coordinate and the closest point
+    of the great-circle segment between two other coordinates, and how far along the
+    segment that point is. The closest point is found from the cross-track and
+    along-track distances of the coordinate, and is clamped to the segment endpoints.
+
+    Parameters:
+        lat (float): latitude of the coordinate in decimal format
+        lon (float): longitude of the coordinate in decimal format
+        lat1 (float): latitude of the segment start in decimal format
+        long1 (float): longitude of the segment start in decimal format
+        lat2 (float): latitude of the segment end in decimal format
+        long2 (float): longitude of the segment end in decimal format
+
+    Returns:
+        tuple: (distance, along) in meters, where along is the distance from the segment
+            start to the closest point of the segment
+    """
+    dist_start = haversine(lat1, long1, lat, lon)
+    length = haversine(lat1, long1, lat2, long2)
+    if length == 0 or dist_start == 0:
+        return (dist_start, 0.0)
+
+    # angle between the segment and the direction towards the coordinate at the segment start
+    phi, lam, phi1, lam1, phi2, lam2 = map(math.radians, (lat, lon, lat1, long1, lat2, long2))
+    angle = _bearing(phi1, lam1, phi, lam) - _bearing(phi1, lam1, phi2, lam2)
+
+    # cross-track and along-track distances
+    delta = dist_start / EARTH_RADIUS
+    cross = math.asin(max(-1.0, min(1.0, math.sin(delta) * math.sin(angle))))
+    along = math.atan2(math.sin(delta) * math.cos(angle), math.cos(delta)) * EARTH_RADIUS
+
+    # clamp the closest point to the segment endpoints
+    if along <= 0:
+        return (dist_start, 0.0)
+    if along >= length:
+        return (haversine(lat2, long2, lat, lon), length)
+    return (abs(cross) * EARTH_RADIUS, along)
+
+
+def route_segments(route):
+    """
+    Returns the segments of a route. A route with a single vertex has a single
+    segment of length zero.
+
+    Parameters:
+        route (list): (lat, lon) tuples of the route vertices in decimal format
+
+    Returns:
+        list: ((lat1, lon1), (lat2, lon2)) tuples of the segment endpoints
+    """
+    return list(zip(route, route[1:])) or [(route[0], route[0])] if route else []
+
+
+def corridor_boxes(lat1, long1, lat2, long2, width):
+    """
+    Calculates latitude/longitude boxes that together contain every coordinate within
+    width distance of a great-circle segment. The segment is split into pieces no longer
+    than twice the width, and every coordinate within width distance of a piece is within
+    width distance plus half the piece length of its midpoint, so the boxes of these
+    circles cover the corridor with a total area proportional to the corridor area.
+
+    Parameters:
+        lat1 (float): latitude of the segment start in decimal format
+        long1 (float): longitude of the segment start in decimal format
+        lat2 (float): latitude of the segment end in decimal format
+        long2 (float): longitude of the segment end in decimal format
+        width (float): corridor width in meters on each side of the segment
+
+    Returns:
+        list: (min_lat, min_lon, max_lat, max_lon) boxes in decimal format
+    """
+    length = haversine(lat1, long1, lat2, long2)
+    pieces = max(1, int(math.ceil(length / (2 * width)))) if width > 0 else 1
+    boxes = []
+    for i in range(pieces):
+        lat, lon = intermediate_point(lat1, long1, lat2, long2, (i + 0.5) / pieces)
+        boxes.append(bounding_box(lat, lon, length / pieces / 2 + width))
+    return boxes
@@ -0,0 +1,126 @@
+import re
+from bisect import bisect_left, insort
+from .lru_cache import LRUCache
+
+
+class PrefixIndex(object):
+    """
+    A class used to encapsulate a sorted array of texts for prefix autocompletion. Every
+    text is stored under each of its words, so a prefix matches texts with a word that
+    starts with it, and the texts with the most occurrences are suggested first. The
+    matches of a prefix are a contiguous slice of the array, found by binary search.
+    The results of the most recently completed prefixes are memoized until the next change.
+
+    Attributes
+    ----------
+    cache_size (int)
+        Maximum number of memoized results
+
+    Methods
+    -------
+    add(text)
+        Adds an occurrence of a text
+
+    discard(text)
+        Removes an occurrence of a text, if it exists
+
+    complete(prefix, limit)
+        Returns the most frequent texts with a word starting with a prefix
+    """
+
+    def __init__(self, cache_size=1024):
+        self.cache_size = cache_size
+        self._keys = []
+        self._counts = {}
+        self._cache = LRUCache(cache_size)
+
+
+    def __len__(self):
+        return len(self._counts)
+
+
+    @staticmethod
+    def normalize(text):
+        """
+        Returns a text in lowercase with collapsed whitespace, as it is matched
+        """
+        return ' '.join(text.lower().split())
+
+
+    def _entries(self, text):
+        """
+        Returns the (key, text) entries of a text, where key is the normalized text
+        from the start of each word
+        """
+        key = self.normalize(text)
+        return [(key[match.start():], text) for match in re.finditer(r'\b\w', key)]
+
+
+    def add(self, text):
+        """
+        Adds an occurrence of a text
+
+        Parameters:
+            text (str): text to suggest
+
+        Returns:
+            -
+        """
+        self._cache.clear()
+        count = self._counts.get(text, 0)
+        self._counts[text] = count + 1
+        if count == 0:
+            for entry in self._entries(text):
+                insort(self._keys, entry)
+
+
+    def discard(self, text):
+        """
+        Removes an occurrence of a text if it exists
+
+        Parameters:
+            text (str): suggested text
+
+        Returns:
+            -
+        """
+        count = self._counts.get(text)
+        if count is None:
+            return
+        self._cache.clear()
+        if count > 1:
+            self._counts[text] = count - 1
+            return
+        del self._counts[text]
+        for entry in self._entries(text):
+            i = bisect_left(self._keys, entry)
+            if i < len(self._keys) and self._keys[i] == entry:
+                del self._keys[i]
+
+
+    def complete(self, prefix, limit):
+        """
+        Returns the texts with a word that starts with a prefix, ignoring case, ordered
+        by decreasing number of occurrences and then alphabetically
+
+        Parameters:
+            prefix (str): prefix to complete
+            limit (int): maximum number of texts to return
+
+        Returns:
+            list: (text, count) tuples of the suggested texts
+        """
+        prefix = self.normalize(prefix)
+        ret = self._cache.get((prefix, limit))
+        if ret is not None:
+            return ret
+
+        matches = set()
+        for key, text in self._keys[bisect_left(self._keys, (prefix,)):]:
+            if not key.startswith(prefix):
+                break
+            matches.add(text)
+
+        ret = sorted(((text, self._counts[text]) for text in matches), key=lambda e: (-e[1], e[0].lower(), e[0]))[:limit]
+        self._cache.put((prefix, limit), ret)
+        return ret
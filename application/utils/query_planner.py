@@ -0,0 +1,41 @@
+from collections import namedtuple
+
+
+# cost of computing the great-circle distance of a truck, relative to matching a
+# substring pattern against a truck
+DISTANCE_COST = 5.0
+PATTERN_COST = 1.0
+
+# the filter a radius query is driven by, the estimated cost of every candidate
+# driver, and the estimated number of trucks selected by every filter
+QueryPlan = namedtuple('QueryPlan', ['driver', 'costs', 'rows'])
+
+
+def plan_radius_query(total, rows, indexed):
+    """
+    Chooses the filter that drives a radius query combined with substring filters.
+    The driving filter selects the candidate trucks, the great-circle distance is
+    computed for every candidate, and the other filters are evaluated for every
+    candidate. The spatial filter is always answered by an index, while a substring
+    filter has to match every truck unless it is answered by an index. The plan with
+    the lowest estimated cost is chosen, preferring the spatial filter on ties.
+
+    Parameters:
+        total (int): number of trucks
+        rows (dict): estimated number of trucks selected by the 'radius' filter and
+            by the 'name' and 'item' filters that are specified
+        indexed (dict): whether the 'name' and 'item' filters are answered by an index
+
+    Returns:
+        QueryPlan: the chosen plan
+    """
+    filters = len(rows) - 1
+    costs = {}
+    for driver in ['radius'] + sorted(key for key in rows if key != 'radius'):
+        cost = rows[driver] * (DISTANCE_COST + filters * PATTERN_COST)
+        if driver != 'radius' and not indexed.get(driver):
+            cost += total * PATTERN_COST
+        costs[driver] = cost
+
+    driver = min(costs, key=lambda key: (costs[key], key != 'radius'))
+    return QueryPlan(driver, costs, dict(rows))
@@ -0,0 +1,413 @@
+import math
+import heapq
+from .polyline import route_segments, corridor_boxes, segment_distance
+from .haversine import (haversine, bounding_box, EARTH_RADIUS, EQUIRECTANGULAR_MAX_DISTANCE,
+                        EQUIRECTANGULAR_MAX_LATITUDE, EQUIRECTANGULAR_TOLERANCE)
+
+
+class SpatialGrid(object):
+    """
+    A class used to encapsulate a uniform latitude/longitude grid of points.
+    Every point is bucketed in the cell that contains it, so a radius search
+    only has to visit the cells overlapping the bounding box of the search circle,
+    and the exact distance is only computed for the points in those cells.
+
+    Attributes
+    ----------
+    cell_size (float)
+        Width and height of a grid cell in decimal degrees
+
+    Methods
+    -------
+    insert(key, lat, lon)
+        Inserts (or moves) the point identified by key
+
+    remove(key)
+        Removes the point identified by key, if it exists
+
+    query_box(min_lat, min_lon, max_lat, max_lon)
+        Returns the points inside a latitude/longitude box
+
+    query_radius(lat, lon, radius)
+        Returns the points within radius distance of a coordinate, sorted by distance
+
+    nearest(lat, lon, approximate, min_dist)
+        Yields the points in order of ascending distance from a coordinate
+
+    query_route(route, width)
+        Returns the points within width distance of a route, sorted by position along the route
+
+    cell_counts(accept)
+        Returns the number of points in every occupied cell
+
+    count_box(min_lat, min_lon, max_lat, max_lon)
+        Returns an upper bound of the number of points inside a latitude/longitude box
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        self._points = {}
+
+
+    def __len__(self):
+        return len(self._points)
+
+
+    def __contains__(self, key):
+        return key in self._points
+
+
+    def cell_of(self, lat, lon):
+        """
+        Returns the (row, column) key of the cell containing a coordinate
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+
+        Returns:
+            tuple: (row, column) of the cell
+        """
+        return (int(math.floor(lat / self.cell_size)), int(math.floor(lon / self.cell_size)))
+
+
+    def insert(self, key, lat, lon):
+        """
+        Inserts a point in the grid. An existing point with the same key is moved.
+
+        Parameters:
+            key (hashable): unique identifier of the point
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+
+        Returns:
+            -
+        """
+        self.remove(key)
+        self._points[key] = (lat, lon)
+        self._cells.setdefault(self.cell_of(lat, lon), {})[key] = (lat, lon)
+
+
+    def remove(self, key):
+        """
+        Removes a point from the grid if it exists
+
+        Parameters:
+            key (hashable): unique identifier of the point
+
+        Returns:
+            -
+        """
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+
+        # drop the cell once it is empty, so that sparse grids stay small
+        cell = self.cell_of(*point)
+        bucket = self._cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self._cells[cell]
+
+
+    def cell_counts(self, accept=None):
+        """
+        Returns the number of points in every occupied cell, optionally only counting
+        the points with keys in accept. Counting a subset only visits the keys in it.
+
+        Parameters:
+            accept (set): keys of the points to count (optional)
+
+        Returns:
+            list: (row, column, count) tuples sorted by cell
+        """
+        if accept is None:
+            return sorted((row, col, len(bucket)) for (row, col), bucket in self._cells.items())
+
+        counts = {}
+        for key in accept:
+            point = self._points.get(key)
+            if point is not None:
+                cell = self.cell_of(*point)
+                counts[cell] = counts.get(cell, 0) + 1
+        return sorted((row, col, count) for (row, col), count in counts.items())
+
+
+    def _cells_in_box(self, min_lat, min_lon, max_lat, max_lon):
+        """
+        Returns the keys of the occupied cells overlapping a latitude/longitude box
+        """
+        min_row, min_col = self.cell_of(min_lat, min_lon)
+        max_row, max_col = self.cell_of(max_lat, max_lon)
+
+        # split boxes crossing the antimeridian into two column ranges
+        if min_lon <= max_lon:
+            col_ranges = [(min_col, max_col)]
+        else:
+            col_ranges = [(min_col, self.cell_of(0, 180)[1]), (self.cell_of(0, -180)[1], max_col)]
+
+        # visit the occupied cells directly when the box covers more cells than are occupied
+        box_cells = (max_row - min_row + 1) * sum(hi - lo + 1 for lo, hi in col_ranges)
+        if box_cells > len(self._cells):
+            return [cell for cell in self._cells if min_row <= cell[0] <= max_row and
+                    any(lo <= cell[1] <= hi for lo, hi in col_ranges)]
+
+        return [(row, col) for row in range(min_row, max_row + 1)
+                for lo, hi in col_ranges for col in range(lo, hi + 1)
+                if (row, col) in self._cells]
+
+
+    def count_box(self, min_lat, min_lon, max_lat, max_lon):
+        """
+        Returns the number of points in the cells overlapping a latitude/longitude box,
+        which is an upper bound of the number of points inside the box. If min_lon is
+        greater than max_lon, the box is assumed to cross the antimeridian.
+
+        Parameters:
+            min_lat (float): southern boundary in decimal format
+            min_lon (float): western boundary in decimal format
+            max_lat (float): northern boundary in decimal format
+            max_lon (float): eastern boundary in decimal format
+
+        Returns:
+            int: number of points in the overlapping cells
+        """
+        return sum(len(self._cells[cell]) for cell in self._cells_in_box(min_lat, min_lon, max_lat, max_lon))
+
+
+    def query_box(self, min_lat, min_lon, max_lat, max_lon):
+        """
+        Returns the points inside a latitude/longitude box. If min_lon is greater
+        than max_lon, the box is assumed to cross the antimeridian.
+
+        Parameters:
+            min_lat (float): southern boundary in decimal format
+            min_lon (float): western boundary in decimal format
+            max_lat (float): northern boundary in decimal format
+            max_lon (float): eastern boundary in decimal format
+
+        Returns:
+            list: (key, lat, lon) tuples of the points inside the box
+        """
+        crosses = min_lon > max_lon
+        points = []
+        for cell in self._cells_in_box(min_lat, min_lon, max_lat, max_lon):
+            for key, (lat, lon) in self._cells[cell].items():
+                if not min_lat <= lat <= max_lat:
+                    continue
+                if crosses:
+                    if lon < min_lon and lon > max_lon:
+                        continue
+                elif not min_lon <= lon <= max_lon:
+                    continue
+                points.append((key, lat, lon))
+        return points
+
+
+    def query_radius(self, lat, lon, radius):
+        """
+        Returns the points within radius distance of a coordinate. Only the points
+        in cells overlapping the bounding box of the search circle are considered.
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            radius (float): search radius in meters
+
+        Returns:
+            list: (distance, key) tuples sorted by ascending distance
+        """
+        matches = []
+        for key, p_lat, p_lon in self.query_box(*bounding_box(lat, lon, radius)):
+            dist = haversine(lat, lon, p_lat, p_lon)
+            if dist <= radius:
+                matches.append((dist, key))
+        matches.sort()
+        return matches
+
+
+    def _ring_cells(self, row, col, ring):
+        """
+        Returns the keys of the occupied cells at Chebyshev distance ring from a cell
+        """
+        if ring == 0:
+            offsets = [(0, 0)]
+        else:
+            offsets = [(d_row, d_col) for d_row in (-ring, ring) for d_col in range(-ring, ring + 1)]
+            offsets += [(d_row, d_col) for d_col in (-ring, ring) for d_row in range(-ring + 1, ring)]
+
+        # columns are wrapped across the antimeridian
+        columns = int(round(360 / self.cell_size))
+        cells = []
+        for d_row, d_col in offsets:
+            for wrap in (0, -columns, columns):
+                cell = (row + d_row, col + d_col + wrap)
+                if cell in self._cells:
+                    cells.append(cell)
+        return cells
+
+
+    def _distance_outside_rings(self, lat, lon, row, col, ring):
+        """
+        Returns a lower bound for the distance from a coordinate to any point outside
+        the cells within Chebyshev distance ring of the cell (row, col)
+        """
+        bounds = []
+
+        # distance along the meridian to the southern and northern edges
+        min_lat = (row - ring) * self.cell_size
+        max_lat = (row + ring + 1) * self.cell_size
+        if min_lat > -90:
+            bounds.append(math.radians(lat - min_lat))
+        if max_lat < 90:
+            bounds.append(math.radians(max_lat - lat))
+
+        # distance to the nearest point on the western and eastern edge meridians
+        delta_lon = min(lon - (col - ring) * self.cell_size, (col + ring + 1) * self.cell_size - lon)
+        if (2 * ring + 1) * self.cell_size < 360:
+            bounds.append(math.asin(math.cos(math.radians(lat)) * math.sin(math.radians(min(delta_lon, 90)))))
+
+        return min(bounds) * EARTH_RADIUS if bounds else float('inf')
+
+
+    def _distance_within_cells(self, lat, lon, min_row, min_col, max_row, max_col):
+        """
+        Returns an upper bound for the distance from a coordinate to any point inside
+        the cells from (min_row, min_col) to (max_row, max_col)
+        """
+        min_lat = max(min_row * self.cell_size, -90)
+        max_lat = min((max_row + 1) * self.cell_size, 90)
+        min_lon = min_col * self.cell_size
+        max_lon = (max_col + 1) * self.cell_size
+
+        # the farthest point of a box smaller than a hemisphere is one of its corners
+        if max_lon - min_lon >= 180:
+            return float('inf')
+        return max(haversine(lat, lon, c_lat, c_lon) for c_lat in (min_lat, max_lat) for c_lon in (min_lon, max_lon))
+
+
+    def nearest(self, lat, lon, approximate=True, min_dist=0):
+        """
+        Generator that yields the points in order of ascending distance from a coordinate.
+        Cells are visited in expanding rings around the cell containing the coordinate,
+        and a point is yielded as soon as no unvisited cell can contain a closer point,
+        so consuming the first k points only visits the cells near the k-th neighbour.
+        The grid must not be modified while the generator is consumed.
+
+        If approximate is set, candidates are first ranked by a lower bound of their
+        distance from the cheaper equirectangular approximation, and the exact haversine
+        distance is only computed once a candidate reaches the front of the queue. Points
+        are still yielded in exact order with their exact distance, but the exact distance
+        is only computed for the yielded points and the few candidates near them.
+
+        If min_dist is set, such as the distance of the last point of a previous page, the
+        rings and cells entirely closer than min_dist are skipped without visiting their
+        points. Some points closer than min_dist may still be yielded from the cells
+        crossing it.
+
+        Parameters:
+            lat (float): latitude coordinate in decimal format
+            lon (float): longitude coordinate in decimal format
+            approximate (bool): rank candidates by approximate distance first
+            min_dist (float): distance in meters below which points may be skipped
+
+        Yields:
+            tuple: (distance, key) of the next nearest point
+        """
+        approximate = approximate and abs(lat) <= EQUIRECTANGULAR_MAX_LATITUDE
+        row, col = self.cell_of(lat, lon)
+
+        # the equirectangular distance in degrees is scaled to a lower bound in meters,
+        # which is only trusted up to the maximum distance
+        to_lower_bound = math.radians(EARTH_RADIUS) / (1 + EQUIRECTANGULAR_TOLERANCE)
+        max_degrees = math.degrees(EQUIRECTANGULAR_MAX_DISTANCE / EARTH_RADIUS)
+        candidates = []
+        visited = set()
+        ring = 0
+
+        # skip the rings entirely closer than min_dist, until the remaining cells are visited directly
+        while (min_dist > 0 and max(8 * ring, 1) <= len(self._cells) - len(visited)
+               and self._distance_within_cells(lat, lon, row - ring, col - ring, row + ring, col + ring) < min_dist):
+            visited.update(self._ring_cells(row, col, ring))
+            ring += 1
+
+        while True:
+            # visit the remaining occupied cells directly once a ring is larger than them
+            remaining = len(self._cells) - len(visited)
+            if remaining == 0:
+                cells, bound = [], float('inf')
+            elif max(8 * ring, 1) > remaining:
+                cells = [cell for cell in self._cells if cell not in visited]
+                bound = float('inf')
+            else:
+                cells = [cell for cell in self._ring_cells(row, col, ring) if cell not in visited]
+                bound = self._distance_outside_rings(lat, lon, row, col, ring)
+
+            # queue candidates by exact distance, or by a lower bound of it if approximate
+            for cell in cells:
+                visited.add(cell)
+                if min_dist > 0 and self._distance_within_cells(lat, lon, *(cell + cell)) < min_dist:
+                    continue
+                for key, (p_lat, p_lon) in self._cells[cell].items():
+                    if approximate and abs(p_lat) <= EQUIRECTANGULAR_MAX_LATITUDE:
+                        # equirectangular approximation, inlined since it is evaluated for every candidate
+                        x = ((p_lon - lon + 180) % 360 - 180) * math.cos(math.radians((lat + p_lat) / 2))
+                        y = p_lat - lat
+                        degrees = math.sqrt(x * x + y * y)
+                        if degrees <= max_degrees:
+                            heapq.heappush(candidates, (degrees * to_lower_bound, key, False))
+                            continue
+                    heapq.heappush(candidates, (haversine(lat, lon, p_lat, p_lon), key, True))
+
+            # every exact candidate closer than the unvisited cells and the lower bounds
+            # of the remaining candidates is final
+            while candidates and candidates[0][0] <= bound:
+                dist, key, exact = heapq.heappop(candidates)
+                if exact:
+                    yield (dist, key)
+                else:
+                    p_lat, p_lon = self._points[key]
+                    heapq.heappush(candidates, (haversine(lat, lon, p_lat, p_lon), key, True))
+
+            if bound == float('inf'):
+                return
+            ring += 1
+
+
+    def query_route(self, route, width):
+        """
+        Returns the points within width distance of any segment of a route. Only the
+        points in cells overlapping the corridor boxes of each segment are considered,
+        so the cost depends on the area of the corridor rather than the length of the route.
+
+        Parameters:
+            route (list): (lat, lon) tuples of the route vertices in decimal format
+            width (float): corridor width in meters on each side of the route
+
+        Returns:
+            list: (position, distance, key) tuples sorted by ascending position, where
+                position is the distance along the route to the first point of the route
+                within width distance, and distance is the distance to the route
+        """
+        matches = {}
+        start = 0.0
+        for (lat1, lon1), (lat2, lon2) in route_segments(route):
+            candidates = {}
+            for box in corridor_boxes(lat1, lon1, lat2, lon2, width):
+                for key, p_lat, p_lon in self.query_box(*box):
+                    candidates[key] = (p_lat, p_lon)
+
+            # positions increase along the route, so the first segment near a point gives its position
+            for key, (p_lat, p_lon) in candidates.items():
+                dist, along = segment_distance(p_lat, p_lon, lat1, lon1, lat2, lon2)
+                if dist > width:
+                    continue
+                if key in matches:
+                    position, prev_dist = matches[key]
+                    matches[key] = (position, min(dist, prev_dist))
+                else:
+                    matches[key] = (start + along, dist)
+            start += haversine(lat1, lon1, lat2, lon2)
+
+        return sorted((position, dist, key) for key, (position, dist) in matches.items())
@@ -2,10 +2,18 @@ import graphene
 from graphene_sqlalchemy import SQLAlchemyObjectType, SQLAlchemyConnectionField
 from application.views.authentication import get_token_from_header, get_user_id_from_token
 from flask import abort, current_app
-from application.models import FoodTruck, User, db
+from application.models import FoodTruck, MenuItem, User, db
 from sqlalchemy.exc import SQLAlchemyError
 
 
+class MenuItemObject(SQLAlchemyObjectType):
+    """
+    A class used to encapsulate the normalized menu items of the GraphQL endpoint
+    """
+    class Meta:
+        model = MenuItem
+
+
 class FoodTruckObject(SQLAlchemyObjectType):
     """
     A class used to encapsulate the GraphQL endpoint
@@ -152,7 +160,7 @@ class DeleteFoodTruck(graphene.Mutation):
             truck = FoodTruck.query.filter_by(uuid=truck_id).first()
             if truck:
                 if truck.user_id == user_id or User.is_admin(user_id):
-                    FoodTruck.query.filter_by(uuid=truck_id).delete()
+                    db.session.delete(truck)
                     db.session.commit()
                     current_app.logger.info('successfully deleted food truck entry id %d', truck_id)
                     return DeleteFoodTruck(food_truck=truck)
@@ -2,4 +2,10 @@ from .foodtrucks import FoodTrucksAPI
 from .foodtrucks_items import FoodTrucksItemsAPI
 from .foodtrucks_name import FoodTrucksNameAPI
 from .foodtrucks_location import FoodTrucksLocationAPI
+from .foodtrucks_location_batch import FoodTrucksLocationBatchAPI
+from .foodtrucks_viewport import FoodTrucksViewportAPI
+from .foodtrucks_clusters import FoodTrucksClustersAPI
+from .foodtrucks_route import FoodTrucksRouteAPI
+from .foodtrucks_heatmap import FoodTrucksHeatmapAPI
+from .foodtrucks_autocomplete import FoodTrucksAutocompleteAPI
 from .GraphQL import schema
\ No newline at end of file
@@ -1,10 +1,44 @@
+from functools import reduce
+from operator import xor
 from flask import request, jsonify, abort, make_response, Blueprint, current_app
 from application.models import FoodTruck, User, db
+from application.utils.json_fragments import jsonify_fragments
+from application.indexes import version_index, fragment_cache, truck_cache
+from application.utils.etag import truck_digest, truck_etag, collection_etag
 from sqlalchemy.exc import SQLAlchemyError
 from flask.views import MethodView
 from application.views.authentication import get_token_from_header, get_user_id_from_token
 
 
+def not_modified(etag):
+    """
+    Returns whether the If-None-Match condition of the request shows that the client
+    already has the current version of the requested resource
+
+    Parameters:
+        etag (str): current entity tag of the resource
+
+    Returns:
+        bool: whether the resource can be answered with 304 Not Modified
+    """
+    return bool(request.if_none_match) and request.if_none_match.contains_weak(etag)
+
+
+def make_conditional_response(response, etag):
+    """
+    Adds the ETag header of a resource to a response
+
+    Parameters:
+        response (object): Flask response
+        etag (str): entity tag of the resource
+
+    Returns:
+        object: the response
+    """
+    response.set_etag(etag)
+    return response
+
+
 class FoodTrucksAPI(MethodView):
     """
     A class used to encapsulate the API for the /foodtrucks resource
@@ -29,6 +63,14 @@ class FoodTrucksAPI(MethodView):
         GET /foodtrucks endpoint returns all resources in collection /foodtrucks
         or a specific food truck if truck_id is specified.
 
+        With conditional requests enabled, responses include a strong ETag header, and
+        conditional requests with If-None-Match are answered with 304 Not Modified from
+        the in-memory version index if the resource has not changed, without querying
+        or serializing any truck. No Last-Modified header is sent, since the time of the
+        last write is not stored. With the truck cache
+        enabled, single trucks are read through a per-process cache instead of querying
+        them every time.
+
         Parameters:
             truck_id (int): id of truck to query
 
@@ -36,17 +78,38 @@ class FoodTrucksAPI(MethodView):
             str: JSON representation of all resources in /foodtrucks
         """
         try:
+            # answer conditional requests from the version of the resource if enabled
+            conditional = current_app.config['CONDITIONAL_GET_ENABLED']
+            if conditional:
+                if truck_id is None:
+                    etag = version_index.collection_version()
+                else:
+                    etag = version_index.truck_version(truck_id)
+                if etag is not None and not_modified(etag):
+                    return make_conditional_response(make_response('', 304), etag)
+
             # query all trucks in the database
             if truck_id is None:
                 trucks = FoodTruck.query.all()
-                return jsonify({'foodtrucks': [e.serialize() for e in trucks]})
+                response = jsonify_fragments({'foodtrucks': fragment_cache.fragments(trucks)})
+                if not conditional:
+                    return response
+                etag = collection_etag(len(trucks), reduce(xor, (truck_digest(e) for e in trucks), 0))
+                return make_conditional_response(response, etag)
             # query truck by id
             else:
-                truck = FoodTruck.query.filter_by(uuid=truck_id).first()
+                # read through the truck cache if it is enabled
+                if current_app.config['TRUCK_CACHE_ENABLED']:
+                    truck = truck_cache.get(truck_id)
+                else:
+                    truck = FoodTruck.query.filter_by(uuid=truck_id).first()
 
                 # return JSON representation if truck was found
                 if truck:
-                    return jsonify(truck.serialize())
+                    response = jsonify_fragments(fragment_cache.fragment(truck))
+                    if not conditional:
+                        return response
+                    return make_conditional_response(response, truck_etag(truck_digest(truck)))
                 # otherwise return empty dict
                 else:
                     return jsonify({})
@@ -226,7 +289,7 @@ class FoodTrucksAPI(MethodView):
             truck = FoodTruck.query.filter_by(uuid=truck_id).first()
             if truck:
                 if truck.user_id == user_id or User.is_admin(user_id):
-                    FoodTruck.query.filter_by(uuid=truck_id).delete()
+                    db.session.delete(truck)
                     db.session.commit()
                     current_app.logger.info('successfully deleted food truck entry id %d', truck_id)
                     return make_response(jsonify({'message': 'Entry deleted'}), 200)
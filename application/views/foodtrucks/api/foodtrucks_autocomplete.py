@@ -0,0 +1,51 @@
+from flask import request, jsonify, abort, make_response, Blueprint, current_app
+from application.indexes import autocomplete_index
+from sqlalchemy.exc import SQLAlchemyError
+from flask.views import MethodView
+
+
+class FoodTrucksAutocompleteAPI(MethodView):
+    """
+    A class used to encapsulate the API for the /foodtrucks/autocomplete resource
+
+    Methods
+    -------
+    get()
+        implements the GET /foodtrucks/autocomplete endpoint
+
+    """
+
+    def get(self):
+        """
+        GET /foodtrucks/autocomplete?<params> endpoint returns search suggestions for a
+        prefix: the names and the menu items of the resources in /foodtrucks with a word
+        starting with the prefix, ordered by decreasing number of resources.
+
+        Optionally, the request may include the maximum number of names and of items
+        to return.
+
+        Returns:
+            str: JSON representation of the suggested names and items, each with the
+                number of resources with the name or serving the item
+        """
+        prefix = request.args.get('prefix')
+        limit = request.args.get('limit', current_app.config['DEFAULT_AUTOCOMPLETE_LIMIT'])
+
+        # prefix must be defined
+        if not prefix or not prefix.strip():
+            abort(400, 'Missing parameter')
+
+        try:
+            limit = int(limit)
+            if not 1 <= limit <= current_app.config['MAX_AUTOCOMPLETE_LIMIT']:
+                abort(400, 'limit must be between 1 and {}'.format(current_app.config['MAX_AUTOCOMPLETE_LIMIT']))
+
+            # suggestions are served from the in-memory prefix indexes
+            names, items = autocomplete_index.complete(prefix, limit)
+            return jsonify({'names': [{'name': name, 'count': count} for name, count in names],
+                            'items': [{'item': item, 'count': count} for item, count in items]})
+        except ValueError:
+            abort(400, 'Invalid parameter type')
+        except SQLAlchemyError as e:
+            current_app.logger.error('error completing prefix %s: %s', prefix, e)
+            abort(500, 'Error retriving suggestions for prefix {}'.format(prefix))
@@ -0,0 +1,52 @@
+from flask import request, jsonify, abort, make_response, Blueprint, current_app
+from application.indexes import cluster_index
+from sqlalchemy.exc import SQLAlchemyError
+from flask.views import MethodView
+
+
+class FoodTrucksClustersAPI(MethodView):
+    """
+    A class used to encapsulate the API for the /foodtrucks/clusters resource
+
+    Methods
+    -------
+    get()
+        implements the GET /foodtrucks/clusters endpoint
+
+    """
+
+    def get(self):
+        """
+        GET /foodtrucks/clusters?<params> endpoint returns clusters of the resources in
+        /foodtrucks inside a rectangular viewport, for the zoom level of a web map.
+
+        The request must include the parameters sw_latitude and sw_longitude specifying the
+        south-west corner, and ne_latitude and ne_longitude specifying the north-east corner
+        of the viewport in decimal coordinates, and the zoom level of the map.
+
+        Returns:
+            str: JSON representation of the clusters inside the viewport, with the centroid,
+                the number of resources and a sample of resource ids of each cluster
+        """
+        # viewport corner and zoom arguments are required - 400 returned if any are not present
+        sw_latitude = request.args['sw_latitude']
+        sw_longitude = request.args['sw_longitude']
+        ne_latitude = request.args['ne_latitude']
+        ne_longitude = request.args['ne_longitude']
+        zoom = request.args['zoom']
+
+        try:
+            viewport = [float(e) for e in (sw_latitude, sw_longitude, ne_latitude, ne_longitude)]
+            zoom = int(zoom)
+            if zoom < 0:
+                abort(400, 'zoom must be a non-negative integer')
+
+            # query the precomputed clusters inside the viewport
+            clusters = cluster_index.query(*viewport, zoom=zoom)
+
+            return jsonify({'clusters': clusters})
+        except ValueError:
+            abort(400, 'Invalid parameter type')
+        except SQLAlchemyError as e:
+            current_app.logger.error('error building foodtrucks clusters: %s', e)
+            abort(500, 'Error retriving clusters inside viewport')
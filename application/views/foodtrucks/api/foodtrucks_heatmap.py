@@ -0,0 +1,51 @@
+from flask import request, jsonify, abort, make_response, Blueprint, current_app
+from application.models import FoodTruck
+from application.indexes import heatmap_index
+from sqlalchemy.exc import SQLAlchemyError
+from flask.views import MethodView
+
+
+class FoodTrucksHeatmapAPI(MethodView):
+    """
+    A class used to encapsulate the API for the /foodtrucks/heatmap resource
+
+    Methods
+    -------
+    get()
+        implements the GET /foodtrucks/heatmap endpoint
+
+    """
+
+    def get(self):
+        """
+        GET /foodtrucks/heatmap?<params> endpoint returns the density of the resources in
+        /foodtrucks as the number of resources in every occupied cell of a latitude/longitude
+        grid.
+
+        Optionally, the request may include the level of the grid resolution, from 0 for the
+        coarsest grid, and a substring to filter results by the food_items field.
+
+        Returns:
+            str: JSON representation of the grid cell size in decimal degrees and a list of
+                [latitude, longitude, count] triples of the south-west corner and the number
+                of resources of every occupied cell
+        """
+        # resolution level and item filter arguments are optional
+        level = request.args.get('level', 0)
+        item = request.args.get('item')
+
+        try:
+            level = int(level)
+
+            # ids of the trucks matching the item filter
+            accept = FoodTruck.matching_uuids(item=item) if item else None
+
+            # query the precomputed density grid
+            cells = heatmap_index.counts(level, accept)
+
+            return jsonify({'cell_size': heatmap_index.cell_sizes[level], 'cells': cells})
+        except ValueError:
+            abort(400, 'Invalid parameter type')
+        except SQLAlchemyError as e:
+            current_app.logger.error('error building foodtrucks heatmap: %s', e)
+            abort(500, 'Error retriving heatmap')
@@ -1,5 +1,7 @@
-from flask import request, jsonify, abort, make_response, Blueprint, current_app
+from flask import request, abort, make_response, Blueprint, current_app
 from application.models import FoodTruck, db
+from application.indexes import fragment_cache
+from application.utils.json_fragments import jsonify_fragments
 from sqlalchemy.exc import SQLAlchemyError
 from flask.views import MethodView
 
@@ -20,6 +22,10 @@ class FoodTrucksItemsAPI(MethodView):
         GET /foodtrucks/items/<needle> endpoint returns resources in /foodtrucks 
         filtered by content of food_items field
 
+        If the request includes the parameter fuzzy, resources where a word of the food_items
+        field is within a few typos of every word of needle are also returned, ranked by
+        similarity.
+
         Parameters:
             needle (str): substring that food_items field must contain (inferred from request URL)
 
@@ -31,10 +37,17 @@ class FoodTrucksItemsAPI(MethodView):
         if not needle:
             abort(400, 'Missing parameter')
         
+        # typo-tolerant search is optional
+        fuzzy = request.args.get('fuzzy', '').lower() in ('1', 'true')
+
         # query by trucks where needle is a case-insensitive substring of food_items
         try:
-            trucks = FoodTruck.query.filter(FoodTruck.food_items.ilike('%{}%'.format(needle)))
-            return jsonify({'foodtrucks': [e.serialize() for e in trucks]})
+            if fuzzy:
+                trucks = FoodTruck.get_food_trucks_by_similarity(item=needle)
+                return jsonify_fragments({'foodtrucks': fragment_cache.fragments(trucks)})
+
+            trucks = FoodTruck.query.filter(FoodTruck.contains_item(needle))
+            return jsonify_fragments({'foodtrucks': fragment_cache.fragments(trucks)})
         except SQLAlchemyError as e:
             current_app.logger.error('error searching for needle %s: %s', needle, e)
             abort(500, 'Error retriving resources by items {}'.format(needle))
\ No newline at end of file
@@ -1,7 +1,24 @@
-from flask import request, jsonify, abort, make_response, Blueprint, current_app
-from application.models import FoodTruck, db
+import math
+from flask import request, abort, make_response, Blueprint, current_app
+from application.models import FoodTruck, MenuItem, db
+from application.indexes import fragment_cache
+from application.utils.json_fragments import jsonify_fragments, extend_fragment
 from sqlalchemy.exc import SQLAlchemyError
 from flask.views import MethodView
+from application.utils.cursor import encode_cursor, decode_cursor
+
+
+def serialize_facets(counts):
+    """
+    Returns the JSON-serializable representation of menu item counts
+
+    Parameters:
+        counts (list): list of (menu item, count) tuples
+
+    Returns:
+        list: list of {'item', 'count'} dictionaries
+    """
+    return [{'item': item, 'count': count} for item, count in counts]
 
 
 class FoodTrucksLocationAPI(MethodView):
@@ -13,6 +30,9 @@ class FoodTrucksLocationAPI(MethodView):
     get()
         implements the GET /foodtrucks/location endpoint
 
+    query_within_radius(latitude, longitude, radius, name, item, fuzzy)
+        returns the response of a search within radius of a location
+
     """
 
     def get(self):
@@ -23,7 +43,26 @@ class FoodTrucksLocationAPI(MethodView):
         The request must include latitude and longitude parameters specifying the location 
         in decimal coordinates. Optionally, the request may also include the search radius
         im meters, a substring to filter results by the name field and a substring to filter 
-        results by the food_items field.
+        results by the food_items field. With the parameter fuzzy, the filters also match
+        names and food items with words within a few typos of the substrings.
+
+        If the request includes the parameter k, the k nearest resources are returned
+        instead, sorted by distance and including their distance in meters. The search
+        radius is then only applied if it is specified.
+
+        Otherwise, results can be paginated with the limit and cursor parameters. The
+        response then includes the cursor of the next page, which is null on the last page.
+
+        The parameter facets adds the number of matching trucks serving every menu item to
+        the response, counted over every matching truck rather than the returned page.
+        With facets=only, the response only includes the counts, and no truck is returned.
+
+        With the response cache enabled, the location is rounded to the center of a grid
+        cell, and the clients within a cell are served the cached response of its center.
+
+        For debugging, the parameter explain adds the plan chosen by the query planner for
+        the name and item filters to the response, which is null if the planner is not used,
+        such as for k nearest neighbour searches.
 
         Returns:
             str: JSON representation of all resources in /foodtrucks with radius distance of location,
@@ -35,21 +74,131 @@ class FoodTrucksLocationAPI(MethodView):
 
         # search radius argument is optional (default if not present)
         radius = request.args.get('radius')
-        if radius is None:
-            radius = current_app.config['DEFAULT_SEARCH_RADIUS']
 
         # name and item filter arguments are optional
         name = request.args.get('name')
         item = request.args.get('item')
+
+        # typo-tolerant name and item filters are optional
+        fuzzy = request.args.get('fuzzy', '').lower() in ('1', 'true')
+
+        # number of nearest neighbours is optional
+        k = request.args.get('k')
+
+        # menu item counts are only returned if requested, optionally without the trucks
+        facets = request.args.get('facets', '').lower()
+        counts_only = facets == 'only'
+        facets = counts_only or facets in ('1', 'true')
+
+        # query plan is only returned if requested
+        explain = request.args.get('explain', '').lower() in ('1', 'true')
         
         try:
-            # query trucks within radius of position
-            trucks = FoodTruck.get_food_trucks_within_radius(latitude, longitude, radius, name, item)
+            # coordinates must be finite and within range
+            latitude = float(latitude)
+            longitude = float(longitude)
+            if not (abs(latitude) <= 90 and abs(longitude) <= 180):
+                abort(400, 'latitude and longitude must be valid coordinates')
+
+            # serve the clients within a grid cell from the response cache if it is enabled
+            cache = None
+            if current_app.config['LOCATION_CACHE_ENABLED'] and not explain:
+                cache = current_app.extensions['location_cache']
+                latitude, longitude = cache.quantize(latitude, longitude)
+                key = cache.key(latitude, longitude, request.args)
+                ret = cache.get(key)
+                if ret is not None:
+                    return jsonify_fragments(ret)
+                generation = cache.generation
+
+            # query the k nearest trucks if k is specified
+            if k is not None:
+                k = int(k)
+                if k < 1:
+                    abort(400, 'k must be a positive integer')
+                trucks = FoodTruck.get_nearest_food_trucks(latitude, longitude, k, radius, name, item, fuzzy)
+                ret = {}
+                if facets:
+                    uuids = [e.uuid for e, __ in trucks]
+                    ret['facets'] = serialize_facets(MenuItem.count_trucks(uuids) if uuids else [])
+                if not counts_only:
+                    fragments = fragment_cache.fragments(e for e, __ in trucks)
+                    ret['foodtrucks'] = [extend_fragment(fragment, distance=dist)
+                                         for fragment, (__, dist) in zip(fragments, trucks)]
+
+                # only trucks nearer than the k-th nearest truck can change the response
+                if len(trucks) == k:
+                    reach = trucks[-1][1]
+                else:
+                    reach = float(radius) if radius is not None else math.inf
+            else:
+                if radius is None:
+                    radius = current_app.config['DEFAULT_SEARCH_RADIUS']
+                reach = float(radius)
 
-            return jsonify({'foodtrucks': [e.serialize() for e in trucks]})
+                if counts_only:
+                    # count the menu items of the matching trucks without querying the trucks
+                    counts = FoodTruck.get_item_counts_within_radius(latitude, longitude, radius, name, item, fuzzy)
+                    ret = {'facets': serialize_facets(counts)}
+                else:
+                    ret = self.query_within_radius(latitude, longitude, radius, name, item, fuzzy)
+                    if facets:
+                        counts = FoodTruck.get_item_counts_within_radius(latitude, longitude, radius,
+                                                                         name, item, fuzzy)
+                        ret['facets'] = serialize_facets(counts)
+
+            # k nearest neighbour searches are always driven by the location
+            if explain:
+                plan = None
+                if k is None:
+                    plan = FoodTruck.radius_query_plan(latitude, longitude, radius, name, item, fuzzy)
+                ret['plan'] = plan._asdict() if plan else None
+
+            if cache is not None:
+                cache.put(key, ret, latitude, longitude, reach, generation)
+            return jsonify_fragments(ret)
         except ValueError:
             abort(400, 'Invalid parameter type')
         except SQLAlchemyError as e:
             current_app.logger.error('error retriveing entries by location=(%d,%d), radius=%d: %s', 
                             latitude, longitude, radius, e)
-            abort(500, 'Error retriving resources near location ({},{})'.format(latitude, longitude))
\ No newline at end of file
+            abort(500, 'Error retriving resources near location ({},{})'.format(latitude, longitude))
+
+
+    def query_within_radius(self, latitude, longitude, radius, name, item, fuzzy):
+        """
+        Returns the trucks within radius distance of a location, paginated by the limit
+        and cursor request parameters if either is specified
+
+        Parameters:
+            latitude (float): latitude coordinate in decimal format
+            longitude (float): longitude coordinate in decimal format
+            radius (float): search radius in meters
+            name (str): substring that names must contain
+            item (str): substring that food_items must contain
+            fuzzy (bool): also match names and menu items within a few typos of name and item
+
+        Returns:
+            dict: JSON-serializable response
+        """
+        # paginate by (distance, uuid) keyset if limit or cursor is specified
+        limit = request.args.get('limit')
+        cursor = request.args.get('cursor')
+        if limit is None and cursor is None:
+            # query trucks within radius of position
+            trucks = FoodTruck.get_food_trucks_within_radius(latitude, longitude, radius, name, item, fuzzy)
+            return {'foodtrucks': fragment_cache.fragments(trucks)}
+
+        limit = int(limit) if limit is not None else current_app.config['DEFAULT_PAGE_SIZE']
+        if limit < 1:
+            abort(400, 'limit must be a positive integer')
+        after = decode_cursor(cursor, float, int) if cursor else None
+
+        # fetch one extra truck to determine whether there is a next page
+        trucks = FoodTruck.get_food_trucks_and_distances_within_radius(latitude, longitude, radius,
+                                                                        name, item, limit+1, after, fuzzy)
+        next_cursor = None
+        if len(trucks) > limit:
+            trucks = trucks[:limit]
+            next_cursor = encode_cursor(trucks[-1][1], trucks[-1][0].uuid)
+        return {'foodtrucks': fragment_cache.fragments(e for e, __ in trucks), 'next_cursor': next_cursor}
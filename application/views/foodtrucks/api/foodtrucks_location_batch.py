@@ -0,0 +1,81 @@
+from flask import request, abort, make_response, Blueprint, current_app
+from application.models import FoodTruck, db
+from application.indexes import fragment_cache
+from application.utils.json_fragments import jsonify_fragments
+from sqlalchemy.exc import SQLAlchemyError
+from flask.views import MethodView
+
+
+class FoodTrucksLocationBatchAPI(MethodView):
+    """
+    A class used to encapsulate the API for the /foodtrucks/location/batch resource
+
+    Methods
+    -------
+    post()
+        implements the POST /foodtrucks/location/batch endpoint
+
+    """
+
+    def post(self):
+        """
+        POST /foodtrucks/location/batch endpoint returns the resources in /foodtrucks within
+        a specified distance of each of several locations, evaluated together in one pass.
+
+        The request must include JSON data with a list of origins, each specifying the
+        location by latitude and longitude in decimal coordinates. Optionally, each origin
+        may also include the search radius in meters, a substring to filter results by the
+        name field and a substring to filter results by the food_items field, and fuzzy to
+        also match names and menu items within a few typos of the substrings.
+
+        Returns:
+            str: JSON representation of the resources within radius distance of each origin,
+                in the same format and order as GET /foodtrucks/location for that origin
+        """
+        # get the POST data
+        post_data = request.get_json()
+
+        # validate JSON request
+        if not post_data:
+            abort(400, 'Request must be JSON mimetype')
+        if not 'origins' in post_data or type(post_data['origins']) != list:
+            abort(400, "invalid or missing 'origins' field")
+        if len(post_data['origins']) > current_app.config['MAX_BATCH_ORIGINS']:
+            abort(400, "'origins' must contain at most {} elements".format(current_app.config['MAX_BATCH_ORIGINS']))
+
+        # validate and extract values of each origin
+        origins = []
+        for origin in post_data['origins']:
+            if type(origin) != dict:
+                abort(400, "invalid 'origins' element")
+            for key in ('latitude', 'longitude'):
+                if not key in origin or type(origin[key]) not in (int, float):
+                    abort(400, "invalid or missing '{}' field".format(key))
+            if type(origin.get('radius', 0)) not in (int, float):
+                abort(400, "invalid 'radius' field")
+            for key in ('name', 'item'):
+                if origin.get(key) is not None and type(origin[key]) != str:
+                    abort(400, "invalid '{}' field".format(key))
+            if type(origin.get('fuzzy', False)) != bool:
+                abort(400, "invalid 'fuzzy' field")
+
+            origins.append({'lat': origin['latitude'],
+                            'lon': origin['longitude'],
+                            'radius': origin.get('radius', current_app.config['DEFAULT_SEARCH_RADIUS']),
+                            'name': origin.get('name'),
+                            'item': origin.get('item'),
+                            'fuzzy': origin.get('fuzzy', False)})
+
+        try:
+            # query trucks within radius of every position
+            results = FoodTruck.get_food_trucks_within_radius_batch(origins)
+
+            # serialize every truck once, even if it is near several origins
+            unique = dict((e.uuid, e) for trucks in results for e in trucks)
+            serialized = dict(zip(unique, fragment_cache.fragments(unique.values())))
+
+            return jsonify_fragments({'results': [{'foodtrucks': [serialized[e.uuid] for e in trucks]}
+                                                  for trucks in results]})
+        except SQLAlchemyError as e:
+            current_app.logger.error('error retriveing entries for %d locations: %s', len(origins), e)
+            abort(500, 'Error retriving resources near locations')
@@ -0,0 +1,69 @@
+from flask import request, abort, make_response, Blueprint, current_app
+from application.models import FoodTruck, db
+from application.indexes import fragment_cache
+from application.utils.json_fragments import jsonify_fragments, extend_fragment
+from application.utils.polyline import decode_polyline
+from sqlalchemy.exc import SQLAlchemyError
+from flask.views import MethodView
+
+
+class FoodTrucksRouteAPI(MethodView):
+    """
+    A class used to encapsulate the API for the /foodtrucks/route resource
+
+    Methods
+    -------
+    get()
+        implements the GET /foodtrucks/route endpoint
+
+    """
+
+    def get(self):
+        """
+        GET /foodtrucks/route?<params> endpoint returns resources in /foodtrucks within a
+        specified distance of a route, such as the route of a courier.
+
+        The request must include the parameter polyline specifying the route in the encoded
+        polyline format used by the Google Maps APIs. Optionally, the request may also include
+        the corridor width in meters on each side of the route, a substring to filter results
+        by the name field and a substring to filter results by the food_items field.
+
+        Returns:
+            str: JSON representation of all resources in /foodtrucks within width distance of
+                the route, sorted by position along the route and including the position and
+                distance to the route in meters, filtered by those where the name and/or
+                food_items field contain needle substrings
+        """
+        # route argument is required - 400 returned if not present
+        polyline = request.args['polyline']
+
+        # corridor width argument is optional (default if not present)
+        width = request.args.get('width', current_app.config['DEFAULT_CORRIDOR_WIDTH'])
+
+        # name and item filter arguments are optional
+        name = request.args.get('name')
+        item = request.args.get('item')
+
+        try:
+            route = decode_polyline(polyline)
+            if not route:
+                abort(400, 'polyline must contain at least one coordinate')
+            if len(route) > current_app.config['MAX_ROUTE_POINTS']:
+                abort(400, 'polyline must contain at most {} coordinates'.format(current_app.config['MAX_ROUTE_POINTS']))
+            if any(abs(lat) > 90 or abs(lon) > 180 for lat, lon in route):
+                abort(400, 'polyline coordinates must be valid latitudes and longitudes')
+            width = float(width)
+            if width < 0:
+                abort(400, 'width must not be negative')
+
+            # query trucks along the route
+            trucks = FoodTruck.get_food_trucks_along_route(route, width, name, item)
+
+            fragments = fragment_cache.fragments(e for e, __, __ in trucks)
+            return jsonify_fragments({'foodtrucks': [extend_fragment(fragment, position=position, distance=dist)
+                                                     for fragment, (__, position, dist) in zip(fragments, trucks)]})
+        except ValueError:
+            abort(400, 'Invalid parameter type')
+        except SQLAlchemyError as e:
+            current_app.logger.error('error retriveing entries by route=%s, width=%s: %s', polyline, width, e)
+            abort(500, 'Error retriving resources along route')
@@ -0,0 +1,57 @@
+from flask import request, abort, make_response, Blueprint, current_app
+from application.models import FoodTruck, db
+from application.indexes import fragment_cache
+from application.utils.json_fragments import jsonify_fragments
+from sqlalchemy.exc import SQLAlchemyError
+from flask.views import MethodView
+
+
+class FoodTrucksViewportAPI(MethodView):
+    """
+    A class used to encapsulate the API for the /foodtrucks/viewport resource
+
+    Methods
+    -------
+    get()
+        implements the GET /foodtrucks/viewport endpoint
+
+    """
+
+    def get(self):
+        """
+        GET /foodtrucks/viewport?<params> endpoint returns resources in /foodtrucks inside
+        a rectangular viewport, such as the visible area of a map.
+
+        The request must include the parameters sw_latitude and sw_longitude specifying the
+        south-west corner, and ne_latitude and ne_longitude specifying the north-east corner
+        of the viewport in decimal coordinates. If the viewport crosses the antimeridian,
+        sw_longitude is greater than ne_longitude. Optionally, the request may also include
+        a substring to filter results by the name field and a substring to filter results
+        by the food_items field.
+
+        Returns:
+            str: JSON representation of all resources in /foodtrucks inside the viewport,
+                filtered by those where the name and/or food_items field contain needle substrings
+        """
+        # viewport corner arguments are required - 400 returned if any are not present
+        sw_latitude = request.args['sw_latitude']
+        sw_longitude = request.args['sw_longitude']
+        ne_latitude = request.args['ne_latitude']
+        ne_longitude = request.args['ne_longitude']
+
+        # name and item filter arguments are optional
+        name = request.args.get('name')
+        item = request.args.get('item')
+
+        try:
+            # query trucks inside the viewport
+            trucks = FoodTruck.get_food_trucks_within_box(sw_latitude, sw_longitude, ne_latitude, ne_longitude,
+                                                          name, item)
+
+            return jsonify_fragments({'foodtrucks': fragment_cache.fragments(trucks)})
+        except ValueError:
+            abort(400, 'Invalid parameter type')
+        except SQLAlchemyError as e:
+            current_app.logger.error('error retriveing entries by viewport=(%s,%s,%s,%s): %s',
+                            sw_latitude, sw_longitude, ne_latitude, ne_longitude, e)
+            abort(500, 'Error retriving resources inside viewport')
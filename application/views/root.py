@@ -1,5 +1,5 @@
 from flask import request, jsonify, abort, make_response, Blueprint, current_app
-from application.models import FoodTruck, db
+from application.indexes import metadata_index
 from sqlalchemy.exc import SQLAlchemyError
 from flask.views import MethodView
 
@@ -12,21 +12,17 @@ class RootAPI(MethodView):
             str: JSON string with resource meta data
         """
         try:
-            # create dict with metadata and return as JSON
-            entry_count = FoodTruck.query.count()
-            lat_min = db.session.query(db.func.min(FoodTruck.latitude)).scalar()
-            lat_max = db.session.query(db.func.max(FoodTruck.latitude)).scalar()
-            long_min = db.session.query(db.func.min(FoodTruck.longitude)).scalar()
-            long_max = db.session.query(db.func.max(FoodTruck.longitude)).scalar()
+            # serve the metadata from memory, which is computed by a single aggregate query
+            metadata = metadata_index.metadata()
             collection_meta =   {
                                     'foodtrucks': {
                                         'name':'foodtrucks',
-                                        'entries':entry_count,
+                                        'entries':metadata.entries,
                                         'geo_area':{
-                                            'min_latitude':lat_min,
-                                            'min_longitude':long_min,
-                                            'max_latitude':lat_max,
-                                            'max_longitude':long_max
+                                            'min_latitude':metadata.min_latitude,
+                                            'min_longitude':metadata.min_longitude,
+                                            'max_latitude':metadata.max_latitude,
+                                            'max_longitude':metadata.max_longitude
                                         }
                                     }
                                 }
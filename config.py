@@ -12,6 +12,33 @@ class Config(object):
     LOGGING_INTERVAL_HOURS = 2
     LOGGING_LOG_DURATION = 24
     DEFAULT_SEARCH_RADIUS = 500
+    DEFAULT_PAGE_SIZE = 50
+    MAX_BATCH_ORIGINS = 1000
+    DEFAULT_CORRIDOR_WIDTH = 100
+    MAX_ROUTE_POINTS = 1000
+    DEFAULT_AUTOCOMPLETE_LIMIT = 10
+    MAX_AUTOCOMPLETE_LIMIT = 100
+    SPATIAL_INDEX_ENABLED = False
+    SPATIAL_INDEX_CELL_SIZE = 0.005
+    INDEX_REFRESH_INTERVAL_SEC = 300
+    CLUSTER_MAX_ZOOM = 20
+    CLUSTER_CELL_PX = 64
+    CLUSTER_SAMPLE_SIZE = 3
+    HEATMAP_CELL_SIZES = [0.02, 0.01, 0.005, 0.0025]
+    ITEM_INDEX_ENABLED = False
+    NAME_INDEX_ENABLED = False
+    QUERY_PLANNER_ENABLED = False
+    FUZZY_MAX_EDITS = 2
+    LOCATION_CACHE_ENABLED = False
+    LOCATION_CACHE_GRID_SIZE = 0.0005
+    LOCATION_CACHE_MAX_SIZE = 1024
+    # bound on the staleness of cached location responses after writes by other processes
+    LOCATION_CACHE_TTL_SEC = 60
+    FRAGMENT_CACHE_MAX_SIZE = 10000
+    TRUCK_CACHE_ENABLED = False
+    TRUCK_CACHE_MAX_SIZE = 1000
+    TRUCK_CACHE_TTL_SEC = 60
+    CONDITIONAL_GET_ENABLED = False
     BCRYPT_LOG_ROUNDS = 12
     AUTH_TOKEN_EXP_TIME_SEC = 60
 
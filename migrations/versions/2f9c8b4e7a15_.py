@@ -0,0 +1,30 @@
+"""add trigram index of sf_food_trucks names
+
+Revision ID: 2f9c8b4e7a15
+Revises: 8d5f3a6e2b71
+Create Date: 2026-10-17 13:41:08.774120
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2f9c8b4e7a15'
+down_revision = '8d5f3a6e2b71'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # trigram indexes are only supported by PostgreSQL, other backends use the in-memory names index
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_sf_food_trucks_name_trgm', 'sf_food_trucks', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_sf_food_trucks_name_trgm', table_name='sf_food_trucks')
@@ -0,0 +1,79 @@
+"""add geohash column to sf_food_trucks
+
+Revision ID: 4b7e2c1d9a3f
+Revises: 971aa2d02bfd
+Create Date: 2026-10-17 10:12:41.218305
+
+"""
+import math
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2c1d9a3f'
+down_revision = '971aa2d02bfd'
+branch_labels = None
+depends_on = None
+
+
+# copy of application.utils.geohash.encode at this revision, so that the backfill
+# does not change with the application code
+GEOHASH_PRECISION = 12
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def _cell_index(value, min_value, max_value, bits):
+    cells = 1 << bits
+    index = int(math.floor((value - min_value) / (max_value - min_value) * cells))
+    return max(0, min(index, cells - 1))
+
+
+def encode(lat, lon, precision=GEOHASH_PRECISION):
+    lon_bits, lat_bits = ((5 * precision + 1) // 2, 5 * precision // 2)
+    col = _cell_index(lon, -180, 180, lon_bits)
+    row = _cell_index(lat, -90, 90, lat_bits)
+
+    # interleave the bits of the column and row, starting with the longitude
+    code = 0
+    for i in range(lon_bits + lat_bits):
+        if i % 2 == 0:
+            lon_bits -= 1
+            bit = (col >> lon_bits) & 1
+        else:
+            lat_bits -= 1
+            bit = (row >> lat_bits) & 1
+        code = (code << 1) | bit
+
+    chars = []
+    for __ in range(precision):
+        chars.append(BASE32[code & 31])
+        code >>= 5
+    return ''.join(reversed(chars))
+
+
+def upgrade():
+    op.add_column('sf_food_trucks', sa.Column('geohash', sa.String(length=GEOHASH_PRECISION), nullable=True))
+
+    # backfill the geohash of existing trucks
+    sf_food_trucks = sa.table('sf_food_trucks',
+                              sa.column('uuid', sa.Integer),
+                              sa.column('latitude', sa.Float),
+                              sa.column('longitude', sa.Float),
+                              sa.column('geohash', sa.String))
+    connection = op.get_bind()
+    rows = connection.execute(sa.select([sf_food_trucks.c.uuid, sf_food_trucks.c.latitude,
+                                         sf_food_trucks.c.longitude])).fetchall()
+    for uuid, latitude, longitude in rows:
+        if latitude is None or longitude is None:
+            continue
+        connection.execute(sf_food_trucks.update()
+                           .where(sf_food_trucks.c.uuid == uuid)
+                           .values(geohash=encode(latitude, longitude)))
+
+    op.create_index(op.f('ix_sf_food_trucks_geohash'), 'sf_food_trucks', ['geohash'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_sf_food_trucks_geohash'), table_name='sf_food_trucks')
+    op.drop_column('sf_food_trucks', 'geohash')
@@ -0,0 +1,54 @@
+"""add unit vector columns to sf_food_trucks
+
+Revision ID: 8d5f3a6e2b71
+Revises: 4b7e2c1d9a3f
+Create Date: 2026-10-17 11:03:27.541962
+
+"""
+import math
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d5f3a6e2b71'
+down_revision = '4b7e2c1d9a3f'
+branch_labels = None
+depends_on = None
+
+
+def unit_vector(lat, lon):
+    # copy of application.utils.haversine.unit_vector at this revision
+    lat, lon = math.radians(lat), math.radians(lon)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def upgrade():
+    op.add_column('sf_food_trucks', sa.Column('unit_x', sa.Float(), nullable=True))
+    op.add_column('sf_food_trucks', sa.Column('unit_y', sa.Float(), nullable=True))
+    op.add_column('sf_food_trucks', sa.Column('unit_z', sa.Float(), nullable=True))
+
+    # backfill the unit vector of existing trucks
+    sf_food_trucks = sa.table('sf_food_trucks',
+                              sa.column('uuid', sa.Integer),
+                              sa.column('latitude', sa.Float),
+                              sa.column('longitude', sa.Float),
+                              sa.column('unit_x', sa.Float),
+                              sa.column('unit_y', sa.Float),
+                              sa.column('unit_z', sa.Float))
+    connection = op.get_bind()
+    rows = connection.execute(sa.select([sf_food_trucks.c.uuid, sf_food_trucks.c.latitude,
+                                         sf_food_trucks.c.longitude])).fetchall()
+    for uuid, latitude, longitude in rows:
+        if latitude is None or longitude is None:
+            continue
+        x, y, z = unit_vector(latitude, longitude)
+        connection.execute(sf_food_trucks.update()
+                           .where(sf_food_trucks.c.uuid == uuid)
+                           .values(unit_x=x, unit_y=y, unit_z=z))
+
+
+def downgrade():
+    op.drop_column('sf_food_trucks', 'unit_z')
+    op.drop_column('sf_food_trucks', 'unit_y')
+    op.drop_column('sf_food_trucks', 'unit_x')
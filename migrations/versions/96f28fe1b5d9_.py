@@ -0,0 +1,43 @@
+"""add suffixes of menu items for indexed substring searches
+
+Revision ID: 96f28fe1b5d9
+Revises: a7c3e9f1b2d4
+Create Date: 2026-10-17 18:04:31.529817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '96f28fe1b5d9'
+down_revision = 'a7c3e9f1b2d4'
+branch_labels = None
+depends_on = None
+
+
+def menu_item_suffixes(item):
+    # copy of application.utils.menu.menu_item_suffixes at this revision
+    return sorted(set(item[i:] for i in range(len(item)) if not item[i].isspace()))
+
+
+def upgrade():
+    item_suffixes = op.create_table('item_suffixes',
+    sa.Column('suffix', sa.String().with_variant(sa.String(collation='C'), 'postgresql'), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('suffix', 'item_id')
+    )
+
+    # backfill the suffixes of the existing menu items
+    items = sa.table('items',
+                     sa.column('id', sa.Integer),
+                     sa.column('name', sa.String))
+    rows = op.get_bind().execute(sa.select([items.c.id, items.c.name])).fetchall()
+    suffixes = [{'suffix': suffix, 'item_id': id} for id, name in rows for suffix in menu_item_suffixes(name)]
+    if suffixes:
+        op.bulk_insert(item_suffixes, suffixes)
+
+
+def downgrade():
+    op.drop_table('item_suffixes')
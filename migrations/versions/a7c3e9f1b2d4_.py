@@ -0,0 +1,66 @@
+"""add normalized menu items and food truck association tables
+
+Revision ID: a7c3e9f1b2d4
+Revises: 2f9c8b4e7a15
+Create Date: 2026-10-17 15:22:53.106317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e9f1b2d4'
+down_revision = '2f9c8b4e7a15'
+branch_labels = None
+depends_on = None
+
+
+def parse_menu_items(food_items):
+    # copy of application.utils.menu.parse_menu_items at this revision
+    items = []
+    for item in (food_items or '').split(':'):
+        item = ' '.join(item.lower().split())
+        if item and item not in items:
+            items.append(item)
+    return items
+
+
+def upgrade():
+    items = op.create_table('items',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    food_truck_items = op.create_table('food_truck_items',
+    sa.Column('truck_id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['truck_id'], ['sf_food_trucks.uuid'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('truck_id', 'item_id')
+    )
+    op.create_index(op.f('ix_food_truck_items_item_id'), 'food_truck_items', ['item_id'], unique=False)
+
+    # backfill the menu items of existing trucks from their food_items strings
+    sf_food_trucks = sa.table('sf_food_trucks',
+                              sa.column('uuid', sa.Integer),
+                              sa.column('food_items', sa.String))
+    connection = op.get_bind()
+    rows = connection.execute(sa.select([sf_food_trucks.c.uuid, sf_food_trucks.c.food_items])).fetchall()
+    menus = [(uuid, parse_menu_items(food_items)) for uuid, food_items in rows]
+
+    names = sorted(set(name for __, menu in menus for name in menu))
+    if names:
+        op.bulk_insert(items, [{'name': name} for name in names])
+    ids = dict((name, id) for id, name in connection.execute(sa.select([items.c.id, items.c.name])))
+
+    associations = [{'truck_id': uuid, 'item_id': ids[name]} for uuid, menu in menus for name in menu]
+    if associations:
+        op.bulk_insert(food_truck_items, associations)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_food_truck_items_item_id'), table_name='food_truck_items')
+    op.drop_table('food_truck_items')
+    op.drop_table('items')
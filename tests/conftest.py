@@ -1,6 +1,6 @@
 import pytest
 from application import create_app
-from application.models import FoodTruck, User, db
+from application.models import FoodTruck, User, db, invalidate_write_listeners
 from test_data import test_data, test_users
 import json
 from graphene.test import Client
@@ -29,6 +29,9 @@ def create_db(app):
         db.session.close()
         db.drop_all()
 
+        # dropping the tables bypasses the ORM, so in-memory state must be discarded
+        invalidate_write_listeners()
+
 
 @pytest.fixture()
 def client(app):
@@ -96,4 +99,53 @@ def graphql_client():
     """
     A test fixture for creating a GraphQL test client
     """
-    return Client(schema)
\ No newline at end of file
+    return Client(schema)
+
+@pytest.fixture()
+def spatial_index_enabled(app):
+    """
+    A test fixture for enabling the in-memory spatial index for a single test case
+    """
+    app.config['SPATIAL_INDEX_ENABLED'] = True
+    yield
+    app.config['SPATIAL_INDEX_ENABLED'] = False
+
+
+@pytest.fixture()
+def item_index_enabled(app):
+    """
+    A test fixture for enabling the in-memory items index for a single test case
+    """
+    app.config['ITEM_INDEX_ENABLED'] = True
+    yield
+    app.config['ITEM_INDEX_ENABLED'] = False
+
+
+@pytest.fixture()
+def location_cache_enabled(app):
+    """
+    A test fixture for enabling the location response cache for a single test case
+    """
+    app.config['LOCATION_CACHE_ENABLED'] = True
+    yield
+    app.config['LOCATION_CACHE_ENABLED'] = False
+
+
+@pytest.fixture()
+def truck_cache_enabled(app):
+    """
+    A test fixture for enabling the read-through truck cache for a single test case
+    """
+    app.config['TRUCK_CACHE_ENABLED'] = True
+    yield
+    app.config['TRUCK_CACHE_ENABLED'] = False
+
+
+@pytest.fixture()
+def conditional_get_enabled(app):
+    """
+    A test fixture for enabling conditional GET requests for a single test case
+    """
+    app.config['CONDITIONAL_GET_ENABLED'] = True
+    yield
+    app.config['CONDITIONAL_GET_ENABLED'] = False
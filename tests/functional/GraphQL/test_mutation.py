@@ -127,6 +127,7 @@ class TestMutation():
         assert truck.days_hours == truck_data['days_hours']
         assert truck.food_items == truck_data['food_items']
         assert truck.user_id == 2
+        assert [e.name for e in truck.items] == [truck_data['food_items']]
 
 
     def test_delete_food_truck(self, graphql_client, token):
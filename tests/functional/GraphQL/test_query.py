@@ -1,5 +1,5 @@
 import pytest
-from application.models import FoodTruck
+from application.models import FoodTruck, MenuItem
 from test_data import test_data, test_name, test_item, test_location, test_radius
 
 
@@ -53,3 +53,24 @@ class TestQuery():
                                             }''')
         data = executed['data']['allFoodTrucks']['edges']
         assert len(data) == len(test_data)
+
+
+    def test_query_items(self, graphql_client):
+        """
+        Test a query for the normalized menu items of the trucks
+
+        1. Send query to /graphql endpoint
+        2. Verify that the menu items of every truck match its food_items field
+        """
+        executed = graphql_client.execute('''{
+                                                allFoodTrucks {
+                                                    edges {
+                                                        node { uuid, foodItems, items { name } }
+                                                    }
+                                                }
+                                            }''')
+        data = executed['data']['allFoodTrucks']['edges']
+        assert len(data) == len(test_data)
+        for e in data:
+            node = e['node']
+            assert sorted(item['name'] for item in node['items']) == sorted(MenuItem.parse(node['foodItems']))
@@ -46,4 +46,131 @@ class TestDelete():
         uuid = len(test_data)+1
         headers = {'Authorization': 'Bearer ' + token}
         ret = client.delete('/foodtrucks/{}'.format(uuid), headers=headers)
-        assert ret.status_code == 200
\ No newline at end of file
+        assert ret.status_code == 200
+
+
+    @pytest.mark.usefixtures('spatial_index_enabled')
+    def test_delete_truck_spatial_index(self, client, token):
+        """
+        Test that a deleted FoodTruck is removed from the in-memory spatial index.
+
+        1. Send GET request to foodtrucks/location/<params> to build the index
+        2. Send DELETE request to foodtruck with specific id
+        3. Send GET request to foodtrucks/location/<params> again
+        4. Verify that the deleted truck is no longer returned
+        """
+        uuid = 5
+        lat = test_location[0]
+        lon = test_location[1]
+        url = '/foodtrucks/location?longitude={}&latitude={}'.format(lon, lat)
+        assert uuid in [e['uuid'] for e in client.get(url).get_json()['foodtrucks']]
+
+        headers = {'Authorization': 'Bearer ' + token}
+        ret = client.delete('/foodtrucks/{}'.format(uuid), headers=headers)
+        assert ret.status_code == 200
+
+        assert uuid not in [e['uuid'] for e in client.get(url).get_json()['foodtrucks']]
+
+
+    def test_delete_truck_heatmap(self, client, token):
+        """
+        Test that a deleted FoodTruck is removed from the density heatmap.
+
+        1. Send GET request to foodtrucks/heatmap to build the density grid
+        2. Send DELETE request to foodtruck with specific id
+        3. Send GET request to foodtrucks/heatmap again
+        4. Verify that the cell counts add up to one truck less
+        """
+        ret = client.get('/foodtrucks/heatmap')
+        count = sum(count for __, __, count in ret.get_json()['cells'])
+
+        headers = {'Authorization': 'Bearer ' + token}
+        ret = client.delete('/foodtrucks/{}'.format(6), headers=headers)
+        assert ret.status_code == 200
+
+        ret = client.get('/foodtrucks/heatmap')
+        assert sum(count for __, __, count in ret.get_json()['cells']) == count - 1
+
+
+    def test_delete_truck_autocomplete(self, client, token):
+        """
+        Test that a deleted FoodTruck is removed from the search suggestions.
+
+        1. Send GET request to foodtrucks/autocomplete to build the prefix indexes
+        2. Send DELETE request to foodtruck with specific id
+        3. Send GET request to foodtrucks/autocomplete again
+        4. Verify that the name of the deleted truck is counted once less
+        """
+        uuid = 7
+        name = test_data[uuid-1]['name']
+        url = '/foodtrucks/autocomplete?prefix={}'.format(name)
+        ret = client.get(url)
+        count = dict((e['name'], e['count']) for e in ret.get_json()['names'])[name]
+
+        headers = {'Authorization': 'Bearer ' + token}
+        ret = client.delete('/foodtrucks/{}'.format(uuid), headers=headers)
+        assert ret.status_code == 200
+
+        ret = client.get(url)
+        assert dict((e['name'], e['count']) for e in ret.get_json()['names']).get(name, 0) == count - 1
+
+
+    @pytest.mark.usefixtures('location_cache_enabled')
+    def test_delete_truck_location_cache(self, client, token):
+        """
+        Test that a deleted FoodTruck is removed from the cached location responses.
+
+        1. Send GET request to foodtrucks/location/<params> to cache the response
+        2. Send DELETE request to foodtruck with specific id
+        3. Send GET request to foodtrucks/location/<params> again
+        4. Verify that the deleted truck is no longer returned
+        """
+        uuid = 8
+        lat = test_location[0]
+        lon = test_location[1]
+        url = '/foodtrucks/location?longitude={}&latitude={}'.format(lon, lat)
+        assert uuid in [e['uuid'] for e in client.get(url).get_json()['foodtrucks']]
+
+        headers = {'Authorization': 'Bearer ' + token}
+        ret = client.delete('/foodtrucks/{}'.format(uuid), headers=headers)
+        assert ret.status_code == 200
+
+        assert uuid not in [e['uuid'] for e in client.get(url).get_json()['foodtrucks']]
+
+
+    def test_delete_truck_metadata(self, client, token):
+        """
+        Test that a deleted FoodTruck is removed from the collection metadata.
+
+        1. Send GET request to the application root to compute the metadata
+        2. Send DELETE request to foodtruck with specific id
+        3. Send GET request to the application root again
+        4. Verify that the truck is no longer counted
+        """
+        entries = client.get('/').get_json()['foodtrucks']['entries']
+
+        headers = {'Authorization': 'Bearer ' + token}
+        ret = client.delete('/foodtrucks/{}'.format(9), headers=headers)
+        assert ret.status_code == 200
+
+        assert client.get('/').get_json()['foodtrucks']['entries'] == entries - 1
+
+
+    @pytest.mark.usefixtures('truck_cache_enabled')
+    def test_delete_truck_cache(self, client, token):
+        """
+        Test that a deleted FoodTruck is discarded from the truck cache.
+
+        1. Send GET request to foodtrucks/<id> to cache the truck
+        2. Send DELETE request to foodtruck with specific id
+        3. Verify that GET request to foodtrucks/<id> no longer returns the truck
+        """
+        uuid = 10
+        url = '/foodtrucks/{}'.format(uuid)
+        assert client.get(url).get_json()['uuid'] == uuid
+
+        headers = {'Authorization': 'Bearer ' + token}
+        ret = client.delete(url, headers=headers)
+        assert ret.status_code == 200
+
+        assert client.get(url).get_json() == {}
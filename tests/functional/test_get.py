@@ -1,5 +1,9 @@
 import pytest
+from collections import Counter
 from application.models import FoodTruck
+from application.utils.haversine import haversine
+from application.utils.polyline import encode_polyline, segment_distance
+from application.utils.menu import parse_menu_items
 from test_data import test_data, test_name, test_item, test_location, test_radius
 
 
@@ -114,17 +118,27 @@ class TestGet():
     3. Populate database with predefined elements
     """
 
-    def test_get_root(self, client):
+    def test_get_root(self, client, monkeypatch):
         """
         Test the GET request to the application root endpoint
 
         1. Send GET request to application root
         2. Verify the status code as successful
         3. Verify the metadata against the predefined database elements
+        4. Verify that repeated requests are served without querying the database
         """
         ret = client.get('/')
         assert ret.status_code == 200
         assert ret.get_json()['foodtrucks']['entries'] == len(test_data)
+        assert ret.get_json()['foodtrucks']['geo_area'] == {
+            'min_latitude': min(e['latitude'] for e in test_data),
+            'min_longitude': min(e['longitude'] for e in test_data),
+            'max_latitude': max(e['latitude'] for e in test_data),
+            'max_longitude': max(e['longitude'] for e in test_data)}
+
+        with monkeypatch.context() as m:
+            m.setattr(FoodTruck, 'get_collection_metadata', None)
+            assert client.get('/').get_json() == ret.get_json()
 
 
     def test_get_all(self, client):
@@ -164,6 +178,80 @@ class TestGet():
             assert data['food_items'] == e['food_items']
 
 
+    @pytest.mark.usefixtures('truck_cache_enabled')
+    def test_get_truck_by_id_cache(self, app, client, monkeypatch):
+        """
+        Test the GET request to foodtrucks with specific id with the truck cache enabled
+
+        1. Send GET request to foodtrucks/<id> with the truck cache disabled and enabled
+        2. Verify that the same truck is returned, counting a cache miss
+        3. Send the request again with the database queries disabled
+        4. Verify that the same truck is returned, counting a cache hit
+        """
+        truck_cache = app.extensions['truck_cache']
+        url = '/foodtrucks/{}'.format(4)
+        app.config['TRUCK_CACHE_ENABLED'] = False
+        data = client.get(url).get_json()
+        app.config['TRUCK_CACHE_ENABLED'] = True
+
+        stats = truck_cache.stats()
+        assert client.get(url).get_json() == data
+        assert truck_cache.stats()['misses'] == stats['misses'] + 1
+
+        with monkeypatch.context() as m:
+            m.setattr('application.indexes.trucks.fetch_truck_record', None)
+            assert client.get(url).get_json() == data
+        assert truck_cache.stats()['hits'] == stats['hits'] + 1
+        assert truck_cache.stats()['size'] >= 1
+
+        assert client.get('/foodtrucks/{}'.format(len(test_data)+1)).get_json() == {}
+
+    @pytest.mark.usefixtures('conditional_get_enabled')
+    def test_get_conditional(self, client, monkeypatch):
+        """
+        Test conditional GET requests to foodtrucks root endpoint and foodtrucks with specific id
+
+        1. Send GET request to foodtrucks and foodtrucks/<id>
+        2. Verify that the responses include an ETag header, but no Last-Modified header
+        3. Send the requests again with If-None-Match, with the database queries disabled
+        4. Verify the status codes as not modified, without a body
+        5. Verify that a different entity tag or only If-Modified-Since returns the resource
+        """
+        for url in ['/foodtrucks', '/foodtrucks/2']:
+            ret = client.get(url)
+            assert ret.status_code == 200
+            etag = ret.headers['ETag']
+            assert etag.startswith('"')
+            assert 'Last-Modified' not in ret.headers
+
+            with monkeypatch.context() as m:
+                m.setattr(FoodTruck, 'query', None)
+                for headers in [{'If-None-Match': etag}, {'If-None-Match': 'W/' + etag}]:
+                    ret = client.get(url, headers=headers)
+                    assert ret.status_code == 304
+                    assert ret.data == b''
+                    assert ret.headers['ETag'] == etag
+
+            for headers in [{'If-None-Match': '"0"'}, {'If-Modified-Since': 'Sat, 01 Jan 2050 00:00:00 GMT'}]:
+                ret = client.get(url, headers=headers)
+                assert ret.status_code == 200
+                assert ret.headers['ETag'] == etag
+
+    def test_get_conditional_disabled(self, client):
+        """
+        Test that conditional GET requests are ignored unless they are enabled
+
+        1. Send GET request to foodtrucks and foodtrucks/<id>, with and without If-None-Match
+        2. Verify the status codes as successful, without ETag and Last-Modified headers
+        """
+        for url in ['/foodtrucks', '/foodtrucks/2']:
+            for headers in [{}, {'If-None-Match': '*'}]:
+                ret = client.get(url, headers=headers)
+                assert ret.status_code == 200
+                assert ret.get_json()
+                assert 'ETag' not in ret.headers
+                assert 'Last-Modified' not in ret.headers
+
     def test_get_truck_by_id_not_found(self, client):
         """
         Test the GET request to foodtrucks with nonexisting id
@@ -223,6 +311,67 @@ class TestGet():
             assert name in e['name'].upper()
 
 
+    def test_get_truck_by_name_index(self, app, client):
+        """
+        Test the GET request to foodtrucks searched by name with the in-memory names
+        index enabled
+
+        1. Send GET request to foodtrucks/name/<needle> for different needles with the
+            index disabled and enabled
+        2. Verify the status codes as successful
+        3. Verify that the same response is returned in both cases
+        """
+        needles = [test_name[0], test_name[0].upper(), test_name[0][1:4], 'li', 'nothing', '_']
+        for needle in needles:
+            results = []
+            for enabled in (False, True):
+                app.config['NAME_INDEX_ENABLED'] = enabled
+                try:
+                    ret = client.get('/foodtrucks/name/{}'.format(needle))
+                finally:
+                    app.config['NAME_INDEX_ENABLED'] = False
+                assert ret.status_code == 200
+                results.append(ret.get_json())
+            assert results[0] == results[1]
+        assert len(results[0]['foodtrucks']) == len(test_data)
+
+
+    def test_get_truck_by_name_and_item_fuzzy(self, client):
+        """
+        Test the GET request to foodtrucks searched by misspelled name and food items
+
+        1. Send GET request to foodtrucks/name/<needle> and foodtrucks/items/<needle> with
+            misspelled needles and without and with fuzzy
+        2. Verify the status codes as successful
+        3. Verify that no elements are returned without fuzzy
+        4. Verify that the intended elements are returned with fuzzy
+        5. Verify that exact substring matches are ranked first
+        """
+        ret = client.get('/foodtrucks/name/{}'.format('Laing Bai'))
+        assert ret.status_code == 200
+        assert len(ret.get_json()['foodtrucks']) == 0
+
+        ret = client.get('/foodtrucks/name/{}?fuzzy=true'.format('Laing Bai'))
+        assert ret.status_code == 200
+        data = ret.get_json()['foodtrucks']
+        assert sorted(e['uuid'] for e in data) == sorted(test_name[2])
+
+        ret = client.get('/foodtrucks/items/{}'.format('sandwishes'))
+        assert len(ret.get_json()['foodtrucks']) == 0
+
+        ret = client.get('/foodtrucks/items/{}?fuzzy=1'.format('sandwishes'))
+        assert ret.status_code == 200
+        data = ret.get_json()['foodtrucks']
+        assert sorted(e['uuid'] for e in data) == sorted(test_item[2])
+
+        # trucks containing the needle come before the trucks with a similar word
+        ret = client.get('/foodtrucks/items/{}?fuzzy=1'.format('rice'))
+        data = ret.get_json()['foodtrucks']
+        exact = ['rice' in e['food_items'].lower() for e in data]
+        assert any(exact) and not all(exact)
+        assert exact == sorted(exact, reverse=True)
+
+
     def test_get_truck_by_item_lowercase(self, client):
         """
         Test the GET request to foodtrucks searched by lowercase food items
@@ -267,6 +416,49 @@ class TestGet():
             assert item in e['food_items'].upper()
 
 
+    def test_get_truck_by_item_substrings(self, client):
+        """
+        Test the GET request to foodtrucks searched by substrings of food items, within
+        and across the normalized menu items
+
+        1. Send GET request to foodtrucks/items/<needle> for different needles
+        2. Verify the status codes as successful
+        3. Verify that exactly the trucks with food_items containing the needle are returned
+        """
+        needles = ['andwich', 'SODA', 'water & canned', 'cold truck', 'd', 'soda: water', ' sandwiches',
+                   'snacks:  candy', 'nothing']
+        for needle in needles:
+            ret = client.get('/foodtrucks/items/{}'.format(needle))
+            assert ret.status_code == 200
+            expected = [i+1 for i, e in enumerate(test_data) if needle.lower() in e['food_items'].lower()]
+            assert sorted(e['uuid'] for e in ret.get_json()['foodtrucks']) == expected
+
+
+    def test_get_truck_by_item_index(self, app, client):
+        """
+        Test the GET request to foodtrucks searched by food items with the in-memory
+        items index enabled
+
+        1. Send GET request to foodtrucks/items/<needle> for different needles with the
+            index disabled and enabled
+        2. Verify the status codes as successful
+        3. Verify that the same elements are returned in both cases
+        """
+        needles = [test_item[0], test_item[0].upper(), 'andwich', 'hot and cold', 'water & canned', 'nothing', '%']
+        for needle in needles:
+            results = []
+            for enabled in (False, True):
+                app.config['ITEM_INDEX_ENABLED'] = enabled
+                try:
+                    ret = client.get('/foodtrucks/items/{}'.format(needle))
+                finally:
+                    app.config['ITEM_INDEX_ENABLED'] = False
+                assert ret.status_code == 200
+                results.append(sorted(e['uuid'] for e in ret.get_json()['foodtrucks']))
+            assert results[0] == results[1]
+        assert len(results[0]) == len(test_data)
+
+
     def test_get_truck_by_location(self, client):
         """
         Test the GET request to foodtrucks nearby location
@@ -365,4 +557,544 @@ class TestGet():
 
         # verify that the correct trucks are returned, in the correct order
         for i, e in enumerate(data):
-            assert test_item[2][i] == e['uuid']
\ No newline at end of file
+            assert test_item[2][i] == e['uuid']
+
+
+    @pytest.mark.usefixtures('item_index_enabled')
+    def test_get_truck_by_location_and_item_index(self, client):
+        """
+        Test the GET request to foodtrucks nearby location filtered by an item search,
+        with the in-memory items index enabled
+
+        1. Send GET request to foodtrucks/location/<params> with a predefined test location
+            and item search needle
+        2. Verify the status code as successful
+        3. Verify that the correct trucks are returned, in the correct order
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+        item = test_item[0]
+
+        ret = client.get('/foodtrucks/location?longitude={}&latitude={}&item={}'.format(lon,lat,item))
+        assert ret.status_code == 200
+        data = ret.get_json()['foodtrucks']
+        assert [e['uuid'] for e in data] == test_item[2]
+
+
+    def test_get_truck_by_location_fuzzy(self, app, client):
+        """
+        Test the GET request to foodtrucks nearby location filtered by misspelled name
+        and item searches
+
+        1. Send GET request to foodtrucks/location/<params> with a misspelled item
+            search needle, without and with fuzzy
+        2. Verify the status codes as successful
+        3. Verify that the fuzzy search returns the trucks of the correctly spelled search,
+            in the same order
+        4. Repeat with the k nearest trucks, pagination and the in-memory spatial index
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+        url = '/foodtrucks/location?longitude={}&latitude={}'.format(lon, lat)
+        for params in ('', '&k=3', '&limit=3'):
+            for enabled in (False, True):
+                app.config['SPATIAL_INDEX_ENABLED'] = enabled
+                try:
+                    expected = client.get(url + params + '&item={}'.format(test_item[0])).get_json()
+                    ret = client.get(url + params + '&item=sandwishes')
+                    assert ret.status_code == 200
+                    assert len(ret.get_json()['foodtrucks']) == 0
+
+                    ret = client.get(url + params + '&item=sandwishes&fuzzy=true')
+                    assert ret.status_code == 200
+                    assert ret.get_json() == expected
+
+                    expected = client.get(url + params + '&item={}&name={}'.format(test_item[0], test_name[0])).get_json()
+                    ret = client.get(url + params + '&item=sandwishes&name=Laing&fuzzy=true')
+                    assert ret.status_code == 200
+                    assert ret.get_json() == expected
+                finally:
+                    app.config['SPATIAL_INDEX_ENABLED'] = False
+
+
+    def test_get_truck_by_location_query_planner(self, app, client, monkeypatch):
+        """
+        Test the GET request to foodtrucks nearby location filtered by name and item
+        searches with the query planner enabled
+
+        1. Send GET request to foodtrucks/location/<params> with name and item search
+            needles, with the query planner disabled and enabled
+        2. Verify the status codes as successful
+        3. Verify that the same trucks are returned in the same order
+        4. Verify that the chosen plan is only returned with explain
+        5. Verify that disabled name and item indexes are not used to estimate the filters
+        6. Verify that a rare indexed item or name drives the query
+        7. Verify that no plan is returned for k nearest neighbour searches
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+        url = '/foodtrucks/location?longitude={}&latitude={}&radius=5000'.format(lon, lat)
+        filters = ['&item={}'.format(test_item[0]), '&name={}'.format(test_name[0]), '&item=Pupusas',
+                   '&name={}&item={}'.format(test_name[0], test_item[0]), '&item=%', '&item=burrito&limit=2']
+        try:
+            for params in filters:
+                results = []
+                for enabled in (False, True):
+                    app.config['QUERY_PLANNER_ENABLED'] = enabled
+                    ret = client.get(url + params)
+                    assert ret.status_code == 200
+                    assert 'plan' not in ret.get_json()
+                    results.append([e['uuid'] for e in ret.get_json()['foodtrucks']])
+                assert results[0] == results[1]
+
+                ret = client.get(url + params + '&explain=true')
+                plan = ret.get_json()['plan']
+                assert plan['driver'] in plan['costs']
+                assert plan['rows']['radius'] <= len(test_data)
+
+            # disabled in-memory indexes are neither built nor used for estimates
+            with monkeypatch.context() as m:
+                m.setattr(app.extensions['names_index'], 'estimate', None)
+                m.setattr(app.extensions['items_index'], 'estimate', None)
+                ret = client.get(url + '&name={}&item=burrito&explain=1'.format(test_name[0]))
+                assert ret.status_code == 200
+                plan = ret.get_json()['plan']
+                assert plan['driver'] == 'radius'
+                assert plan['rows']['name'] == plan['rows']['item'] >= plan['rows']['radius']
+
+            app.config['ITEM_INDEX_ENABLED'] = True
+            ret = client.get(url + '&item=burrito&explain=1')
+            assert ret.get_json()['plan']['driver'] == 'item'
+            assert [e['uuid'] for e in ret.get_json()['foodtrucks']] == [
+                i+1 for i, e in enumerate(test_data) if 'burrito' in e['food_items'].lower()]
+
+            app.config['NAME_INDEX_ENABLED'] = True
+            ret = client.get(url + '&name={}&explain=1'.format(test_name[0]))
+            assert ret.get_json()['plan']['driver'] == 'name'
+            assert sorted(e['uuid'] for e in ret.get_json()['foodtrucks']) == sorted(test_name[2])
+
+            # k nearest neighbour searches are not planned, with or without radius
+            for params in ['&k=3&item=burrito&explain=1', '&k=3&name=x&explain=1']:
+                ret = client.get(url.replace('&radius=5000', '') + params)
+                assert ret.status_code == 200
+                assert ret.get_json()['plan'] is None
+                ret = client.get(url + params)
+                assert ret.status_code == 200
+                assert ret.get_json()['plan'] is None
+
+            app.config['QUERY_PLANNER_ENABLED'] = False
+            assert client.get(url + '&item=burrito&explain=1').get_json()['plan'] is None
+        finally:
+            app.config['QUERY_PLANNER_ENABLED'] = False
+            app.config['ITEM_INDEX_ENABLED'] = False
+            app.config['NAME_INDEX_ENABLED'] = False
+
+
+    @pytest.mark.usefixtures('spatial_index_enabled')
+    def test_get_truck_by_location_spatial_index(self, client):
+        """
+        Test the GET request to foodtrucks nearby location with the in-memory spatial index enabled
+
+        1. Send GET request to foodtrucks/location/<params> with a predefined test location
+        2. Verify the status code as successful
+        3. Verify that the correct trucks are returned, in the correct order
+        4. Repeat with name and item search needles
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+
+        # test with different radius
+        for radius, (count, ids) in test_radius.items():
+            ret = client.get('/foodtrucks/location?longitude={}&latitude={}&radius={}'.format(lon,lat, radius))
+            assert ret.status_code == 200
+            data = ret.get_json()['foodtrucks']
+            assert [e['uuid'] for e in data] == ids
+
+        # test with name and item filters
+        ret = client.get('/foodtrucks/location?longitude={}&latitude={}&name={}'.format(lon,lat,test_name[0]))
+        assert [e['uuid'] for e in ret.get_json()['foodtrucks']] == test_name[2]
+        ret = client.get('/foodtrucks/location?longitude={}&latitude={}&item={}'.format(lon,lat,test_item[0]))
+        assert [e['uuid'] for e in ret.get_json()['foodtrucks']] == test_item[2]
+
+    def test_get_truck_by_location_facets(self, app, client):
+        """
+        Test the GET request to foodtrucks nearby location with menu item counts
+
+        1. Send GET request to foodtrucks/location/<params> with facets, with the
+            in-memory spatial index disabled and enabled
+        2. Verify the status code as successful
+        3. Verify that the counts match the menu items of the matching trucks
+        4. Verify that paginated responses count every matching truck
+        5. Verify that facets=only returns the counts without the trucks
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+        url = '/foodtrucks/location?longitude={}&latitude={}&radius=5000'.format(lon, lat)
+
+        def count(trucks):
+            counts = Counter(item for e in trucks for item in parse_menu_items(e['food_items']))
+            return sorted(([item, n] for item, n in counts.items()), key=lambda e: (-e[1], e[0]))
+
+        try:
+            for enabled in (False, True):
+                app.config['SPATIAL_INDEX_ENABLED'] = enabled
+                for params in ['', '&item={}'.format(test_item[0]), '&name={}'.format(test_name[0]), '&k=3']:
+                    ret = client.get(url + params + '&facets=true')
+                    assert ret.status_code == 200
+                    data = ret.get_json()
+                    facets = [[e['item'], e['count']] for e in data['facets']]
+                    assert facets == count(data['foodtrucks'])
+
+                    ret = client.get(url + params + '&facets=only')
+                    assert ret.status_code == 200
+                    assert ret.get_json() == {'facets': data['facets']}
+
+                ret = client.get(url + '&facets=1&limit=1')
+                data = ret.get_json()
+                assert len(data['foodtrucks']) == 1
+                assert data['facets'] == client.get(url + '&facets=only').get_json()['facets']
+
+                ret = client.get(url + '&item=no-such-item&facets=only')
+                assert ret.get_json() == {'facets': []}
+        finally:
+            app.config['SPATIAL_INDEX_ENABLED'] = False
+
+    @pytest.mark.usefixtures('location_cache_enabled')
+    def test_get_truck_by_location_cache(self, app, client, monkeypatch):
+        """
+        Test the GET request to foodtrucks nearby location with the response cache enabled
+
+        1. Send GET request to foodtrucks/location/<params> from a location
+        2. Verify that the response is the uncached response of the grid cell center
+        3. Send the request again from another location in the same grid cell, with
+            the database queries disabled
+        4. Verify that the same response is served from the cache
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+        url = '/foodtrucks/location?longitude={}&latitude={}&radius=400'
+        center = app.extensions['location_cache'].quantize(lat, lon)
+        for params in ['', '&item={}'.format(test_item[0]), '&k=3', '&facets=only']:
+            ret = client.get(url.format(lon, lat) + params)
+            assert ret.status_code == 200
+            data = ret.get_json()
+
+            app.config['LOCATION_CACHE_ENABLED'] = False
+            assert client.get(url.format(center[1], center[0]) + params).get_json() == data
+            app.config['LOCATION_CACHE_ENABLED'] = True
+
+            with monkeypatch.context() as m:
+                def fail(*args, **kwargs):
+                    raise AssertionError('database queried')
+                for method in ['get_food_trucks_within_radius', 'get_nearest_food_trucks',
+                               'get_item_counts_within_radius']:
+                    m.setattr(FoodTruck, method, fail)
+                ret = client.get(url.format(lon + 0.0001, lat - 0.0001) + params)
+                assert ret.status_code == 200
+                assert ret.get_json() == data
+
+    @pytest.mark.parametrize('cache', [False, True])
+    def test_get_truck_by_location_invalid_coordinates(self, app, client, cache):
+        """
+        Test the GET request to foodtrucks nearby location with invalid coordinates, with
+        the response cache disabled and enabled
+
+        1. Send GET requests to foodtrucks/location/<params> with infinite, undefined and
+            out of range coordinates
+        2. Verify the status codes as bad request
+        """
+        url = '/foodtrucks/location?longitude={}&latitude={}'
+        try:
+            app.config['LOCATION_CACHE_ENABLED'] = cache
+            for lon, lat in [(test_location[1], 'inf'), ('-inf', test_location[0]), ('nan', test_location[0]),
+                             (test_location[1], 91), (181, test_location[0])]:
+                ret = client.get(url.format(lon, lat))
+                assert ret.status_code == 400
+        finally:
+            app.config['LOCATION_CACHE_ENABLED'] = False
+
+    def test_get_nearest_trucks_by_location(self, client):
+        """
+        Test the GET request to foodtrucks nearby location with k nearest neighbours
+
+        1. Send GET request to foodtrucks/location/<params> with a predefined test location and k
+        2. Verify the status code as successful
+        3. Verify that the k nearest trucks are returned, in the correct order
+        4. Verify that the distance is included and ascending
+        5. Verify that a non-positive k is a bad request
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+        k = 3
+
+        ret = client.get('/foodtrucks/location?longitude={}&latitude={}&k={}'.format(lon, lat, k))
+        assert ret.status_code == 200
+        data = ret.get_json()['foodtrucks']
+        assert [e['uuid'] for e in data] == test_radius[500][1][:k]
+        distances = [e['distance'] for e in data]
+        assert distances == sorted(distances)
+
+        ret = client.get('/foodtrucks/location?longitude={}&latitude={}&k=0'.format(lon, lat))
+        assert ret.status_code == 400
+
+
+    def test_get_truck_by_location_paginated(self, app, client):
+        """
+        Test the GET request to foodtrucks nearby location paginated by cursor
+
+        1. Send GET request to foodtrucks/location/<params> with a predefined test location and limit
+        2. Follow the next cursor of every response until it is null
+        3. Verify that the concatenated pages contain the correct trucks, in the correct order
+        4. Repeat with the in-memory spatial index enabled
+        5. Verify that a malformed cursor is a bad request
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+        radius = 500
+        limit = 5
+        count, ids = test_radius[radius]
+
+        for enabled in (False, True):
+            app.config['SPATIAL_INDEX_ENABLED'] = enabled
+            try:
+                url = '/foodtrucks/location?longitude={}&latitude={}&radius={}&limit={}'.format(lon, lat, radius, limit)
+                ret = client.get(url)
+                pages = []
+                while True:
+                    assert ret.status_code == 200
+                    data = ret.get_json()
+                    assert len(data['foodtrucks']) <= limit
+                    pages.append(data['foodtrucks'])
+                    if data['next_cursor'] is None:
+                        break
+                    ret = client.get(url + '&cursor={}'.format(data['next_cursor']))
+            finally:
+                app.config['SPATIAL_INDEX_ENABLED'] = False
+
+            assert len(pages) == (count + limit - 1) // limit
+            assert [e['uuid'] for page in pages for e in page] == ids
+
+        ret = client.get('/foodtrucks/location?longitude={}&latitude={}&cursor=invalid'.format(lon, lat))
+        assert ret.status_code == 400
+
+
+    def test_get_truck_by_viewport(self, app, client):
+        """
+        Test the GET request to foodtrucks inside a viewport
+
+        1. Send GET request to foodtrucks/viewport/<params> with a viewport around the test location
+        2. Verify the status code as successful
+        3. Verify that exactly the trucks inside the viewport are returned
+        4. Repeat with the in-memory spatial index enabled and with a name filter
+        5. Verify that a missing corner is a bad request
+        """
+        sw = (37.719, -122.3915)
+        ne = (37.7235, -122.387)
+        url = '/foodtrucks/viewport?sw_latitude={}&sw_longitude={}&ne_latitude={}&ne_longitude={}'.format(
+                    sw[0], sw[1], ne[0], ne[1])
+        inside = [i+1 for i, e in enumerate(test_data)
+                    if sw[0] <= e['latitude'] <= ne[0] and sw[1] <= e['longitude'] <= ne[1]]
+        named = [i+1 for i in range(len(test_data))
+                    if i+1 in inside and test_name[0].lower() in test_data[i]['name'].lower()]
+        assert len(inside) > len(named) > 0
+
+        for enabled in (False, True):
+            app.config['SPATIAL_INDEX_ENABLED'] = enabled
+            try:
+                ret = client.get(url)
+                assert ret.status_code == 200
+                assert [e['uuid'] for e in ret.get_json()['foodtrucks']] == inside
+
+                ret = client.get(url + '&name={}'.format(test_name[0]))
+                assert [e['uuid'] for e in ret.get_json()['foodtrucks']] == named
+            finally:
+                app.config['SPATIAL_INDEX_ENABLED'] = False
+
+        ret = client.get('/foodtrucks/viewport?sw_latitude={}&sw_longitude={}&ne_latitude={}'.format(
+                    sw[0], sw[1], ne[0]))
+        assert ret.status_code == 400
+
+
+    def test_get_truck_by_route(self, app, client):
+        """
+        Test the GET request to foodtrucks along a route
+
+        1. Send GET request to foodtrucks/route/<params> with a route through the test data
+        2. Verify the status code as successful
+        3. Verify that exactly the trucks within the corridor are returned, ordered along the route
+        4. Repeat with the in-memory spatial index enabled
+        5. Verify that a malformed polyline or a polyline with coordinates out of range
+            is a bad request
+        """
+        route = [(37.7180, -122.3950), (37.7210, -122.3890), (37.7240, -122.3880)]
+        width = 150
+        url = '/foodtrucks/route?polyline={}&width={}'.format(encode_polyline(route), width)
+
+        # position along the route of the first segment near each truck
+        start = 0
+        positions = {}
+        for (lat1, lon1), (lat2, lon2) in zip(route, route[1:]):
+            for i, e in enumerate(test_data):
+                dist, along = segment_distance(e['latitude'], e['longitude'], lat1, lon1, lat2, lon2)
+                if dist <= width and i+1 not in positions:
+                    positions[i+1] = start + along
+            start += haversine(lat1, lon1, lat2, lon2)
+        expected = sorted(positions, key=lambda uuid: (positions[uuid], uuid))
+        assert 0 < len(expected) < len(test_data)
+
+        for enabled in (False, True):
+            app.config['SPATIAL_INDEX_ENABLED'] = enabled
+            try:
+                ret = client.get(url)
+                assert ret.status_code == 200
+                trucks = ret.get_json()['foodtrucks']
+                assert [e['uuid'] for e in trucks] == expected
+                assert all(e['distance'] <= width for e in trucks)
+                assert [e['position'] for e in trucks] == sorted(e['position'] for e in trucks)
+            finally:
+                app.config['SPATIAL_INDEX_ENABLED'] = False
+
+        ret = client.get('/foodtrucks/route?polyline=_p~iF')
+        assert ret.status_code == 400
+        ret = client.get('/foodtrucks/route?polyline={}'.format(encode_polyline([(37.72, -122.39), (95.0, -122.39)])))
+        assert ret.status_code == 400
+        ret = client.get('/foodtrucks/route?polyline={}'.format(encode_polyline([(37.72, 200.0)])))
+        assert ret.status_code == 400
+        ret = client.get('/foodtrucks/route')
+        assert ret.status_code == 400
+
+
+    def test_get_truck_by_long_route(self, app, client):
+        """
+        Test the GET request to foodtrucks along a long route
+
+        1. Send GET request to foodtrucks/route/<params> with a route of 200 points,
+            starting through the test data and continuing with long, mostly straight segments
+        2. Verify the status code as successful
+        3. Verify that exactly the trucks within the corridor are returned, ordered along the route
+        4. Repeat with the in-memory spatial index enabled
+        """
+        route = [(37.7180, -122.3950), (37.7210, -122.3890), (37.7240, -122.3880)]
+        route += [(37.7240 + 0.04 * i, -122.3880 + 0.001 * (i % 2)) for i in range(1, 198)]
+        width = 150
+        url = '/foodtrucks/route?polyline={}&width={}'.format(encode_polyline(route), width)
+
+        # position along the route of the first segment near each truck
+        start = 0
+        positions = {}
+        for (lat1, lon1), (lat2, lon2) in zip(route, route[1:]):
+            for i, e in enumerate(test_data):
+                dist, along = segment_distance(e['latitude'], e['longitude'], lat1, lon1, lat2, lon2)
+                if dist <= width and i+1 not in positions:
+                    positions[i+1] = start + along
+            start += haversine(lat1, lon1, lat2, lon2)
+        expected = sorted(positions, key=lambda uuid: (positions[uuid], uuid))
+        assert 0 < len(expected) < len(test_data)
+
+        for enabled in (False, True):
+            app.config['SPATIAL_INDEX_ENABLED'] = enabled
+            try:
+                ret = client.get(url)
+                assert ret.status_code == 200
+                assert [e['uuid'] for e in ret.get_json()['foodtrucks']] == expected
+            finally:
+                app.config['SPATIAL_INDEX_ENABLED'] = False
+
+
+    def test_get_truck_clusters(self, client):
+        """
+        Test the GET request to foodtruck clusters inside a viewport
+
+        1. Send GET request to foodtrucks/clusters/<params> zoomed out
+        2. Verify the status code as successful
+        3. Verify that a single cluster contains every truck
+        4. Send GET request to foodtrucks/clusters/<params> zoomed in
+        5. Verify that the clusters still contain every truck
+        6. Verify that a negative zoom level is a bad request
+        """
+        url = '/foodtrucks/clusters?sw_latitude=37.7&sw_longitude=-122.5&ne_latitude=37.8&ne_longitude=-122.3&zoom={}'
+        ret = client.get(url.format(3))
+        assert ret.status_code == 200
+        clusters = ret.get_json()['clusters']
+        assert len(clusters) == 1
+        assert clusters[0]['count'] == len(test_data)
+
+        ret = client.get(url.format(19))
+        clusters = ret.get_json()['clusters']
+        assert len(clusters) > 1
+        assert sum(e['count'] for e in clusters) == len(test_data)
+
+        ret = client.get(url.format(-1))
+        assert ret.status_code == 400
+
+
+    def test_get_truck_heatmap(self, app, client):
+        """
+        Test the GET request to the foodtruck density heatmap
+
+        1. Send GET request to foodtrucks/heatmap/<params> for every resolution level
+        2. Verify the status code as successful
+        3. Verify that the cell counts add up to the number of trucks
+        4. Send GET request to foodtrucks/heatmap/<params> with an item filter
+        5. Verify that the cell counts add up to the number of matching trucks
+        6. Verify that a missing resolution level is a bad request
+        """
+        levels = len(app.config['HEATMAP_CELL_SIZES'])
+        previous = 0
+        for level in range(levels):
+            ret = client.get('/foodtrucks/heatmap?level={}'.format(level))
+            assert ret.status_code == 200
+            data = ret.get_json()
+            assert sum(count for __, __, count in data['cells']) == len(test_data)
+            assert len(data['cells']) >= previous
+            previous = len(data['cells'])
+
+            # every truck is inside the cell with the listed south-west corner
+            for e in test_data:
+                assert any(lat <= e['latitude'] < lat + data['cell_size'] and
+                           lon <= e['longitude'] < lon + data['cell_size'] for lat, lon, __ in data['cells'])
+
+        ret = client.get('/foodtrucks/heatmap?level={}&item={}'.format(levels - 1, test_item[0]))
+        assert ret.status_code == 200
+        assert sum(count for __, __, count in ret.get_json()['cells']) == test_item[1]
+
+        ret = client.get('/foodtrucks/heatmap?level={}'.format(levels))
+        assert ret.status_code == 400
+
+
+
+    def test_get_truck_autocomplete(self, client):
+        """
+        Test the GET request to foodtrucks search suggestions
+
+        1. Send GET request to foodtrucks/autocomplete/<params> with a name prefix
+        2. Verify the status code as successful
+        3. Verify that the suggested names start with the prefix and are counted correctly
+        4. Send GET request to foodtrucks/autocomplete/<params> with an item prefix
+        5. Verify that the matching menu items are counted and ordered correctly
+        6. Verify that the limit is respected
+        7. Verify that a missing prefix or invalid limit is a bad request
+        """
+        prefix = test_name[0][:3]
+        ret = client.get('/foodtrucks/autocomplete?prefix={}'.format(prefix))
+        assert ret.status_code == 200
+        data = ret.get_json()
+        assert len(data['names']) > 0
+        for e in data['names']:
+            assert e['count'] == sum(1 for truck in test_data if truck['name'] == e['name'])
+        assert sum(e['count'] for e in data['names'] if test_name[0] in e['name']) == test_name[1]
+
+        ret = client.get('/foodtrucks/autocomplete?prefix={}'.format(test_item[0][:4].upper()))
+        assert ret.status_code == 200
+        data = ret.get_json()
+        counts = dict((e['item'], e['count']) for e in data['items'])
+        assert counts[test_item[0]] == sum(1 for truck in test_data if test_item[0] in
+                                           [e.strip().lower() for e in truck['food_items'].split(':')])
+        assert [e['count'] for e in data['items']] == sorted(counts.values(), reverse=True)
+
+        ret = client.get('/foodtrucks/autocomplete?prefix={}&limit=1'.format(test_item[0][:4]))
+        assert ret.get_json()['items'] == data['items'][:1]
+
+        assert client.get('/foodtrucks/autocomplete').status_code == 400
+        assert client.get('/foodtrucks/autocomplete?prefix=a&limit=0').status_code == 400
+        assert client.get('/foodtrucks/autocomplete?prefix=a&limit=x').status_code == 400
@@ -58,6 +58,36 @@ class TestPost():
         assert truck.user_id == 2
 
 
+    def test_post_truck_metadata(self, client, token, monkeypatch):
+        """
+        Test that a created FoodTruck is added to the collection metadata without
+        querying the database
+
+        1. Send GET request to the application root to compute the metadata
+        2. Send POST request to foodtrucks outside the current geographical area
+        3. Verify that the metadata counts the truck and extends the geographical area,
+            with the metadata query disabled
+        """
+        headers = {'Authorization': 'Bearer ' + token,
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/json'}
+        before = client.get('/').get_json()['foodtrucks']
+
+        post_data = {'name': 'Food Truck 2',
+                    'latitude': 38.5,
+                    'longitude': -121.5,
+                    'days_hours':'Mon-Fri:8AM-2PM',
+                    'food_items':'tacos'}
+        ret = client.post('/foodtrucks', data=json.dumps(post_data), headers=headers)
+        assert ret.status_code == 201
+
+        with monkeypatch.context() as m:
+            m.setattr(FoodTruck, 'get_collection_metadata', None)
+            after = client.get('/').get_json()['foodtrucks']
+        assert after['entries'] == before['entries'] + 1
+        assert after['geo_area']['max_latitude'] == post_data['latitude']
+        assert after['geo_area']['max_longitude'] == post_data['longitude']
+
     def test_post_truck_unauthorized(self, client):
         """
         Test the POST request without authentication to create a new FoodTruck resource element
@@ -125,3 +155,166 @@ class TestPost():
         ret = client.post('/foodtrucks', data=json.dumps(post_data), headers=headers)
         assert ret.status_code == 400
 
+
+
+@pytest.mark.usefixtures('create_db', 'populate_food_truck_db')
+class TestPostLocationBatch():
+    """
+    Test cases for validating the POST endpoint for batch location queries.
+    Prior to running the test cases, the following procedure is run:
+
+    1. Initialize application
+    2. Create database table
+    3. Populate food truck database with predefined elements
+    """
+
+    def test_post_location_batch(self, client):
+        """
+        Test the POST request to foodtrucks/location/batch with several origins
+
+        1. Send POST request to foodtrucks/location/batch with a list of origins
+        2. Verify the status code as successful
+        3. Verify that the result of every origin is identical to the GET request for that origin
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+        origins = [{'latitude': lat, 'longitude': lon, 'radius': radius} for radius in test_radius]
+        origins.append({'latitude': lat, 'longitude': lon, 'name': test_name[0]})
+        origins.append({'latitude': lat, 'longitude': lon, 'item': test_item[0], 'radius': 400})
+        origins.append({'latitude': 0.0, 'longitude': 0.0})
+        origins.append({'latitude': test_data[10]['latitude'], 'longitude': test_data[10]['longitude'], 'radius': 250})
+
+        mimetype = 'application/json'
+        headers = {'Content-Type': mimetype,
+                    'Accept': mimetype}
+        ret = client.post('/foodtrucks/location/batch', data=json.dumps({'origins': origins}), headers=headers)
+        assert ret.status_code == 200
+        results = ret.get_json()['results']
+        assert len(results) == len(origins)
+
+        for origin, result in zip(origins, results):
+            params = '&'.join('{}={}'.format(key, value) for key, value in origin.items())
+            expected = client.get('/foodtrucks/location?{}'.format(params)).get_json()
+            assert result == expected
+
+
+    def test_post_location_batch_boundary(self, client):
+        """
+        Test the POST request to foodtrucks/location/batch with trucks on the boundary of
+        the search circles
+
+        1. Send POST request to foodtrucks/location/batch with origins whose radius is the
+            distance to a truck computed by the database
+        2. Verify the status code as successful
+        3. Verify that every truck on the boundary is found
+        4. Verify that the result of every origin is identical to the GET request for that origin
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+        rows = FoodTruck.query.with_entities(FoodTruck.uuid, FoodTruck.great_circle_distance(lat, lon)).all()
+        origins = [{'latitude': lat, 'longitude': lon, 'radius': dist} for __, dist in rows]
+
+        mimetype = 'application/json'
+        headers = {'Content-Type': mimetype,
+                    'Accept': mimetype}
+        ret = client.post('/foodtrucks/location/batch', data=json.dumps({'origins': origins}), headers=headers)
+        assert ret.status_code == 200
+        results = ret.get_json()['results']
+
+        for (uuid, __), origin, result in zip(rows, origins, results):
+            assert uuid in [e['uuid'] for e in result['foodtrucks']]
+            params = '&'.join('{}={}'.format(key, value) for key, value in origin.items())
+            assert result == client.get('/foodtrucks/location?{}'.format(params)).get_json()
+
+
+    def test_post_location_batch_max_origins(self, app, client):
+        """
+        Test the POST request to foodtrucks/location/batch with the maximum number of origins
+
+        1. Send POST request to foodtrucks/location/batch with MAX_BATCH_ORIGINS origins
+            spread around the test location
+        2. Verify the status code as successful
+        3. Verify that the results of a sample of origins are identical to the GET
+            requests for those origins
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+        count = app.config['MAX_BATCH_ORIGINS']
+        origins = [{'latitude': lat + (i % 40 - 20) * 0.0005, 'longitude': lon + (i // 40 - 12) * 0.0005,
+                    'radius': 100 + i % 7 * 50} for i in range(count)]
+
+        mimetype = 'application/json'
+        headers = {'Content-Type': mimetype,
+                    'Accept': mimetype}
+        ret = client.post('/foodtrucks/location/batch', data=json.dumps({'origins': origins}), headers=headers)
+        assert ret.status_code == 200
+        results = ret.get_json()['results']
+        assert len(results) == count
+        assert any(result['foodtrucks'] for result in results)
+
+        for origin, result in list(zip(origins, results))[::37]:
+            params = '&'.join('{}={}'.format(key, value) for key, value in origin.items())
+            assert result == client.get('/foodtrucks/location?{}'.format(params)).get_json()
+
+
+    @pytest.mark.parametrize('spatial_index', [False, True])
+    def test_post_location_batch_indexes(self, app, client, spatial_index):
+        """
+        Test the POST request to foodtrucks/location/batch with typo-tolerant filters, with
+        the in-memory spatial index disabled and enabled
+
+        1. Send POST request to foodtrucks/location/batch with exact and fuzzy name and
+            item filters
+        2. Verify the status code as successful
+        3. Verify that the result of every origin is identical to the GET request for that origin
+        """
+        lat = test_location[0]
+        lon = test_location[1]
+        origins = [{'latitude': lat, 'longitude': lon, 'radius': radius} for radius in test_radius]
+        origins.append({'latitude': lat, 'longitude': lon, 'name': test_name[0]})
+        origins.append({'latitude': lat, 'longitude': lon, 'name': 'Lian', 'fuzzy': True})
+        origins.append({'latitude': lat, 'longitude': lon, 'item': 'sandwhiches', 'fuzzy': True, 'radius': 400})
+        origins.append({'latitude': lat, 'longitude': lon, 'item': 'sandwhiches', 'radius': 400})
+
+        mimetype = 'application/json'
+        headers = {'Content-Type': mimetype,
+                    'Accept': mimetype}
+        try:
+            app.config['SPATIAL_INDEX_ENABLED'] = spatial_index
+            ret = client.post('/foodtrucks/location/batch', data=json.dumps({'origins': origins}), headers=headers)
+            assert ret.status_code == 200
+            results = ret.get_json()['results']
+            assert len(results) == len(origins)
+            assert results[-2]['foodtrucks'] and not results[-1]['foodtrucks']
+
+            for origin, result in zip(origins, results):
+                params = '&'.join('{}={}'.format(key, value) for key, value in origin.items())
+                assert result == client.get('/foodtrucks/location?{}'.format(params)).get_json()
+        finally:
+            app.config['SPATIAL_INDEX_ENABLED'] = False
+
+
+    def test_post_location_batch_bad_request(self, client):
+        """
+        Test the POST request to foodtrucks/location/batch with invalid origins
+
+        1. Send POST request to foodtrucks/location/batch without origins
+        2. Verify the status code as bad request
+        3. Send POST request to foodtrucks/location/batch with an origin missing longitude
+        4. Verify the status code as bad request
+        5. Send POST request to foodtrucks/location/batch with an invalid fuzzy flag
+        6. Verify the status code as bad request
+        """
+        mimetype = 'application/json'
+        headers = {'Content-Type': mimetype,
+                    'Accept': mimetype}
+        ret = client.post('/foodtrucks/location/batch', data=json.dumps({}), headers=headers)
+        assert ret.status_code == 400
+
+        origins = [{'latitude': test_location[0]}]
+        ret = client.post('/foodtrucks/location/batch', data=json.dumps({'origins': origins}), headers=headers)
+        assert ret.status_code == 400
+
+        origins = [{'latitude': test_location[0], 'longitude': test_location[1], 'fuzzy': 'yes'}]
+        ret = client.post('/foodtrucks/location/batch', data=json.dumps({'origins': origins}), headers=headers)
+        assert ret.status_code == 400
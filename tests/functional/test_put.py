@@ -1,5 +1,6 @@
 import pytest
-from application.models import FoodTruck
+from application.models import FoodTruck, MenuItem, item_suffixes, db
+from application.models.events import _insert_ignoring_conflicts
 from test_data import test_data, test_name, test_item, test_location, test_radius
 import json
 
@@ -195,3 +196,201 @@ class TestPut():
                     'Accept': mimetype}
         ret = client.put(url, data=json.dumps(put_data), headers=headers)
         assert ret.status_code == 400
+
+
+    def test_update_truck_menu_items(self, client, token):
+        """
+        Test that item searches follow the updated food_items of a FoodTruck.
+
+        1. Login to acquire token
+        2. Send PUT request to foodtruck with specific id and new menu items
+        3. Verify the normalized menu items of the element in the database
+        4. Send GET request to foodtrucks/items/<needle> for an old and a new menu item
+        5. Verify that the element is only found by the new menu item
+        """
+        uuid = 3
+        mimetype = 'application/json'
+        headers = {'Authorization': 'Bearer ' + token,
+                    'Content-Type': mimetype,
+                    'Accept': mimetype}
+
+        old_items = FoodTruck.query.filter_by(uuid=uuid).first().food_items
+        assert 'chips' in old_items.lower()
+
+        put_data = {'name':'Food Truck 3',
+                    'latitude':37.7201,
+                    'longitude':-122.3886,
+                    'days_hours':'Mon-Fri:8AM-2PM',
+                    'food_items':'Pupusas: Horchata:  Pupusas : Curtido'}
+        ret = client.put('/foodtrucks/{}'.format(uuid), data=json.dumps(put_data), headers=headers)
+        assert ret.status_code == 200
+
+        truck = FoodTruck.query.filter_by(uuid=uuid).first()
+        assert [e.name for e in truck.items] == ['pupusas', 'horchata', 'curtido']
+
+        ret = client.get('/foodtrucks/items/{}'.format('chips'))
+        assert uuid not in [e['uuid'] for e in ret.get_json()['foodtrucks']]
+        ret = client.get('/foodtrucks/items/{}'.format('PUPUSA'))
+        assert [e['uuid'] for e in ret.get_json()['foodtrucks']] == [uuid]
+
+
+    def test_update_truck_prune_menu_items(self, client, token):
+        """
+        Test that menu items no longer served by any FoodTruck are deleted
+
+        1. Login to acquire token
+        2. Send PUT request to foodtruck with specific id and menu items no other truck serves
+        3. Verify that the menu items and their suffixes are stored
+        4. Send PUT request to the foodtruck replacing those menu items
+        5. Verify that the replaced menu items and their suffixes are deleted
+        6. Verify that inserting an existing menu item again is ignored
+        """
+        uuid = 3
+        mimetype = 'application/json'
+        headers = {'Authorization': 'Bearer ' + token,
+                    'Content-Type': mimetype,
+                    'Accept': mimetype}
+        put_data = {'name':'Food Truck 3',
+                    'latitude':37.7201,
+                    'longitude':-122.3886,
+                    'days_hours':'Mon-Fri:8AM-2PM'}
+        suffixes = db.select([db.func.count()]).select_from(item_suffixes)
+
+        ret = client.put('/foodtrucks/{}'.format(uuid), data=json.dumps(dict(put_data, food_items='Arepas: Tequenos')),
+                         headers=headers)
+        assert ret.status_code == 200
+        ids = [item.id for item in MenuItem.query.filter(MenuItem.name.in_(['arepas', 'tequenos']))]
+        assert len(ids) == 2
+        assert db.session.execute(suffixes.where(item_suffixes.c.item_id.in_(ids))).scalar() == 14
+
+        ret = client.put('/foodtrucks/{}'.format(uuid), data=json.dumps(dict(put_data, food_items='Arepas: Pupusas')),
+                         headers=headers)
+        assert ret.status_code == 200
+        assert [item.name for item in MenuItem.query.filter(MenuItem.id.in_(ids))] == ['arepas']
+        assert db.session.execute(suffixes.where(item_suffixes.c.item_id.in_(ids))).scalar() == 6
+        assert client.get('/foodtrucks/items/tequenos').get_json()['foodtrucks'] == []
+
+        _insert_ignoring_conflicts(db.session.connection(), MenuItem.__table__, [{'name': 'arepas'}])
+        assert MenuItem.query.filter_by(name='arepas').count() == 1
+        db.session.rollback()
+
+
+    @pytest.mark.usefixtures('location_cache_enabled')
+    def test_update_truck_location_cache(self, app, client, token, monkeypatch):
+        """
+        Test that PUT requests only evict the cached location responses they change
+
+        1. Send GET requests to foodtrucks/location/<params> from two distant locations
+        2. Move a truck next to the first location with a PUT request
+        3. Verify that the first response includes the truck, and that the second
+            response is still served from the cache
+        4. Move the truck back and verify that the first response no longer includes it
+        """
+        uuid = 10
+        lat = test_location[0]
+        lon = test_location[1]
+        headers = {'Authorization': 'Bearer ' + token,
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/json'}
+        near_url = '/foodtrucks/location?longitude={}&latitude={}&radius=100'.format(lon, lat)
+        far_url = '/foodtrucks/location?longitude={}&latitude={}&radius=100'.format(-122.4194, 37.7749)
+
+        near = [e['uuid'] for e in client.get(near_url).get_json()['foodtrucks']]
+        far = client.get(far_url).get_json()
+        assert uuid not in near
+
+        put_data = dict((key, test_data[uuid-1][key]) for key in ['name', 'days_hours', 'food_items'])
+        ret = client.put('/foodtrucks/{}'.format(uuid), headers=headers,
+                         data=json.dumps(dict(put_data, latitude=lat, longitude=lon)))
+        assert ret.status_code == 200
+        assert uuid in [e['uuid'] for e in client.get(near_url).get_json()['foodtrucks']]
+
+        with monkeypatch.context() as m:
+            def fail(*args, **kwargs):
+                raise AssertionError('database queried')
+            m.setattr(FoodTruck, 'get_food_trucks_within_radius', fail)
+            assert client.get(far_url).get_json() == far
+
+        ret = client.put('/foodtrucks/{}'.format(uuid), headers=headers,
+                         data=json.dumps(dict(put_data, latitude=test_data[uuid-1]['latitude'],
+                                              longitude=test_data[uuid-1]['longitude'])))
+        assert ret.status_code == 200
+        assert [e['uuid'] for e in client.get(near_url).get_json()['foodtrucks']] == near
+
+
+    @pytest.mark.usefixtures('conditional_get_enabled')
+    def test_update_truck_etag(self, client, token):
+        """
+        Test that PUT requests change the entity tags of the truck and the collection
+
+        1. Send GET requests to foodtrucks and foodtrucks/<id> to get their entity tags
+        2. Send PUT request to foodtrucks/<id> changing the truck
+        3. Verify that conditional requests with the previous entity tags return the
+            changed resources with new entity tags
+        4. Verify that the new entity tags match the new resources
+        """
+        uuid = 11
+        headers = {'Authorization': 'Bearer ' + token,
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/json'}
+        urls = ['/foodtrucks', '/foodtrucks/{}'.format(uuid)]
+        etags = [client.get(url).headers['ETag'] for url in urls]
+
+        put_data = dict((key, test_data[uuid-1][key]) for key in ['name', 'latitude', 'longitude', 'food_items'])
+        ret = client.put('/foodtrucks/{}'.format(uuid), headers=headers,
+                         data=json.dumps(dict(put_data, days_hours='Sa-Su:9AM-5PM')))
+        assert ret.status_code == 200
+
+        for url, etag in zip(urls, etags):
+            ret = client.get(url, headers={'If-None-Match': etag})
+            assert ret.status_code == 200
+            assert ret.headers['ETag'] != etag
+            assert client.get(url, headers={'If-None-Match': ret.headers['ETag']}).status_code == 304
+
+
+    def test_update_truck_fragment_cache(self, client, monkeypatch):
+        """
+        Test that the encoded JSON of a truck is reused until the truck changes
+
+        1. Send GET requests to foodtrucks/<id> and foodtrucks to encode the trucks
+        2. Send the requests again with the encoding of trucks disabled
+        3. Verify that the same response is returned
+        4. Update the truck bypassing the ORM, as another process would
+        5. Verify that the response returns the updated truck
+        """
+        uuid = 12
+        url = '/foodtrucks/{}'.format(uuid)
+        data = client.get(url).get_json()
+        assert data['name'] == test_data[uuid-1]['name']
+        trucks = client.get('/foodtrucks').get_json()
+
+        with monkeypatch.context() as m:
+            m.setattr('application.indexes.fragments.encode_fragment', None)
+            assert client.get(url).get_json() == data
+            assert client.get('/foodtrucks').get_json() == trucks
+
+        db.session.execute(FoodTruck.__table__.update().where(FoodTruck.uuid == uuid).values(name='Renamed'))
+        db.session.commit()
+        assert client.get(url).get_json() == dict(data, name='Renamed')
+
+
+    @pytest.mark.usefixtures('truck_cache_enabled')
+    def test_update_truck_cache(self, client, token):
+        """
+        Test that PUT requests discard the cached truck
+
+        1. Send GET request to foodtrucks/<id> to cache the truck
+        2. Send PUT request to foodtrucks/<id> changing the truck
+        3. Verify that GET request to foodtrucks/<id> returns the changed truck
+        """
+        uuid = 13
+        headers = {'Authorization': 'Bearer ' + token,
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/json'}
+        url = '/foodtrucks/{}'.format(uuid)
+        data = client.get(url).get_json()
+
+        put_data = dict((key, data[key]) for key in ['name', 'latitude', 'longitude', 'days_hours'])
+        ret = client.put(url, headers=headers, data=json.dumps(dict(put_data, food_items='Tacos')))
+        assert ret.status_code == 200
+        assert client.get(url).get_json() == dict(data, food_items='Tacos')
@@ -0,0 +1,77 @@
+import pytest
+from application.utils.cluster_hierarchy import ClusterHierarchy, mercator_pixel
+from test_data import test_data
+
+
+def test_mercator_pixel():
+    """
+    Test the Web Mercator projection to pixel coordinates
+
+    1. Project the origin and the corners of the map at different zoom levels
+    2. Verify the pixel coordinates
+    """
+    assert mercator_pixel(0, 0, 0) == pytest.approx((128, 128))
+    assert mercator_pixel(0, -180, 1) == pytest.approx((0, 256))
+    assert mercator_pixel(85.05112878, 180, 2) == pytest.approx((1024, 0), abs=1e-3)
+
+
+def test_cluster_hierarchy():
+    """
+    Test that the cluster hierarchy aggregates every point at every zoom level
+
+    1. Insert the test data into a cluster hierarchy
+    2. Query the whole world at every zoom level
+    3. Verify that the counts add up to the number of points and that the clusters are
+        nested, so there are never fewer clusters at a higher zoom level
+    4. Verify that a single cluster at zoom level 0 has the centroid of every point
+    """
+    hierarchy = ClusterHierarchy(20, 64)
+    for i, e in enumerate(test_data):
+        hierarchy.insert(i+1, e['latitude'], e['longitude'])
+
+    previous = 0
+    for zoom in range(21):
+        clusters = hierarchy.query(-85, -180, 85, 180, zoom, 3)
+        assert sum(count for __, __, count, __ in clusters) == len(test_data)
+        assert len(clusters) >= previous
+        previous = len(clusters)
+        for __, __, count, sample in clusters:
+            assert len(sample) == min(count, 3)
+
+    # every point is in a single cluster when zoomed out
+    clusters = hierarchy.query(-85, -180, 85, 180, 0, 3)
+    assert len(clusters) == 1
+    lat, lon, count, sample = clusters[0]
+    assert lat == pytest.approx(sum(e['latitude'] for e in test_data) / len(test_data))
+    assert lon == pytest.approx(sum(e['longitude'] for e in test_data) / len(test_data))
+    assert sample == [1, 2, 3]
+
+    # trucks sharing a coordinate are in the same cluster at the highest zoom level
+    clusters = hierarchy.query(-85, -180, 85, 180, 20, 3)
+    assert len(clusters) == len(test_data) - 1
+
+
+def test_cluster_hierarchy_incremental():
+    """
+    Test inserting, moving and removing points in the cluster hierarchy
+
+    1. Insert two points and verify that they form a single cluster when zoomed out
+    2. Move a point far away and verify that the clusters are split
+    3. Remove the points and verify that no clusters remain
+    """
+    hierarchy = ClusterHierarchy(10, 64)
+    hierarchy.insert(1, 37.72, -122.39)
+    hierarchy.insert(2, 37.73, -122.38)
+    assert [count for __, __, count, __ in hierarchy.query(-85, -180, 85, 180, 5, 3)] == [2]
+
+    hierarchy.insert(2, -33.86, 151.2)
+    clusters = hierarchy.query(-85, -180, 85, 180, 5, 3)
+    assert [count for __, __, count, __ in clusters] == [1, 1]
+    assert clusters[0][0] == pytest.approx(37.72)
+
+    # viewport only containing the first point
+    assert len(hierarchy.query(37, -123, 38, -122, 5, 3)) == 1
+
+    hierarchy.remove(1)
+    hierarchy.remove(2)
+    assert hierarchy.query(-85, -180, 85, 180, 5, 3) == []
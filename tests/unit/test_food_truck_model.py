@@ -1,6 +1,9 @@
 import pytest
-from application.models import FoodTruck
-from test_data import test_location, test_radius
+import sqlite3
+from application.models import FoodTruck, db
+from application.utils.geohash import encode
+from application.utils.haversine import unit_vector
+from test_data import test_data, test_name, test_location, test_radius
 
 
 # test values
@@ -47,6 +50,26 @@ class TestFoodTruck():
         assert new_food_truck.user_id == user_id
 
 
+    def test_food_truck_spatial_columns(self):
+        """
+        Test that the geohash and unit vector of a FoodTruck instance follow its coordinates
+
+        1. Create FoodTruck instance with predefined values
+        2. Verify the geohash and unit vector of the created instance
+        3. Update the coordinates of the instance
+        4. Verify that the geohash and unit vector are updated
+        """
+        truck = FoodTruck(name, longitude, latitude, days_hours, food_items, user_id)
+        assert truck.geohash == encode(latitude, longitude)
+        assert truck.geohash.startswith('9q8yw')
+        assert (truck.unit_x, truck.unit_y, truck.unit_z) == unit_vector(latitude, longitude)
+
+        truck.latitude = -33.86
+        truck.longitude = 151.2
+        assert truck.geohash == encode(-33.86, 151.2)
+        assert (truck.unit_x, truck.unit_y, truck.unit_z) == unit_vector(-33.86, 151.2)
+
+
     def test_food_truck_serialize(self, new_food_truck):
         """
         Test the FoodTruck instance method serialize()
@@ -83,4 +106,132 @@ class TestFoodTruck():
 
         # verify that the correct trucks are returned, in the correct order
         for i, e in enumerate(ret):
-            assert test_radius[radius][1][i] == e.uuid
\ No newline at end of file
+            assert test_radius[radius][1][i] == e.uuid
+
+
+    @pytest.mark.usefixtures('spatial_index_enabled')
+    def test_food_truck_radius_query_spatial_index(self, app):
+        """
+        Test the FoodTruck class method get_food_trucks_within_radius() with the
+        in-memory spatial index enabled
+
+        1. Initialize application and database
+        2. Populate database with predefined values from test_data.py
+        3. Invoke method with predefined coordinates and different radius
+        4. Verify that the correct trucks are returned, in the correct order
+        """
+        latitude = test_location[0]
+        longitude = test_location[1]
+        for radius, (count, ids) in test_radius.items():
+            ret = FoodTruck.get_food_trucks_within_radius(latitude, longitude, radius)
+            assert len(ret) == count
+            assert [e.uuid for e in ret] == ids
+
+
+    def test_food_truck_within_box(self):
+        """
+        Test the FoodTruck class method within_box()
+
+        1. Initialize application and database
+        2. Populate database with predefined values from test_data.py
+        3. Query with a box around the predefined coordinates
+        4. Verify that exactly the trucks inside the box are returned
+        5. Query with a box crossing the antimeridian
+        6. Verify that exactly the trucks inside the box are returned
+        """
+        box = (37.719, -122.390, 37.723, -122.387)
+        ret = FoodTruck.query.filter(FoodTruck.within_box(*box)).all()
+        expected = [i+1 for i, e in enumerate(test_data)
+                    if box[0] <= e['latitude'] <= box[2] and box[1] <= e['longitude'] <= box[3]]
+        assert len(expected) > 0
+        assert sorted(e.uuid for e in ret) == expected
+
+        # box from longitude 170 wrapping around to -122.389
+        box = (37.719, 170, 37.723, -122.389)
+        ret = FoodTruck.query.filter(FoodTruck.within_box(*box)).all()
+        expected = [i+1 for i, e in enumerate(test_data)
+                    if box[0] <= e['latitude'] <= box[2] and e['longitude'] <= box[3]]
+        assert sorted(e.uuid for e in ret) == expected
+
+
+    @pytest.mark.usefixtures('item_index_enabled')
+    def test_food_truck_contains_item_many_ids(self, app, monkeypatch):
+        """
+        Test the FoodTruck class method contains_item() with the in-memory items index
+        matching more trucks than the bound parameters of a statement
+
+        1. Limit the number of bound parameters of a statement to 999
+        2. Query the trucks with an item matching thousands of ids, exactly and fuzzy
+        3. Verify that the existing trucks among the ids are returned
+        """
+        if db.engine.dialect.name != 'sqlite':
+            pytest.skip('bound parameter limits are set on SQLite connections')
+        ids = set(range(1, 5000))
+        monkeypatch.setattr(app.extensions['items_index'], 'search', lambda needle: ids)
+        monkeypatch.setattr(FoodTruck, 'similar_uuids', classmethod(lambda cls, field, needle: ids))
+        raw = db.session.connection().connection.connection
+        limit = raw.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        try:
+            for fuzzy in (False, True):
+                ret = FoodTruck.query.filter(FoodTruck.contains_item('sandwiches', fuzzy=fuzzy)).all()
+                assert sorted(e.uuid for e in ret) == list(range(1, len(test_data)+1))
+        finally:
+            raw.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, limit)
+
+
+    def test_food_truck_contains_name_many_ids(self, app, monkeypatch):
+        """
+        Test the FoodTruck class method contains_name() with the in-memory names index
+        matching more trucks than the bound parameters of a statement
+
+        1. Limit the number of bound parameters of a statement to 999
+        2. Query the trucks with a name matching thousands of ids, exactly and fuzzy
+        3. Verify that the existing trucks among the ids are returned
+        """
+        if db.engine.dialect.name != 'sqlite':
+            pytest.skip('bound parameter limits are set on SQLite connections')
+        ids = set(range(1, 5000))
+        monkeypatch.setitem(app.config, 'NAME_INDEX_ENABLED', True)
+        monkeypatch.setattr(app.extensions['names_index'], 'search', lambda needle: ids)
+        monkeypatch.setattr(FoodTruck, 'similar_uuids', classmethod(lambda cls, field, needle: ids))
+        raw = db.session.connection().connection.connection
+        limit = raw.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        try:
+            for fuzzy in (False, True):
+                ret = FoodTruck.query.filter(FoodTruck.contains_name('food', fuzzy=fuzzy)).all()
+                assert sorted(e.uuid for e in ret) == list(range(1, len(test_data)+1))
+        finally:
+            raw.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, limit)
+
+
+    def test_food_truck_nearest_query(self, app):
+        """
+        Test the FoodTruck class method get_nearest_food_trucks()
+
+        1. Initialize application and database
+        2. Populate database with predefined values from test_data.py
+        3. Invoke method with predefined coordinates for different k
+        4. Verify that the k nearest trucks are returned, in the correct order
+        5. Repeat with the in-memory spatial index enabled
+        """
+        latitude = test_location[0]
+        longitude = test_location[1]
+        ordered = test_radius[500][1]
+
+        for enabled in (False, True):
+            app.config['SPATIAL_INDEX_ENABLED'] = enabled
+            try:
+                for k in (1, 3, len(test_data), len(test_data)+1):
+                    ret = FoodTruck.get_nearest_food_trucks(latitude, longitude, k)
+                    assert [e.uuid for e, __ in ret] == ordered[:k]
+                    assert all(dist <= 500 for __, dist in ret)
+
+                # maximum distance
+                ret = FoodTruck.get_nearest_food_trucks(latitude, longitude, 5, max_dist=100)
+                assert [e.uuid for e, __ in ret] == test_radius[100][1]
+
+                # name filter
+                ret = FoodTruck.get_nearest_food_trucks(latitude, longitude, 2, name=test_name[0])
+                assert [e.uuid for e, __ in ret] == test_name[2][:2]
+            finally:
+                app.config['SPATIAL_INDEX_ENABLED'] = False
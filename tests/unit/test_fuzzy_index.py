@@ -0,0 +1,87 @@
+import random
+import string
+from application.utils.fuzzy_index import FuzzyIndex, fold, deletes, edit_distance, max_edits
+from application.utils.inverted_index import tokenize
+from test_data import test_data
+
+
+def test_edit_distance():
+    """
+    Test the bounded edit distance between words
+
+    1. Compute the distance between words with known distances
+    2. Verify that distances above the limit are reported as limit + 1
+    """
+    assert edit_distance('quesadila', 'quesadilla', 2) == 1
+    assert edit_distance('sisig', 'sisgi', 2) == 1
+    assert edit_distance('candy', 'candies', 3) == 3
+    assert edit_distance('candy', 'candies', 2) == 3
+    assert edit_distance('kitten', 'sitting', 3) == 3
+    assert edit_distance('kitten', 'sitting', 2) == 3
+    assert edit_distance('soda', 'soda', 0) == 0
+    assert fold('Señor Sisig') == 'senor sisig'
+
+
+def test_lookup():
+    """
+    Test that deletion dictionary lookups match a brute-force edit distance search
+
+    1. Insert the names and menus of the predefined test data
+    2. Look up misspelled random variations of the indexed words
+    3. Verify that exactly the words within the tolerated number of typos are returned
+    """
+    random.seed(3)
+    index = FuzzyIndex(2)
+    for i, e in enumerate(test_data):
+        index.insert(i+1, e['name'] + ': ' + e['food_items'])
+    vocabulary = set(word for e in test_data for word in tokenize(e['name'] + ' ' + e['food_items']))
+
+    for word in sorted(vocabulary):
+        for __ in range(3):
+            typo = list(word)
+            for __ in range(random.randint(0, 2)):
+                position = random.randrange(len(typo) + 1)
+                operation = random.choice(['insert', 'delete', 'replace'])
+                if operation == 'insert' or not typo:
+                    typo.insert(position, random.choice(string.ascii_lowercase))
+                elif operation == 'delete':
+                    del typo[min(position, len(typo) - 1)]
+                else:
+                    typo[min(position, len(typo) - 1)] = random.choice(string.ascii_lowercase)
+            typo = ''.join(typo)
+
+            edits = max_edits(typo, 2)
+            expected = dict((other, edit_distance(typo, other, edits)) for other in vocabulary)
+            expected = dict((other, distance) for other, distance in expected.items() if distance <= edits)
+            assert index.lookup(typo) == expected
+
+
+def test_search():
+    """
+    Test that misspelled searches find the matching texts, scored by the number of typos
+
+    1. Insert texts, including one with diacritics
+    2. Search with misspelled and accent-free words
+    3. Verify the matching keys and their scores
+    4. Remove a text and verify that it is no longer found
+    """
+    index = FuzzyIndex(2)
+    index.insert(1, 'Señor Sisig')
+    index.insert(2, 'Cheese Quesadillas: Burritos')
+    index.insert(3, 'Quesadilla')
+    index.insert(4, 'Sisig Tacos')
+
+    assert index.search('Senor Sisig') == {1: 0}
+    assert index.search('senor sisgi') == {1: 1}
+    assert index.search('quesadila') == {2: 2, 3: 1}
+    assert index.search('quesadila burrito') == {2: 3}
+    assert index.search('quesadila burito') == {}
+    assert index.search('sisig') == {1: 0, 4: 0}
+    assert index.search('pupusas') == {}
+    assert index.search(': ') == {}
+
+    index.remove(3)
+    index.remove(5)
+    assert index.search('quesadila') == {2: 2}
+    assert len(index) == 3
+    assert deletes('ab', 2) == set(['ab', 'a', 'b', ''])
@@ -0,0 +1,46 @@
+import random
+from application.utils.geohash import encode, geohash_ranges
+from test_data import test_data
+
+
+def test_encode():
+    """
+    Test that geohashes match known values
+
+    1. Encode coordinates with known geohashes
+    2. Verify the geohashes
+    """
+    assert encode(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+    assert encode(37.7749, -122.4194, 6) == '9q8yyk'
+    assert encode(-90, -180, 4) == '0000'
+    assert encode(90, 180, 4) == 'zzzz'
+
+
+def test_geohash_ranges():
+    """
+    Test that geohash ranges cover every coordinate inside a box
+
+    1. Compute the geohash ranges of boxes of varying size, including one crossing
+        the antimeridian
+    2. Verify that the number of ranges is bounded
+    3. Verify that the geohash of every random coordinate inside the box is in a range
+    """
+    random.seed(7)
+    boxes = [(37.7, -122.5, 37.8, -122.3), (37.72, -122.39, 37.7201, -122.3899),
+             (-10, 170, 10, -170), (-90, -180, 90, 180)]
+    for min_lat, min_lon, max_lat, max_lon in boxes:
+        ranges = geohash_ranges(min_lat, min_lon, max_lat, max_lon)
+        assert 0 < len(ranges) <= 32
+        assert ranges == sorted(ranges)
+        width = (max_lon - min_lon) % 360 or 360
+        for __ in range(200):
+            lat = random.uniform(min_lat, max_lat)
+            lon = (min_lon + random.uniform(0, width) + 180) % 360 - 180
+            geohash = encode(lat, lon)
+            assert any(first <= geohash <= last for first, last in ranges)
+
+    # every test truck is inside a box around San Francisco
+    ranges = geohash_ranges(37.7, -122.5, 37.8, -122.3)
+    for e in test_data:
+        geohash = encode(e['latitude'], e['longitude'])
+        assert any(first <= geohash <= last for first, last in ranges)
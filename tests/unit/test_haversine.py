@@ -1,5 +1,8 @@
 import pytest
-from application.utils.haversine import haversine
+import numpy as np
+from application.utils.haversine import (haversine, haversine_vectorized, haversine_matrix, unit_vector, min_dot_product,
+                                        equirectangular, EQUIRECTANGULAR_MAX_DISTANCE, EQUIRECTANGULAR_TOLERANCE)
+from test_data import test_data, test_location
 
 
 def test_haversine():
@@ -35,4 +38,97 @@ def test_haversine():
 
     # verify that result is within tolerance of expected result
     tolerance = known_dist_m*0.01
-    assert calc_dist_m <= known_dist_m + tolerance and calc_dist_m >= known_dist_m - tolerance
\ No newline at end of file
+    assert calc_dist_m <= known_dist_m + tolerance and calc_dist_m >= known_dist_m - tolerance
+
+
+def test_haversine_vectorized():
+    """
+    Test that the vectorized haversine function returns the same distances as the
+    scalar haversine function.
+
+    1. Invoke the vectorized function for a single origin and an array of destinations
+    2. Verify every distance against the scalar function
+    3. Invoke the vectorized function for pairwise arrays of origins and destinations
+    4. Verify every distance against the scalar function
+    """
+    lats = [e['latitude'] for e in test_data]
+    lons = [e['longitude'] for e in test_data]
+
+    # single origin, many destinations
+    ret = haversine_vectorized(test_location[0], test_location[1], lats, lons)
+    assert ret.shape == (len(test_data),)
+    for i, dist in enumerate(ret):
+        assert dist == pytest.approx(haversine(test_location[0], test_location[1], lats[i], lons[i]), abs=1e-6)
+
+    # pairwise origins and destinations
+    ret = haversine_vectorized(lats, lons, lats[::-1], lons[::-1])
+    for i, dist in enumerate(ret):
+        assert dist == pytest.approx(haversine(lats[i], lons[i], lats[-i-1], lons[-i-1]), abs=1e-6)
+
+
+def test_haversine_matrix():
+    """
+    Test that the haversine distance matrix contains the distances between every pair
+    of coordinates.
+
+    1. Invoke haversine_matrix for two sets of coordinates
+    2. Verify the shape of the returned matrix
+    3. Verify every element against the scalar function
+    """
+    origins = test_data[:3]
+    lats = [e['latitude'] for e in test_data]
+    lons = [e['longitude'] for e in test_data]
+    ret = haversine_matrix([e['latitude'] for e in origins], [e['longitude'] for e in origins], lats, lons)
+    assert ret.shape == (len(origins), len(test_data))
+    for i, e in enumerate(origins):
+        for j in range(len(test_data)):
+            expected = haversine(e['latitude'], e['longitude'], lats[j], lons[j])
+            assert ret[i, j] == pytest.approx(expected, abs=1e-6)
+    assert np.allclose(np.diag(ret), 0)
+
+
+def test_unit_vector_dot_product():
+    """
+    Test that the dot product of unit vectors selects the same coordinates as the
+    haversine distance.
+
+    1. Compute the unit vectors of the test coordinates
+    2. Verify that the vectors have unit length
+    3. Verify that the dot product is above the threshold of a radius exactly when the
+        haversine distance is within the radius
+    """
+    origin = unit_vector(*test_location)
+    for e in test_data:
+        vector = unit_vector(e['latitude'], e['longitude'])
+        assert sum(c * c for c in vector) == pytest.approx(1)
+        dot = sum(a * b for a, b in zip(origin, vector))
+        dist = haversine(test_location[0], test_location[1], e['latitude'], e['longitude'])
+        for radius in (50, 100, 200, 500, dist):
+            assert (dot >= min_dot_product(radius)) == (dist <= radius)
+
+
+def test_equirectangular():
+    """
+    Test that the equirectangular approximation stays within its tolerance of the
+    haversine distance.
+
+    1. Compare the approximation to the haversine distance for the test coordinates
+    2. Compare it for random coordinate pairs up to the maximum distance and latitude,
+        including pairs across the antimeridian
+    3. Verify that the relative deviation is within the tolerance
+    """
+    for e in test_data:
+        dist = haversine(test_location[0], test_location[1], e['latitude'], e['longitude'])
+        approx = equirectangular(test_location[0], test_location[1], e['latitude'], e['longitude'])
+        assert approx == pytest.approx(dist, rel=1e-6, abs=1e-6)
+
+    rng = np.random.RandomState(0)
+    for __ in range(2000):
+        lat1, lon1 = rng.uniform(-80, 80), rng.uniform(-180, 180)
+        lat2, lon2 = np.clip(lat1 + rng.uniform(-1, 1), -80, 80), (lon1 + rng.uniform(-3, 3) + 180) % 360 - 180
+        approx = equirectangular(lat1, lon1, lat2, lon2)
+        if approx > EQUIRECTANGULAR_MAX_DISTANCE:
+            continue
+        dist = haversine(lat1, lon1, lat2, lon2)
+        assert approx <= dist * (1 + EQUIRECTANGULAR_TOLERANCE)
+        assert dist <= approx * (1 + EQUIRECTANGULAR_TOLERANCE)
@@ -0,0 +1,84 @@
+from application.utils.inverted_index import InvertedIndex, TrigramIndex, tokenize
+from test_data import test_data
+
+
+def test_tokenize():
+    """
+    Test that menus are split into lowercase word tokens
+
+    1. Tokenize a colon-separated menu
+    2. Verify the tokens
+    """
+    assert tokenize('Cold Truck: Pre-packaged sandwiches: soda') == ['cold', 'truck', 'pre', 'packaged', 'sandwiches', 'soda']
+    assert tokenize(': ') == []
+
+
+def test_search():
+    """
+    Test that inverted index searches match case-insensitive substring searches
+
+    1. Insert the menus of the predefined test data
+    2. Search for whole tokens, partial tokens, several words and punctuation
+    3. Verify that the result matches a brute-force substring search
+    4. Remove and replace menus, and verify the searches again
+    """
+    index = InvertedIndex()
+    texts = dict((i+1, e['food_items']) for i, e in enumerate(test_data))
+    for key, text in texts.items():
+        index.insert(key, text)
+
+    needles = ['sandwiches', 'SANDWICH', 'andw', 'ic', 'd', 'soft drinks', 'ed chips: can', 'hot and cold',
+               'water & canned', ': ', ' ', 'pre-packaged', 'nothing', 'drinks sandwiches']
+
+    def verify():
+        for needle in needles:
+            expected = set(key for key, text in texts.items() if needle.lower() in text.lower())
+            assert index.search(needle) == expected
+            assert index.estimate(needle) >= len(expected)
+
+    verify()
+    assert len(index.search('sandwiches')) > 0
+    assert index.estimate('nothing') == 0
+
+    for key in list(texts)[::2]:
+        index.remove(key)
+        del texts[key]
+    index.insert(2, 'Soft Drinks: Andwiches')
+    texts[2] = 'Soft Drinks: Andwiches'
+    verify()
+    assert len(index) == len(texts)
+
+
+def test_trigram_search():
+    """
+    Test that trigram index searches match case-insensitive substring searches
+
+    1. Insert the names of the predefined test data
+    2. Search for short needles, single trigrams, longer needles and missing needles
+    3. Verify that the result matches a brute-force substring search
+    4. Remove and replace names, and verify the searches again
+    """
+    index = TrigramIndex()
+    texts = dict((i+1, e['name']) for i, e in enumerate(test_data))
+    for key, text in texts.items():
+        index.insert(key, text)
+
+    needles = [e['name'] for e in test_data[:3]] + [test_data[0]['name'][1:-1].upper(), 'a', 'e ', 'ing', 'the', ' & ', 'nothing']
+
+    def verify():
+        for needle in needles:
+            expected = set(key for key, text in texts.items() if needle.lower() in text.lower())
+            assert index.search(needle) == expected
+            assert index.estimate(needle) >= len(expected)
+
+    verify()
+    assert len(index.search(needles[0])) > 0
+    assert index.estimate('nothing') == 0
+
+    for key in list(texts)[1::2]:
+        index.remove(key)
+        del texts[key]
+    index.insert(1, 'The Singing Truck')
+    texts[1] = 'The Singing Truck'
+    verify()
+    assert len(index) == len(texts)
@@ -0,0 +1,34 @@
+import json
+from application.utils.json_fragments import Fragment, encode_fragment, extend_fragment, dumps
+from test_data import test_data
+
+
+def test_dumps():
+    """
+    Test that documents assembled from encoded fragments decode to the same values
+
+    1. Encode every element of the predefined test data as a fragment
+    2. Assemble a document of the fragments and other values
+    3. Verify that the document decodes to the original values
+    """
+    fragments = [encode_fragment(e) for e in test_data]
+    assert all(isinstance(fragment, Fragment) for fragment in fragments)
+    assert [json.loads(fragment) for fragment in fragments] == test_data
+
+    document = {'foodtrucks': fragments, 'next_cursor': None, 'facets': [{'item': 'soda', 'count': 2}]}
+    assert json.loads(dumps(document)) == {'foodtrucks': test_data, 'next_cursor': None,
+                                           'facets': [{'item': 'soda', 'count': 2}]}
+    assert dumps({'results': [{'foodtrucks': []}]}) == '{"results":[{"foodtrucks":[]}]}'
+
+
+def test_extend_fragment():
+    """
+    Test that fields are added to encoded objects
+
+    1. Add fields to an encoded element of the test data and to an empty object
+    2. Verify that the extended objects decode to the values with the fields
+    """
+    fragment = extend_fragment(encode_fragment(test_data[0]), distance=12.5, position=3)
+    assert json.loads(fragment) == dict(test_data[0], distance=12.5, position=3)
+    assert json.loads(extend_fragment(encode_fragment({}), distance=1)) == {'distance': 1}
+    assert extend_fragment(fragment) is fragment
@@ -0,0 +1,68 @@
+import pytest
+from application.utils.lru_cache import LRUCache
+
+
+def test_lru_eviction():
+    """
+    Test that the least recently used entry is evicted once the cache is full
+
+    1. Fill a cache of size 2
+    2. Read the oldest entry and add a third entry
+    3. Verify that the entry that was not read is evicted
+    """
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+    # replacing an entry does not evict another entry
+    cache.put('a', 4)
+    assert len(cache) == 2
+    assert cache.get('a') == 4
+
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_ttl():
+    """
+    Test that entries expire after the time to live
+
+    1. Add an entry to a cache without time to live and verify that it is kept
+    2. Add an entry to a cache with a time to live of zero
+    3. Verify that the entry has expired and is removed
+    """
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    assert 'a' in cache
+
+    cache = LRUCache(2, ttl=0)
+    cache.put('a', 1)
+    assert 'a' not in cache
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_evict_pop_clear():
+    """
+    Test that entries are removed by predicate, by key and all at once
+
+    1. Add entries with different values
+    2. Evict the entries with even values and verify the remaining entries
+    3. Pop and clear the remaining entries
+    """
+    cache = LRUCache(10)
+    for value in range(6):
+        cache.put(value, value)
+    assert cache.evict(lambda value: value % 2 == 0) == 3
+    assert [key for key in range(6) if key in cache] == [1, 3, 5]
+
+    assert cache.pop(1) == 1
+    assert cache.pop(1) is None
+    cache.clear()
+    assert len(cache) == 0
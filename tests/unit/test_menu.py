@@ -0,0 +1,50 @@
+from application.utils.menu import parse_menu_items, within_menu_item, menu_item_suffixes, prefix_upper_bound
+
+
+def test_parse_menu_items():
+    """
+    Test that food_items fields are split into normalized menu items
+
+    1. Parse food_items fields with mixed case, repeated whitespace and duplicates
+    2. Verify the menu items
+    """
+    assert parse_menu_items('Cold Truck: Hot  Dogs:Soda: hot dogs: ') == ['cold truck', 'hot dogs', 'soda']
+    assert parse_menu_items('') == []
+    assert parse_menu_items(None) == []
+
+
+def test_within_menu_item():
+    """
+    Test which substrings can be searched in the normalized menu items
+
+    1. Verify that substrings inside a menu item can be searched
+    2. Verify that substrings that may span menu items or contain wildcards cannot
+    """
+    assert within_menu_item('hot dogs')
+    assert within_menu_item('Water & Canned')
+    assert not within_menu_item('soda: water')
+    assert not within_menu_item(' soda')
+    assert not within_menu_item('hot  dogs')
+    assert not within_menu_item('100%')
+    assert not within_menu_item('hot_dogs')
+    assert not within_menu_item('')
+
+
+def test_menu_item_suffixes():
+    """
+    Test that every substring of a menu item is a prefix of one of its suffixes
+
+    1. Compute the suffixes of a menu item
+    2. Verify that every substring without leading whitespace is within the range of
+        suffixes starting with it
+    3. Verify that other strings are not
+    """
+    item = 'hot dogs & chips'
+    suffixes = menu_item_suffixes(item)
+    assert not any(suffix.startswith(' ') for suffix in suffixes)
+    for needle in ['hot', 'dogs &', 'ot d', 's', '&', 'chips', 'nachos', 'dogz', 'hot dogs & chips!']:
+        found = any(needle <= suffix < prefix_upper_bound(needle) for suffix in suffixes)
+        assert found == (needle in item)
+
+    assert prefix_upper_bound('abc') == 'abd'
+    assert prefix_upper_bound('a' + chr(0x10ffff)) == 'b'
@@ -0,0 +1,68 @@
+import pytest
+import random
+from application.utils.haversine import haversine
+from application.utils.polyline import (decode_polyline, encode_polyline, intermediate_point,
+                                        segment_distance, corridor_boxes)
+
+
+def test_polyline_encoding():
+    """
+    Test the encoded polyline format
+
+    1. Decode a polyline with known coordinates
+    2. Verify the coordinates
+    3. Verify that encoding the coordinates returns the polyline
+    4. Verify that malformed polylines raise ValueError
+    """
+    route = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+    assert decode_polyline('_p~iF~ps|U_ulLnnqC_mqNvxq`@') == route
+    assert encode_polyline(route) == '_p~iF~ps|U_ulLnnqC_mqNvxq`@'
+    assert decode_polyline('') == []
+
+    for polyline in ('_p~iF', '_p~iF~ps|', '_p~iF ~ps|U'):
+        with pytest.raises(ValueError):
+            decode_polyline(polyline)
+
+
+def test_segment_distance():
+    """
+    Test the distance from a coordinate to a great-circle segment
+
+    1. Compute the distance from random coordinates to random short segments
+    2. Verify the distance and the position along the segment against the closest
+        of many points sampled along the segment
+    """
+    random.seed(0)
+    for __ in range(200):
+        lat1, lon1 = random.uniform(37.70, 37.82), random.uniform(-122.52, -122.36)
+        lat2, lon2 = random.uniform(37.70, 37.82), random.uniform(-122.52, -122.36)
+        lat, lon = random.uniform(37.70, 37.82), random.uniform(-122.52, -122.36)
+
+        length = haversine(lat1, lon1, lat2, lon2)
+        samples = [(haversine(lat, lon, *intermediate_point(lat1, lon1, lat2, lon2, i / 1000.0)), i / 1000.0 * length)
+                   for i in range(1001)]
+        dist, along = segment_distance(lat, lon, lat1, lon1, lat2, lon2)
+        closest_dist, closest_along = min(samples)
+        assert dist <= closest_dist + 1e-6
+        assert dist == pytest.approx(closest_dist, abs=0.5)
+        assert along == pytest.approx(closest_along, abs=length / 500 + 1e-6)
+
+
+def test_corridor_boxes():
+    """
+    Test that the corridor boxes of a segment contain every coordinate near the segment
+
+    1. Compute the corridor boxes of a segment
+    2. Verify that coordinates within the width of points sampled along the segment
+        are inside one of the boxes
+    """
+    random.seed(1)
+    lat1, lon1, lat2, lon2, width = 37.70, -122.50, 37.80, -122.38, 200
+    boxes = corridor_boxes(lat1, lon1, lat2, lon2, width)
+    assert len(boxes) > 1
+    for __ in range(500):
+        lat, lon = intermediate_point(lat1, lon1, lat2, lon2, random.random())
+        lat += random.uniform(-1, 1) * width / 111320
+        lon += random.uniform(-1, 1) * width / 88000
+        if segment_distance(lat, lon, lat1, lon1, lat2, lon2)[0] <= width:
+            assert any(b[0] <= lat <= b[2] and b[1] <= lon <= b[3] for b in boxes)
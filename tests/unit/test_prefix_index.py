@@ -0,0 +1,72 @@
+import re
+from application.utils.prefix_index import PrefixIndex
+from test_data import test_data
+
+
+def test_complete():
+    """
+    Test that prefix completions match a brute-force word prefix search
+
+    1. Add the names of the predefined test data
+    2. Complete prefixes of different lengths and case
+    3. Verify that the names with a word starting with the prefix are returned, by
+        decreasing count and then alphabetically
+    4. Verify that the limit is respected
+    """
+    index = PrefixIndex()
+    names = [e['name'] for e in test_data]
+    for name in names:
+        index.add(name)
+
+    for prefix in ['l', 'Li', 'LIANG', 'f', 'food tr', 'nothing']:
+        normalized = prefix.lower()
+        expected = set(name for name in names
+                       if any(' '.join(name.lower().split())[m.start():].startswith(normalized)
+                              for m in re.finditer(r'\b\w', ' '.join(name.lower().split()))))
+        ret = index.complete(prefix, len(names))
+        assert set(name for name, __ in ret) == expected
+        assert [count for __, count in ret] == sorted((count for __, count in ret), reverse=True)
+        for name, count in ret:
+            assert count == names.count(name)
+        assert index.complete(prefix, 2) == ret[:2]
+
+
+def test_add_discard():
+    """
+    Test that prefix completions follow added and removed occurrences
+
+    1. Add texts with different number of occurrences
+    2. Verify that the most frequent text is suggested first
+    3. Remove occurrences and verify the updated suggestions
+    """
+    index = PrefixIndex()
+    for text in ['hot dogs', 'hot dogs', 'hot coffee', 'Hot Sauce', 'dogs']:
+        index.add(text)
+    assert index.complete('hot', 10) == [('hot dogs', 2), ('hot coffee', 1), ('Hot Sauce', 1)]
+    assert index.complete('DOG', 10) == [('hot dogs', 2), ('dogs', 1)]
+    assert index.complete('coffee', 10) == [('hot coffee', 1)]
+
+    index.discard('hot dogs')
+    index.discard('hot dogs')
+    index.discard('hot coffee')
+    index.discard('missing')
+    assert index.complete('hot', 10) == [('Hot Sauce', 1)]
+    assert index.complete('dog', 10) == [('dogs', 1)]
+    assert len(index) == 2
+
+
+def test_cache_size():
+    """
+    Test that the memoized completions are bounded
+
+    1. Complete more distinct prefixes than the cache size
+    2. Verify that the number of memoized results does not exceed the cache size
+    3. Verify that completions are still correct
+    """
+    index = PrefixIndex(cache_size=8)
+    for text in ['hot dogs', 'hot coffee', 'dogs']:
+        index.add(text)
+    for i in range(100):
+        index.complete('prefix {}'.format(i), 10)
+    assert len(index._cache) == 8
+    assert index.complete('hot', 10) == [('hot coffee', 1), ('hot dogs', 1)]
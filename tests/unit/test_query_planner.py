@@ -0,0 +1,26 @@
+from application.utils.query_planner import plan_radius_query
+
+
+def test_plan_radius_query():
+    """
+    Test that the query planner drives radius queries by the most selective filter
+
+    1. Plan queries with a rare and a common item, with and without an item index
+    2. Verify that a rare indexed item drives the query
+    3. Verify that a common item or an unindexed item on a small table does not
+    4. Verify that the spatial filter is preferred on ties
+    5. Verify that the estimates are reported with the plan
+    """
+    plan = plan_radius_query(1000, {'radius': 200, 'item': 3}, {'item': True})
+    assert plan.driver == 'item'
+    assert plan.costs['item'] < plan.costs['radius']
+    assert plan.rows == {'radius': 200, 'item': 3}
+
+    assert plan_radius_query(1000, {'radius': 200, 'item': 400}, {'item': True}).driver == 'radius'
+    assert plan_radius_query(1000, {'radius': 100, 'item': 3}, {'item': False}).driver == 'radius'
+    assert plan_radius_query(100000, {'radius': 20000, 'item': 3}, {'item': False}).driver == 'item'
+    assert plan_radius_query(1000, {'radius': 10, 'item': 10}, {'item': True}).driver == 'radius'
+
+    plan = plan_radius_query(1000, {'radius': 200, 'name': 5, 'item': 50}, {'name': True, 'item': True})
+    assert plan.driver == 'name'
+    assert set(plan.costs) == set(['radius', 'name', 'item'])
@@ -0,0 +1,238 @@
+import pytest
+import random
+import itertools
+from application.utils.haversine import haversine, bounding_box
+from application.utils.spatial_grid import SpatialGrid
+from application.utils.polyline import segment_distance
+from test_data import test_data, test_location, test_radius
+
+
+def test_bounding_box():
+    """
+    Test that the bounding box contains every coordinate within the radius
+
+    1. Compute the bounding box for a coordinate and radius
+    2. Verify that the extreme points of the search circle are inside the box
+    3. Verify that the box is widened in longitude at higher latitudes
+    """
+    lat, lon = test_location
+    radius = 500
+    min_lat, min_lon, max_lat, max_lon = bounding_box(lat, lon, radius)
+    assert min_lat < lat < max_lat
+    assert min_lon < lon < max_lon
+
+    # the box edges are (approximately) radius distance from the center
+    assert haversine(lat, lon, max_lat, lon) == pytest.approx(radius)
+    assert haversine(lat, lon, lat, max_lon) >= radius
+
+    # meridians converge towards the poles
+    assert bounding_box(70, lon, radius)[3] - lon > max_lon - lon
+
+
+def test_bounding_box_antimeridian():
+    """
+    Test the bounding box of a search circle crossing the antimeridian
+
+    1. Compute the bounding box for a coordinate next to the antimeridian
+    2. Verify that the box wraps around, with min_lon greater than max_lon
+    """
+    min_lat, min_lon, max_lat, max_lon = bounding_box(0, 179.999, 1000)
+    assert min_lon > max_lon
+    assert min_lon < 179.999
+    assert max_lon > -180
+
+
+def test_spatial_grid_radius_query():
+    """
+    Test that a radius query on the grid matches a full scan
+
+    1. Insert the test data into a grid
+    2. Query the grid with different radius
+    3. Verify that the correct trucks are returned, in the correct order
+    """
+    grid = SpatialGrid(0.001)
+    for i, e in enumerate(test_data):
+        grid.insert(i+1, e['latitude'], e['longitude'])
+    assert len(grid) == len(test_data)
+
+    for radius, (count, ids) in test_radius.items():
+        ret = grid.query_radius(test_location[0], test_location[1], radius)
+        assert len(ret) == count
+        assert [uuid for __, uuid in ret] == ids
+
+
+def test_spatial_grid_insert_remove():
+    """
+    Test moving and removing points in the grid
+
+    1. Insert a point and move it by inserting it again with new coordinates
+    2. Verify that it is only found at its new position
+    3. Remove the point and verify that it is no longer found
+    """
+    grid = SpatialGrid(0.01)
+    grid.insert(1, 37.7201, -122.3886)
+    grid.insert(1, 37.8, -122.3)
+    assert len(grid) == 1
+    assert grid.query_radius(37.7201, -122.3886, 100) == []
+    assert grid.query_radius(37.8, -122.3, 100)[0][1] == 1
+
+    grid.remove(1)
+    grid.remove(1)
+    assert 1 not in grid
+    assert grid.query_radius(37.8, -122.3, 100) == []
+
+
+def test_spatial_grid_nearest():
+    """
+    Test that the grid yields points in order of ascending distance
+
+    1. Insert points scattered around the globe, including across the antimeridian
+    2. Consume the nearest points for different origins
+    3. Verify the order against sorting the distances to every point
+    """
+    random.seed(0)
+    grid = SpatialGrid(1.0)
+    points = [(random.uniform(-89, 89), random.uniform(-180, 180)) for __ in range(300)]
+    points += [(10.0, 179.9), (10.0, -179.9)]
+    for i, (lat, lon) in enumerate(points):
+        grid.insert(i, lat, lon)
+
+    for origin in [(0, 0), (10.0, 179.95), (85, -30), (-40, 120)]:
+        expected = sorted((haversine(origin[0], origin[1], lat, lon), i) for i, (lat, lon) in enumerate(points))
+        ret = list(grid.nearest(*origin))
+        assert [i for __, i in ret] == [i for __, i in expected]
+
+    # the first neighbours are found without visiting distant cells
+    ret = list(itertools.islice(grid.nearest(10.0, 179.95), 2))
+    assert sorted(i for __, i in ret) == [300, 301]
+
+
+def test_spatial_grid_nearest_approximate():
+    """
+    Test that ranking candidates by approximate distance yields the exact result
+
+    1. Insert points densely scattered over a city, including duplicates
+    2. Consume the nearest points with and without the approximation
+    3. Verify that the points and distances are identical
+    """
+    random.seed(1)
+    grid = SpatialGrid(0.005)
+    points = [(random.uniform(37.70, 37.82), random.uniform(-122.52, -122.36)) for __ in range(500)]
+    points += points[:20]
+    for i, (lat, lon) in enumerate(points):
+        grid.insert(i, lat, lon)
+
+    for origin in [test_location, (37.76, -122.44), (37.9, -122.2)]:
+        exact = list(grid.nearest(*origin, approximate=False))
+        assert list(grid.nearest(*origin)) == exact
+        assert list(itertools.islice(grid.nearest(*origin), 10)) == exact[:10]
+
+
+def test_spatial_grid_nearest_min_dist():
+    """
+    Test that the grid skips the points closer than a minimum distance
+
+    1. Insert points densely scattered over a city
+    2. Consume the nearest points from a minimum distance
+    3. Verify that the points from the minimum distance are identical to the full order
+    4. Verify that most of the closer points are skipped
+    """
+    random.seed(3)
+    grid = SpatialGrid(0.005)
+    points = [(random.uniform(37.70, 37.82), random.uniform(-122.52, -122.36)) for __ in range(1000)]
+    for i, (lat, lon) in enumerate(points):
+        grid.insert(i, lat, lon)
+
+    exact = list(grid.nearest(*test_location))
+    for min_dist in (0, 100, 1000, 5000, 1e7):
+        ret = list(grid.nearest(*test_location, min_dist=min_dist))
+        assert [e for e in ret if e[0] >= min_dist] == [e for e in exact if e[0] >= min_dist]
+
+    closer = [e for e in exact if e[0] < 5000]
+    ret = list(grid.nearest(*test_location, min_dist=5000))
+    assert len(closer) > 100
+    assert len(ret) - (len(exact) - len(closer)) < len(closer) / 4
+
+
+def test_spatial_grid_route_query():
+    """
+    Test that the grid returns the points near a route, ordered along the route
+
+    1. Insert points densely scattered over a city
+    2. Query a route with several segments
+    3. Verify the points, distances and positions against checking every point and segment
+    """
+    random.seed(2)
+    grid = SpatialGrid(0.005)
+    points = [(random.uniform(37.70, 37.82), random.uniform(-122.52, -122.36)) for __ in range(1000)]
+    for i, (lat, lon) in enumerate(points):
+        grid.insert(i, lat, lon)
+
+    route = [(37.71, -122.50), (37.75, -122.45), (37.75, -122.40), (37.80, -122.38)]
+    lengths = [haversine(a[0], a[1], b[0], b[1]) for a, b in zip(route, route[1:])]
+    for width in (0, 100, 500):
+        expected = []
+        for i, (lat, lon) in enumerate(points):
+            near = [(sum(lengths[:j]) + along, dist) for j, (a, b) in enumerate(zip(route, route[1:]))
+                    for dist, along in [segment_distance(lat, lon, a[0], a[1], b[0], b[1])] if dist <= width]
+            if near:
+                expected.append((near[0][0], min(dist for __, dist in near), i))
+        assert grid.query_route(route, width) == sorted(expected)
+    assert len(expected) > 0
+
+    # a single vertex is a search circle
+    ret = grid.query_route([test_location], 500)
+    expected = grid.query_radius(test_location[0], test_location[1], 500)
+    assert [key for __, __, key in ret] == [key for __, key in expected]
+    assert [dist for __, dist, __ in ret] == pytest.approx([dist for dist, __ in expected])
+    assert grid.query_route([], 500) == []
+
+
+def test_spatial_grid_cell_counts():
+    """
+    Test the number of points in every cell of the grid
+
+    1. Insert the test data into a grid
+    2. Verify that the cell counts add up to the number of points
+    3. Verify the cell counts of a subset of the points
+    4. Remove a point and verify that its cell count is decremented
+    """
+    grid = SpatialGrid(0.005)
+    for i, e in enumerate(test_data):
+        grid.insert(i+1, e['latitude'], e['longitude'])
+
+    counts = grid.cell_counts()
+    assert sum(count for __, __, count in counts) == len(test_data)
+    assert counts == sorted(counts)
+
+    subset = set(range(1, len(test_data) + 1, 2))
+    assert sum(count for __, __, count in grid.cell_counts(subset | {0})) == len(subset)
+
+    row, col = grid.cell_of(test_data[0]['latitude'], test_data[0]['longitude'])
+    before = dict(((r, c), count) for r, c, count in counts)[(row, col)]
+    grid.remove(1)
+    after = dict(((r, c), count) for r, c, count in grid.cell_counts())
+    assert after.get((row, col), 0) == before - 1
+
+
+
+def test_spatial_grid_count_box():
+    """
+    Test the estimated number of points inside a latitude/longitude box
+
+    1. Insert the test data into a grid
+    2. Count boxes around the test location of different size
+    3. Verify that the count is an upper bound of the points inside the box, and
+        counts every point inside the cells overlapping the box
+    """
+    grid = SpatialGrid(0.005)
+    for i, e in enumerate(test_data):
+        grid.insert(i+1, e['latitude'], e['longitude'])
+
+    for radius in (10, 100, 500, 5000):
+        box = bounding_box(test_location[0], test_location[1], radius)
+        count = grid.count_box(*box)
+        assert len(grid.query_box(*box)) <= count <= len(test_data)
+
+    assert grid.count_box(-90, -180, 90, 180) == len(test_data)
+    assert grid.count_box(0, 0, 1, 1) == 0
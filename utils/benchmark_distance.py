@@ -0,0 +1,66 @@
+import argparse
+import random
+import timeit
+import itertools
+from application.utils import spatial_grid
+from application.utils.spatial_grid import SpatialGrid
+
+
+def count_haversine_calls(func):
+    """
+    Returns the result of func and the number of haversine distances it computed
+    """
+    calls = [0]
+    haversine = spatial_grid.haversine
+
+    def counting_haversine(*args, **kwargs):
+        calls[0] += 1
+        return haversine(*args, **kwargs)
+
+    spatial_grid.haversine = counting_haversine
+    try:
+        ret = func()
+    finally:
+        spatial_grid.haversine = haversine
+    return ret, calls[0]
+
+
+def benchmark(trucks, queries, k, cell_size, repeat):
+    """
+    Compares nearest neighbour queries on a spatial grid of random trucks spread over
+    San Francisco, with and without ranking candidates by the equirectangular
+    approximation before computing their exact haversine distance.
+    """
+    random.seed(0)
+    grid = SpatialGrid(cell_size)
+    for i in range(trucks):
+        grid.insert(i, random.uniform(37.70, 37.82), random.uniform(-122.52, -122.36))
+    origins = [(random.uniform(37.70, 37.82), random.uniform(-122.52, -122.36)) for __ in range(queries)]
+
+    def run(approximate):
+        return [list(itertools.islice(grid.nearest(lat, lon, approximate), k)) for lat, lon in origins]
+
+    exact, exact_calls = count_haversine_calls(lambda: run(False))
+    approx, approx_calls = count_haversine_calls(lambda: run(True))
+    if exact != approx:
+        raise AssertionError('approximate search returned a different result')
+
+    exact_time = min(timeit.repeat(lambda: run(False), number=1, repeat=repeat))
+    approx_time = min(timeit.repeat(lambda: run(True), number=1, repeat=repeat))
+
+    print('{} trucks, {} queries for the {} nearest trucks'.format(trucks, queries, k))
+    print('exact:       {:8.1f} ms, {:8d} haversine calls'.format(exact_time * 1000, exact_calls))
+    print('two-stage:   {:8.1f} ms, {:8d} haversine calls'.format(approx_time * 1000, approx_calls))
+    print('speedup:     {:8.2f}x'.format(exact_time / approx_time))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark of the two-stage nearest neighbour distance computation')
+    parser.add_argument('--trucks', help='number of trucks in the grid', type=int, default=20000)
+    parser.add_argument('--queries', help='number of queries', type=int, default=200)
+    parser.add_argument('-k', help='number of nearest trucks per query', type=int, default=10)
+    parser.add_argument('--cell_size', help='grid cell size in decimal degrees', type=float, default=0.005)
+    parser.add_argument('--repeat', help='number of timed repetitions', type=int, default=3)
+    args = parser.parse_args()
+
+    benchmark(args.trucks, args.queries, args.k, args.cell_size, args.repeat)